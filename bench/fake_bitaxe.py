@@ -0,0 +1,319 @@
+"""
+Lokaler Fake-Bitaxe für Benchmarks: liefert realistische /api/system/info-Antworten
+für beliebig viele Miner unter http://<host>:<port>/m/<nr>/api/system/info.
+
+Latenz, Jitter, Fehlerquote und hängende Anfragen lassen sich zur Laufzeit ändern.
+Unter /m/<nr>/api/ws streamt jeder Miner wie AxeOS sein Log (Shares, Ergebnisse).
+PATCH /m/<nr>/api/system setzt Frequenz und Core-Spannung; danach folgen Hashrate,
+Leistung, Temperatur und Fehlerquote einem einfachen Modell (für das Autotuning).
+Standalone: python bench/fake_bitaxe.py --miners 10 --latency 0.2 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import math
+import random
+import time
+
+from aiohttp import web
+
+def format_difficulty(value):
+    """Formatiert wie AxeOS, z. B. 4.29G oder 812M."""
+    for suffix, factor in (("P", 1e15), ("T", 1e12), ("G", 1e9), ("M", 1e6), ("K", 1e3)):
+        if value >= factor:
+            return f"{value / factor:.3g}{suffix}"
+    return str(int(value))
+
+class FakeMinerState:
+    """Zustand eines simulierten Miners – die Werte driften bei jeder Abfrage leicht."""
+
+    def __init__(self, index, rng):
+        self.index = index
+        self.rng = rng
+        self.started = time.time() - rng.uniform(600, 86400 * 3)
+        self.hashrate = rng.uniform(450, 1200)  # GH/s
+        self.temp = rng.uniform(52, 62)
+        self.best = rng.uniform(5e7, 5e9)
+        self.session_best = self.best * rng.uniform(0.01, 1.0)
+        self.accepted = rng.randint(0, 5000)
+        self.rejected = rng.randint(0, 20)
+        self.fallback = False
+        self.submit_id = 10
+        # Modell für das Autotuning, aktiv ab dem ersten PATCH
+        self.model = False
+        self.frequency = 525
+        self.core_voltage = 1200
+        self.settle_tau = 1.0  # Sekunden, bis sich die Hashrate nach einer Änderung einpendelt
+        self.changed_at = time.monotonic()
+        self.heat = 0.0        # zusätzliche °C, z. B. um die Temperaturgrenze zu testen
+        # Pools, z. B. auf einen StubStratum umbiegen (für den Stratum-Prober)
+        self.stratum_url = "public-pool.io"
+        self.stratum_port = 21496
+        self.fallback_url = "solo.ckpool.org"
+        self.fallback_port = 3333
+
+    def apply_settings(self, settings):
+        self.model = True
+        self.frequency = int(settings.get("frequency", self.frequency))
+        self.core_voltage = int(settings.get("coreVoltage", self.core_voltage))
+        self.changed_at = time.monotonic()
+
+    def model_step(self):
+        """Hashrate, Leistung und Temperatur aus Frequenz und Spannung."""
+        rng = self.rng
+        expected = self.frequency * 2.04  # GH/s, etwa BM1370
+        # Unterhalb der nötigen Spannung gehen Nonces verloren und Shares werden abgelehnt
+        needed = 1000 + (self.frequency - 400) * 0.8
+        errors = min(0.5, max(0.0, (needed - self.core_voltage) / 100))
+        target = expected * (1 - errors)
+        blend = 1 - math.exp(-(time.monotonic() - self.changed_at) / self.settle_tau)
+        self.hashrate = max(50.0, (self.hashrate + (target - self.hashrate) * blend) * rng.gauss(1.0, 0.002))
+        power = 15.0 * (self.frequency / 525) * (self.core_voltage / 1200) ** 2
+        self.temp = 35 + power * 1.4 + self.heat + rng.gauss(0.0, 0.2)
+        accepted = rng.randint(5, 10)
+        rejected = sum(1 for _ in range(accepted) if rng.random() < errors)
+        self.accepted += accepted - rejected
+        self.rejected += rejected
+        return expected, power
+
+    def uptime_ms(self):
+        return int((time.time() - self.started) * 1000)
+
+    def log_share(self):
+        """Ein gefundener Share wie im AxeOS-Log: Ergebnis, Submit und Antwort des Pools."""
+        rng = self.rng
+        diff = rng.expovariate(1.0) * 2048 / rng.uniform(0.001, 1.0)
+        self.submit_id += 1
+        if diff > self.session_best:
+            self.session_best = diff
+            self.best = max(self.best, diff)
+        accepted = rng.random() >= 0.005
+        if accepted:
+            self.accepted += 1
+        else:
+            self.rejected += 1
+        ms = self.uptime_ms()
+        return [
+            f"\x1b[0;32mI ({ms}) asic_result: ID: 6a1b, ver: 20000000 Nonce {rng.getrandbits(32):08X} diff {diff:.1f} of 2048.\x1b[0m",
+            f"\x1b[0;32mI ({ms}) stratum_api: tx: "
+            f'{{"id": {self.submit_id}, "method": "mining.submit", "params": ["bc1qbench.{self.index}", "6a1b", "00000000", "6650a1b2", "1a2b3c4d"]}}\x1b[0m',
+            f"\x1b[0;32mI ({ms + 40}) stratum_task: rx: "
+            + (f'{{"id":{self.submit_id},"error":null,"result":true}}' if accepted
+               else f'{{"id":{self.submit_id},"error":[23,"Low difficulty share",null],"result":false}}')
+            + "\x1b[0m",
+        ]
+
+    def payload(self):
+        rng = self.rng
+        if self.model:
+            expected, power = self.model_step()
+        else:
+            self.hashrate = max(50.0, self.hashrate * rng.gauss(1.0, 0.01))
+            self.temp = min(85.0, max(35.0, self.temp + rng.gauss(0.0, 0.3)))
+            self.accepted += rng.randint(0, 3)
+            if rng.random() < 0.005:
+                self.rejected += 1
+            expected = self.frequency * 2.04
+            power = self.hashrate * rng.uniform(0.016, 0.019)
+        if rng.random() < 0.01:
+            self.best *= rng.uniform(1.0, 3.0)
+        self.session_best = max(self.session_best, self.best * rng.uniform(0.0, 0.5))
+        voltage = rng.uniform(5.0, 5.2)
+        return {
+            "power": round(power, 2),
+            "voltage": round(voltage * 1000, 1),
+            "current": round(power / voltage * 1000, 1),
+            "temp": round(self.temp, 1),
+            "vrTemp": round(self.temp + rng.uniform(2, 8), 1),
+            "hashRate": round(self.hashrate, 2),
+            "expectedHashrate": round(expected, 2),
+            "bestDiff": format_difficulty(self.best),
+            "bestSessionDiff": format_difficulty(self.session_best),
+            "freeHeap": rng.randint(150000, 200000),
+            "coreVoltage": self.core_voltage,
+            "coreVoltageActual": self.core_voltage + rng.randint(-15, 5),
+            "frequency": self.frequency,
+            "ssid": "BenchNet",
+            "hostname": f"bitaxe-{self.index}",
+            "hostip": f"10.0.{self.index // 250}.{self.index % 250 + 1}",
+            "wifiStatus": "Connected!",
+            "wifiRSSI": rng.randint(-75, -40),
+            "sharesAccepted": self.accepted,
+            "sharesRejected": self.rejected,
+            "uptimeSeconds": int(time.time() - self.started),
+            "ASICModel": "BM1370",
+            "stratumURL": self.stratum_url,
+            "stratumPort": self.stratum_port,
+            "stratumUser": f"bc1qbench.{self.index}",
+            "fallbackStratumURL": self.fallback_url,
+            "fallbackStratumPort": self.fallback_port,
+            "fallbackStratumUser": f"bc1qbench.{self.index}",
+            "isUsingFallbackStratum": int(self.fallback),
+            "version": "v2.4.2",
+            "runningPartition": "factory",
+            "lastResetReason": "Power on reset",
+            "fanspeed": rng.randint(40, 100),
+            "fanrpm": rng.randint(2500, 6000),
+            "autofanspeed": 1,
+        }
+
+class FakeBitaxe:
+    """
+    aiohttp-Server für n Miner. latency/jitter in Sekunden, error_rate und
+    hang_rate als Anteil (0..1) der Anfragen. Hängende Anfragen warten hang_sec.
+    """
+
+    def __init__(self, miners=1, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, hang_rate=0.0, hang_sec=3600.0, seed=1):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_sec = hang_sec
+        self.rng = random.Random(seed)
+        self.states = [FakeMinerState(i, self.rng) for i in range(miners)]
+        self.requests = 0
+        self.errors = 0
+        self.hangs = 0
+        self.log_interval = 1.0  # Sekunden zwischen Shares im Log-Stream (0 = keine)
+        self.patches = 0
+        self.sockets = {}        # Miner-Index -> offene WebSockets
+        self._runner = None
+
+    def configure(self, **options):
+        """Ändert das Verhalten zur Laufzeit, z. B. configure(latency=2.0)."""
+        for key, value in options.items():
+            if not hasattr(self, key) or key.startswith("_"):
+                raise AttributeError(key)
+            setattr(self, key, value)
+
+    def resize(self, miners):
+        while len(self.states) < miners:
+            self.states.append(FakeMinerState(len(self.states), self.rng))
+
+    def url(self, index=0):
+        return f"http://{self.host}:{self.port}/m/{index}/api/system/info"
+
+    async def emit(self, index, *lines):
+        """Schickt beliebige Logzeilen an alle verbundenen Streams eines Miners."""
+        for ws in list(self.sockets.get(index, ())):
+            try:
+                await ws.send_str("\n".join(lines) + "\n")
+            except ConnectionResetError:
+                pass  # Client hat gerade getrennt
+
+    async def drop_streams(self):
+        """Trennt alle Log-Streams, z. B. um das Wiederverbinden zu prüfen."""
+        for sockets in self.sockets.values():
+            for ws in list(sockets):
+                await ws.close()
+
+    async def handle_settings(self, request):
+        try:
+            state = self.states[int(request.match_info.get("index", 0))]
+        except (ValueError, IndexError):
+            raise web.HTTPNotFound()
+        self.patches += 1
+        state.apply_settings(await request.json())
+        return web.Response(text="")
+
+    async def handle_restart(self, request):
+        return web.Response(text="System will restart shortly.")
+
+    async def handle_ws(self, request):
+        index = int(request.match_info.get("index", 0))
+        if index >= len(self.states):
+            raise web.HTTPNotFound()
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        sockets = self.sockets.setdefault(index, set())
+        sockets.add(ws)
+        try:
+            while not ws.closed:
+                await asyncio.sleep(self.log_interval or 1.0)
+                if self.log_interval and not ws.closed:
+                    await ws.send_str("\n".join(self.states[index].log_share()) + "\n")
+        except ConnectionResetError:
+            pass
+        finally:
+            sockets.discard(ws)
+        return ws
+
+    async def handle(self, request):
+        return await self.respond(request.match_info["index"])
+
+    async def handle_default(self, request):
+        # Einzelner Miner wie ein echtes Gerät unter /api/system/info
+        return await self.respond(0)
+
+    async def respond(self, index):
+        self.requests += 1
+        try:
+            state = self.states[int(index)]
+        except (ValueError, IndexError):
+            raise web.HTTPNotFound()
+        delay = self.latency + (self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        roll = self.rng.random()
+        if roll < self.hang_rate:
+            self.hangs += 1
+            await asyncio.sleep(self.hang_sec)
+        elif delay > 0:
+            await asyncio.sleep(delay)
+        if roll >= 1.0 - self.error_rate:
+            self.errors += 1
+            return web.Response(status=500, text="Internal Server Error")
+        return web.json_response(state.payload())
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/m/{index}/api/system/info", self.handle)
+        app.router.add_get("/api/system/info", self.handle_default)
+        app.router.add_get("/m/{index}/api/ws", self.handle_ws)
+        app.router.add_get("/api/ws", self.handle_ws)
+        app.router.add_patch("/m/{index}/api/system", self.handle_settings)
+        app.router.add_patch("/api/system", self.handle_settings)
+        app.router.add_post("/m/{index}/api/system/restart", self.handle_restart)
+        app.router.add_post("/api/system/restart", self.handle_restart)
+        self._runner = web.AppRunner(app, handle_signals=False)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if not self.port:
+            self.port = self._runner.addresses[0][1]
+        return self
+
+    async def stop(self):
+        await self.drop_streams()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake-Bitaxe-Server für Benchmarks")
+    parser.add_argument("--miners", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    async def serve():
+        server = FakeBitaxe(args.miners, args.host, args.port, args.latency, args.jitter,
+                            args.error_rate, args.hang_rate)
+        await server.start()
+        print(f"Fake-Bitaxe läuft: {server.url(0)} … /m/{args.miners - 1}/api/system/info")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,666 @@
+"""
+Benchmarks für den Bot gegen einen lokalen Fake-Bitaxe und eine Stub-Discord-Schicht.
+
+    python bench/run_bench.py                      # alle Benchmarks
+    python bench/run_bench.py --quick              # kleinere Läufe
+    python bench/run_bench.py --only fleet_sweep   # einzelne Benchmarks
+    python bench/run_bench.py --compare alt.json   # Vergleich mit einem früheren Lauf
+    python bench/run_bench.py --workers 4          # Abfrage über Poller-Worker-Prozesse
+
+Die Ergebnisse landen als JSON in --output (Standard: bench_results.json), damit sich
+Läufe verschiedener Versionen vergleichen lassen. Der Bot wird in einem temporären
+Verzeichnis mit eigener config.ini importiert – echte Daten werden nicht angefasst.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import pathlib
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = pathlib.Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from fake_bitaxe import FakeBitaxe, FakeMinerState
+from stub_discord import StubChannel, StubContext
+from stub_stratum import StubStratum
+
+COMMANDS = ["status", "hashrate", "temp", "power", "info", "best", "stats"]
+
+BENCH_CONFIG = """
+[discord]
+token = bench
+channel_id = 1
+send_rate = 1000000
+send_per_sec = 1
+alert_batch_sec = 0.05
+
+[bitaxe]
+name = Bench
+api_url = {url}
+connect_timeout_sec = 1
+read_timeout_sec = 2
+# Alle Fake-Miner teilen sich einen Host, echte Miner haben jeweils einen eigenen
+pool_size = 1000
+
+[settings]
+console_interval_sec = 3600
+dashboard_interval = 30
+timezone = Europe/Berlin
+snapshot_ttl_sec = 5
+perf_log_interval_sec = 0
+
+[history]
+enabled = true
+
+[workers]
+processes = {workers}
+"""
+
+IMPORT_SEC = None  # Dauer des Bot-Imports in load_bot
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def load_bot(workdir, url, workers=0):
+    """Importiert bitaxediscordbot mit einer Benchmark-Konfiguration im workdir."""
+    global IMPORT_SEC
+    (workdir / "config.ini").write_text(BENCH_CONFIG.format(url=url, workers=workers), encoding="utf-8")
+    os.chdir(workdir)
+    started = time.perf_counter()
+    import bitaxediscordbot
+    IMPORT_SEC = time.perf_counter() - started
+    return bitaxediscordbot
+
+def summarize(samples):
+    """Kennzahlen einer Liste von Dauern in Sekunden, ausgegeben in Millisekunden."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def at(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered) * 1000,
+        "p50": at(0.50),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "max": ordered[-1] * 1000,
+    }
+
+async def wait_for_outbound(bot, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while bot.outbound.depth() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+async def bench_commands(bot, server, users, per_user, ttl):
+    """Befehlsdurchsatz und -latenz bei users gleichzeitigen Nutzern."""
+    server.configure(latency=0.02, jitter=0.01, error_rate=0.0, hang_rate=0.0)
+    cache = bot.fleet.default.cache
+    cache.ttl = ttl
+    latencies = []
+
+    async def user(index):
+        channel = StubChannel()
+        for n in range(per_user):
+            name = COMMANDS[(index + n) % len(COMMANDS)]
+            ctx = StubContext(channel, name)
+            started = ctx.perf_started = time.monotonic()
+            await bot.bot.get_command(name).callback(ctx)
+            latencies.append(time.monotonic() - started)
+
+    fetches = cache.fetch_count
+    started = time.monotonic()
+    await asyncio.gather(*(user(i) for i in range(users)))
+    elapsed = time.monotonic() - started
+    cache.ttl = bot.SNAPSHOT_TTL
+    return {
+        "users": users,
+        "ttl_sec": ttl,
+        "commands": len(latencies),
+        "elapsed_sec": elapsed,
+        "throughput_per_sec": len(latencies) / elapsed,
+        "miner_fetches": cache.fetch_count - fetches,
+        "latency_ms": summarize(latencies),
+    }
+
+async def bench_slash(bot, server, users, per_user, cached):
+    """
+    Slash-Befehle: Zeit bis zur Bestätigung der Interaktion (Discord verlangt < 3 s)
+    und bis zur Antwort – mit frischem Snapshot im Cache oder mit nötiger Abfrage.
+    """
+    server.configure(latency=0.5, jitter=0.0, error_rate=0.0, hang_rate=0.0)
+    cache = bot.fleet.default.cache
+    acks, answers, deferred = [], [], 0
+
+    async def user(index):
+        nonlocal deferred
+        channel = StubChannel()
+        for n in range(per_user):
+            name = COMMANDS[(index + n) % len(COMMANDS)]
+            if not cached:
+                cache.fetched_at = None  # erzwingt eine Abfrage beim Miner
+            ctx = StubContext(channel, name, slash=True)
+            started = time.monotonic()
+            await bot.mark_command_start(ctx)
+            await bot.bot.get_command(name).callback(ctx)
+            acks.append(ctx.acked_at - started)
+            answers.append(time.monotonic() - started)
+            deferred += ctx.deferred
+
+    if cached:
+        cache.ttl = 3600
+        await cache.get(max_age=0)
+    await asyncio.gather(*(user(i) for i in range(users)))
+    cache.ttl = bot.SNAPSHOT_TTL
+    return {
+        "users": users,
+        "cached": cached,
+        "commands": len(acks),
+        "deferred": deferred,
+        "ack_ms": summarize(acks),
+        "answer_ms": summarize(answers),
+    }
+
+async def bench_loop_lag(bot, server, scenario, latency, hang_rate, users, duration):
+    """Event-Loop-Verzögerung, während Befehle auf einen langsamen Miner warten."""
+    server.configure(latency=latency, jitter=latency * 0.1, error_rate=0.0,
+                     hang_rate=hang_rate, hang_sec=bot.HTTP_READ_TIMEOUT + 1)
+    cache = bot.fleet.default.cache
+    cache.ttl = 0
+    lags = []
+    latencies = []
+    stop = asyncio.Event()
+
+    async def probe():
+        while not stop.is_set():
+            expected = time.monotonic() + 0.01
+            await asyncio.sleep(0.01)
+            lags.append(max(0.0, time.monotonic() - expected))
+
+    async def load(index):
+        channel = StubChannel()
+        command = bot.bot.get_command("status")
+        while not stop.is_set():
+            ctx = StubContext(channel, "status")
+            started = ctx.perf_started = time.monotonic()
+            await command.callback(ctx)
+            latencies.append(time.monotonic() - started)
+
+    tasks = [asyncio.ensure_future(probe())] + [asyncio.ensure_future(load(i)) for i in range(users)]
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    cache.ttl = bot.SNAPSHOT_TTL
+    return {
+        "scenario": scenario,
+        "miner_latency_sec": latency,
+        "hang_rate": hang_rate,
+        "users": users,
+        "loop_lag_ms": summarize(lags),
+        "command_latency_ms": summarize(latencies),
+    }
+
+def bench_fleet(bot, server, size):
+    server.resize(size)
+    fleet = bot.Fleet(
+        [bot.Miner(f"bench-{i}", server.url(i), tags=["even" if i % 2 == 0 else "odd"]) for i in range(size)],
+        bot.FLEET_CONCURRENCY,
+    )
+    fleet.listeners = list(bot.fleet.listeners)
+    # Mit --workers fragen die Poller-Prozesse auch die Benchmark-Fleet ab
+    fleet.remote = bot.fleet.remote
+    if fleet.remote is not None:
+        for name in fleet.miners:
+            fleet.remote.assign(name)
+    return fleet
+
+async def bench_dashboards(bot, server, dashboards, fleet_size, ticks):
+    """Kosten eines Dashboard-Ticks (Rendern, Vergleichen, Edits einreihen)."""
+    server.configure(latency=0.005, jitter=0.002, error_rate=0.0, hang_rate=0.0)
+    fleet = bench_fleet(bot, server, fleet_size)
+    manager = bot.DashboardManager(fleet)
+    try:
+        selectors = [("fleet", None), ("fleet", "tag:even")] + [("miner", name) for name in fleet.miners]
+        channels = []
+        for i in range(dashboards):
+            channel = StubChannel()
+            channels.append(channel)
+            await manager.start(channel, selectors[i % len(selectors)])
+        tick_times = []
+        for _ in range(ticks):
+            await fleet.sweep(max_age=0)
+            started = time.perf_counter()
+            await manager.tick()
+            tick_times.append(time.perf_counter() - started)
+        await wait_for_outbound(bot)
+        return {
+            "dashboards": dashboards,
+            "fleet_size": fleet_size,
+            "ticks": ticks,
+            "tick_ms": summarize(tick_times),
+            "edits_queued": manager.edits_sent,
+            "edits_skipped": manager.edits_skipped,
+            "edits_delivered": sum(channel.edits for channel in channels),
+        }
+    finally:
+        manager.entries.clear()
+
+async def bench_fleet_sweep(bot, server, size, rounds):
+    """Dauer eines vollständigen Fleet-Sweeps über size Fake-Miner."""
+    server.configure(latency=0.02, jitter=0.01, error_rate=0.01, hang_rate=0.0)
+    fleet = bench_fleet(bot, server, size)
+    durations = []
+    offline = 0
+    for _ in range(rounds):
+        started = time.monotonic()
+        results = await fleet.sweep(max_age=0)
+        durations.append(time.monotonic() - started)
+        offline += sum(1 for _, data, _ in results if not data)
+    p50 = summarize(durations)["p50"]
+    return {
+        "miners": size,
+        "rounds": rounds,
+        "sweep_ms": summarize(durations),
+        "per_miner_us": p50 * 1000 / size,
+        "offline_results": offline,
+    }
+
+async def bench_storage(bot, miners, samples_per_miner):
+    """Platzbedarf und Geschwindigkeit der Historie im Vergleich zum rohen API-JSON."""
+    path = pathlib.Path(f"storage-{miners}.db").resolve()
+    store = bot.SampleStore(str(path), raw_retention=bot.sample_store.raw_retention, tiers=bot.sample_store.tiers)
+    store.MAINTENANCE_PAUSE = 0
+    rng = random.Random(7)
+    states = [FakeMinerState(i, rng) for i in range(miners)]
+    start = time.time() - samples_per_miner * 5
+    raw_bytes = 0
+    ingest = 0.0
+    for step in range(samples_per_miner):
+        payloads = [state.payload() for state in states]
+        raw_bytes += sum(len(json.dumps(payload)) for payload in payloads)
+        started = time.perf_counter()
+        for state, payload in zip(states, payloads):
+            store.add(f"bench-{state.index}", bot.Snapshot.from_api(payload), ts=start + step * 5)
+        if step % 60 == 59:
+            await store.flush()
+        ingest += time.perf_counter() - started
+    started = time.perf_counter()
+    await store.flush()
+    ingest += time.perf_counter() - started
+    query_times = []
+    for metrics in (["hashrate"], ["temp", "vr_temp"], None):
+        started = time.perf_counter()
+        rows = await store.query("bench-0", start - 1, metrics=metrics)
+        query_times.append(time.perf_counter() - started)
+    # Verdichtung in die Rollup-Stufen und Abfrage über den ganzen Zeitraum wie für !chart
+    started = time.perf_counter()
+    await store.compact()
+    compact = time.perf_counter() - started
+    span = time.time() - start
+    started = time.perf_counter()
+    rollup_rows = await store.query("bench-0", start, metrics=["hashrate"], resolution=span / bot.CHART_POINTS)
+    rollup_query = time.perf_counter() - started
+    await store.close()
+    total = miners * samples_per_miner
+    db_bytes = sum(f.stat().st_size for f in path.parent.glob(path.name + "*"))
+    return {
+        "miners": miners,
+        "samples": total,
+        "raw_json_bytes_per_sample": raw_bytes / total,
+        "db_bytes_per_sample": db_bytes / total,
+        "compression": raw_bytes / db_bytes,
+        "ingest_us_per_sample": ingest * 1e6 / total,
+        "query_ms": summarize(query_times),
+        "query_rows": len(rows),
+        "compact_ms": compact * 1000,
+        "rollup_query_ms": rollup_query * 1000,
+        "rollup_query_rows": len(rollup_rows),
+    }
+
+async def bench_startup(bot, server, size, import_sec):
+    """Importzeit, Zeit bis zur ersten Abfrage und Kosten des gespeicherten Zustands."""
+    fleet = bench_fleet(bot, server, size)
+    started = time.perf_counter()
+    results = await fleet.sweep(max_age=0)
+    first_poll = time.perf_counter() - started
+    for miner, data, _ in results:
+        bot.rule_engine.evaluate(miner.name, data)
+    state = bot.RuntimeState(str(pathlib.Path(f"state-{size}.json").resolve()), fleet)
+    started = time.perf_counter()
+    await state.save()
+    save = time.perf_counter() - started
+    started = time.perf_counter()
+    state.load()
+    state.restore()
+    restore = time.perf_counter() - started
+    state.close()
+    return {
+        "miners": size,
+        "import_ms": import_sec * 1000,
+        "first_poll_ms": first_poll * 1000,
+        "state_bytes": pathlib.Path(state.path).stat().st_size,
+        "state_save_ms": save * 1000,
+        "state_restore_ms": restore * 1000,
+    }
+
+async def bench_stream(bot, server, size, rounds):
+    """Log-Stream: Zeit von der Logzeile bis zum aktualisierten Snapshot und Parse-Durchsatz."""
+    server.configure(latency=0.0, jitter=0.0, error_rate=0.0, hang_rate=0.0, log_interval=0.5)
+    fleet = bench_fleet(bot, server, size)
+    streams = bot.LogStreamManager(fleet)
+    seen = {}
+    streams.listeners.append(lambda miner, event: event.kind == "share" and seen.setdefault(event.value, time.monotonic()))
+    try:
+        await fleet.sweep(max_age=0)
+        streams.start()
+        deadline = time.monotonic() + 10
+        while sum(stream.connected for stream in streams.streams.values()) < size and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        connected = sum(stream.connected for stream in streams.streams.values())
+        latencies = []
+        for n in range(rounds):
+            index = n % size
+            value = 1e15 + n  # größer als jede simulierte Best Difficulty
+            started = time.monotonic()
+            await server.emit(index, f"I ({server.states[index].uptime_ms()}) asic_result: Nonce 0000ABCD diff {value:.1f} of 2048.")
+            while value not in seen and time.monotonic() - started < 5:
+                await asyncio.sleep(0.0005)
+            if value in seen:
+                latencies.append(seen[value] - started)
+        best_updated = sum(1 for miner in fleet.miners.values() if (miner.cache.data.best_diff or 0) >= 1e15)
+    finally:
+        await streams.stop()
+    # Parser allein: so viele Logzeilen pro Sekunde
+    lines = "\n".join(line for _ in range(2000) for line in FakeMinerState(0, random.Random(3)).log_share()) + "\n"
+    parser = bot.LogParser()
+    started = time.perf_counter()
+    events = parser.feed(lines)
+    parse = time.perf_counter() - started
+    return {
+        "miners": size,
+        "connected": connected,
+        "detect_ms": summarize(latencies),
+        "best_updated": best_updated,
+        "parse_lines_per_sec": parser.lines / parse,
+        "parsed_events": len(events),
+    }
+
+async def bench_autotune(bot, server, size):
+    """Autotuning gegen simulierte Miner mit verkürzten Zeiten; ein Miner läuft zu heiß."""
+    server.configure(latency=0.0, jitter=0.0, error_rate=0.0, hang_rate=0.0)
+    fleet = bench_fleet(bot, server, size)
+    for state in server.states[:size]:
+        state.settle_tau = 0.1
+    server.states[0].heat = 30.0  # überschreitet max_temp ab der ersten Stufe
+    tuner = bot.AutoTuner({
+        "frequencies": "490, 525, 575, 625", "voltages": "1100, 1150, 1200, 1250",
+        "max_frequency_mhz": 650, "sample_sec": 0.02, "settle_sec": 0.2, "measure_sec": 0.3, "parallel": size,
+    })
+    patches = server.patches
+    started = time.monotonic()
+    tuner.start(fleet.miners.values())
+    await asyncio.gather(*(session.task for session in tuner.sessions.values()))
+    elapsed = time.monotonic() - started
+    sessions = list(tuner.sessions.values())
+    best = [session.best for session in sessions if session.best]
+    return {
+        "miners": size,
+        "elapsed_sec": elapsed,
+        "finished": sum(session.state == "fertig" for session in sessions),
+        "aborted": sum(session.state == "abgebrochen" for session in sessions),
+        "steps": sum(len(session.results) for session in sessions),
+        "settings_writes": server.patches - patches,
+        "best_efficiency_j_th": sum(point["efficiency"] for point in best) / len(best) if best else None,
+        "best_frequency_mhz": sum(point["frequency"] for point in best) / len(best) if best else None,
+    }
+
+async def bench_stratum(bot, server, size):
+    """Stratum-Prober: Dauer einer Runde bei geteilten Pools, Runden bis Alarm und Entwarnung."""
+    server.configure(latency=0.0, jitter=0.0, error_rate=0.0, hang_rate=0.0)
+    primary, fallback = await StubStratum(latency=0.01).start(), await StubStratum(latency=0.01).start()
+    fleet = bench_fleet(bot, server, size)
+    for state in server.states[:size]:
+        state.stratum_url, state.stratum_port = f"stratum+tcp://{primary.host}", primary.port
+        state.fallback_url, state.fallback_port = fallback.host, fallback.port
+    prober = bot.StratumProber({"timeout_sec": 0.5, "window": 5, "min_samples": 3, "max_latency_ms": 200}, fleet)
+
+    async def rounds_until(predicate, limit=10):
+        for n in range(1, limit + 1):
+            if predicate(await prober.probe_all()):
+                return n
+        return None
+
+    try:
+        await fleet.sweep(max_age=0)
+        durations = []
+        for _ in range(5):
+            started = time.monotonic()
+            healthy = await prober.probe_all()
+            durations.append(time.monotonic() - started)
+        # Primär-Pool wird langsam (über max_latency_ms), danach erholt er sich wieder
+        primary.configure(latency=0.3)
+        to_alert = await rounds_until(lambda messages: any("gestört" in text for text in messages))
+        primary.configure(latency=0.01)
+        to_recovery = await rounds_until(lambda messages: any("wieder normal" in text for text in messages))
+        stats = prober.pools[bot.stratum_endpoint(primary.host, primary.port)]
+    finally:
+        await primary.stop()
+        await fallback.stop()
+    return {
+        "miners": size,
+        "pools": len(prober.pools),
+        "round_ms": summarize(durations),
+        "connections_per_round": (primary.connections + fallback.connections) / prober.rounds,
+        "false_alerts": len(healthy),
+        "rounds_to_alert": to_alert,
+        "rounds_to_recovery": to_recovery,
+        "subscribe_p50_ms": stats.percentile(2, 0.5) * 1000,
+    }
+
+async def bench_replay(bot, workdir, miners, days):
+    """Replay eines synthetischen Szenarios: Durchsatz der Pipeline, Aufnahme und Rundreise."""
+    samples = list(bot.synthetic_samples("mixed", miners, days, 10.0, seed=7))
+    driver = await bot.ReplayDriver(bot.load_rules()).run(iter(samples))
+    report = driver.report()
+    # Dieselben Samples aufnehmen und aus der Datei erneut abspielen
+    path = workdir / f"replay-{miners}-{days}.bin"
+    recorder = bot.SnapshotRecorder(str(path), flush_interval=3600)
+    started = time.perf_counter()
+    for n, (ts, miner, data) in enumerate(samples, 1):
+        recorder.add(miner, data, ts)
+        if n % 8640 == 0:
+            await recorder.flush()
+    await recorder.close()
+    record = time.perf_counter() - started
+    replayed = await bot.ReplayDriver(bot.load_rules()).run(bot.read_recording(str(path)))
+    return {
+        "miners": miners,
+        "days": days,
+        "samples": report["samples"],
+        "wall_sec": report["wall_sec"],
+        "throughput_samples_per_sec": report["samples_per_sec"],
+        "speedup": report["speedup"],
+        "alerts": report["alerts"],
+        "alerts_by_rule": report["alerts_by_rule"],
+        "dashboard_edits": report["dashboard_edits"],
+        "record_us_per_sample": record / len(samples) * 1e6,
+        "recording_bytes_per_sample": path.stat().st_size / len(samples),
+        "replay_from_file_sec": replayed.wall,
+        "roundtrip_match": [alert[1:] for alert in replayed.alerts] == [alert[1:] for alert in driver.alerts],
+    }
+
+async def run(bot, server, args):
+    results = {}
+    wanted = set(args.only) if args.only else None
+
+    def enabled(name):
+        return wanted is None or name in wanted
+
+    await bot.bot.setup_hook()
+    try:
+        if enabled("commands"):
+            user_counts = [1, 10, 50] if args.quick else [1, 10, 50, 200]
+            per_user = 10 if args.quick else 40
+            results["commands"] = [
+                await bench_commands(bot, server, users, per_user, ttl)
+                for ttl in (bot.SNAPSHOT_TTL, 0)
+                for users in user_counts
+            ]
+        if enabled("slash"):
+            per_user = 5 if args.quick else 20
+            results["slash"] = [await bench_slash(bot, server, 10, per_user, cached) for cached in (True, False)]
+        if enabled("loop_lag"):
+            duration = 3.0 if args.quick else 8.0
+            results["loop_lag"] = [
+                await bench_loop_lag(bot, server, "schnell", 0.02, 0.0, 20, duration),
+                await bench_loop_lag(bot, server, "langsam", 1.5, 0.0, 20, duration),
+                await bench_loop_lag(bot, server, "hängt", 0.02, 0.3, 20, duration),
+            ]
+        if enabled("dashboards"):
+            results["dashboards"] = [
+                await bench_dashboards(bot, server, dashboards, 20, 5 if args.quick else 20)
+                for dashboards in ([1, 25] if args.quick else [1, 25, 100])
+            ]
+        if enabled("fleet_sweep"):
+            sizes = [1, 10, 100] if args.quick else [1, 10, 50, 100, 250, 500]
+            results["fleet_sweep"] = [
+                await bench_fleet_sweep(bot, server, size, 3 if args.quick else 10) for size in sizes
+            ]
+        if enabled("startup"):
+            results["startup"] = [
+                await bench_startup(bot, server, size, IMPORT_SEC) for size in ([1, 100] if args.quick else [1, 100, 500])
+            ]
+        if enabled("stream"):
+            results["stream"] = [
+                await bench_stream(bot, server, size, 20 if args.quick else 100) for size in ([1, 50] if args.quick else [1, 50, 200])
+            ]
+        if enabled("autotune"):
+            results["autotune"] = [await bench_autotune(bot, server, size) for size in ([4] if args.quick else [4, 50])]
+        if enabled("stratum"):
+            results["stratum"] = [await bench_stratum(bot, server, size) for size in ([1, 100] if args.quick else [1, 100, 500])]
+        if enabled("replay"):
+            workdir = pathlib.Path(os.getcwd())
+            results["replay"] = [
+                await bench_replay(bot, workdir, miners, days)
+                for miners, days in ([(1, 3), (10, 1)] if args.quick else [(1, 30), (10, 3)])
+            ]
+        if enabled("storage"):
+            results["storage"] = [
+                await bench_storage(bot, miners, 2000 if args.quick else 17280)
+                for miners in ([1, 10] if args.quick else [1, 10, 50])
+            ]
+        await wait_for_outbound(bot)
+        results["perf"] = {
+            name: bot.perf.summary(name)
+            for name in ("fetch", "commands", "discord_send", "discord_edit", "loop_lag")
+        }
+        results["server"] = {"requests": server.requests, "errors": server.errors, "hangs": server.hangs}
+    finally:
+        try:
+            await bot.bot.close()
+        except Exception:
+            # Der Bot war nie mit Discord verbunden – nur die eigenen Ressourcen zählen
+            pass
+    return results
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def flatten(value, prefix=""):
+    """{"a": [{"b": 1}]} -> {"a[0].b": 1}, nur Zahlen."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = ((f"[{i}]", v) for i, v in enumerate(value))
+    else:
+        return {prefix: value} if isinstance(value, (int, float)) and not isinstance(value, bool) else {}
+    flat = {}
+    for key, item in items:
+        path = f"{prefix}{key}" if key.startswith("[") else (f"{prefix}.{key}" if prefix else key)
+        flat.update(flatten(item, path))
+    return flat
+
+def compare(baseline, current, threshold=0.10):
+    """Druckt die relativen Änderungen und markiert Verschlechterungen über threshold."""
+    old = flatten(baseline["results"])
+    new = flatten(current["results"])
+    print(f"Vergleich {baseline['meta'].get('revision')} -> {current['meta'].get('revision')}")
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        if not old[key]:
+            continue
+        change = (new[key] - old[key]) / abs(old[key])
+        # Bei Durchsatz ist mehr besser, sonst (Zeiten, Verzögerungen) weniger
+        higher_is_better = "throughput" in key
+        worse = -change if higher_is_better else change
+        if any(part in key for part in ("_ms", "_us", "throughput")) and worse > threshold:
+            regressions += 1
+            print(f"⚠️  {key}: {old[key]:.3f} -> {new[key]:.3f} ({change:+.0%})")
+    print(f"{regressions} mögliche Verschlechterungen (> {threshold:.0%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks für den BitaxeDiscordBot")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--quick", action="store_true", help="kleinere, schnellere Läufe")
+    parser.add_argument("--only", nargs="+", choices=["commands", "loop_lag", "dashboards", "fleet_sweep", "storage", "startup", "slash", "stream", "autotune", "stratum", "replay"])
+    parser.add_argument("--compare", help="früheres Ergebnis-JSON zum Vergleich")
+    parser.add_argument("--workers", type=int, default=0, help="Poller-Worker-Prozesse ([workers] processes)")
+    args = parser.parse_args()
+    output = pathlib.Path(args.output).resolve()
+    baseline = json.loads(pathlib.Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+
+    with tempfile.TemporaryDirectory(prefix="bitaxe-bench-") as workdir:
+        port = free_port()
+        server = FakeBitaxe(miners=1, port=port)
+        bot = load_bot(pathlib.Path(workdir), server.url(0), args.workers)
+
+        async def main_async():
+            await server.start()
+            try:
+                return await run(bot, server, args)
+            finally:
+                await server.stop()
+
+        started = time.monotonic()
+        results = asyncio.run(main_async())
+        os.chdir(REPO_DIR)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "workers": args.workers,
+            "duration_sec": round(time.monotonic() - started, 1),
+        },
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Ergebnisse gespeichert: {output}")
+    if baseline is not None:
+        compare(baseline, report)
+
+if __name__ == "__main__":
+    main()
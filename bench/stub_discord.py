@@ -0,0 +1,96 @@
+"""
+Stub-Discord-Schicht für Benchmarks: Channel, Nachricht und Befehls-Context, die
+alle Sends und Edits mitschreiben, statt sie an Discord zu schicken.
+Optional simuliert latency (Sekunden) die Antwortzeit der Discord-API.
+"""
+import asyncio
+import itertools
+import time
+import types
+
+_ids = itertools.count(1_000_000)
+
+class StubMessage:
+    def __init__(self, channel, content=None, embed=None):
+        self.id = next(_ids)
+        self.channel = channel
+        self.content = content
+        self.embed = embed
+        self.edits = 0
+
+    async def edit(self, **kwargs):
+        await self.channel._delay()
+        self.edits += 1
+        self.content = kwargs.get("content", self.content)
+        self.embed = kwargs.get("embed", self.embed)
+        self.channel.record("edit", kwargs)
+        return self
+
+    async def pin(self):
+        await self.channel._delay()
+
+class StubChannel:
+    def __init__(self, channel_id=None, latency=0.0):
+        self.id = next(_ids) if channel_id is None else channel_id
+        self.latency = latency
+        self.log = []  # (monotonic, "send"|"edit", kwargs)
+        self.messages = []
+
+    async def _delay(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def record(self, kind, kwargs):
+        self.log.append((time.monotonic(), kind, kwargs))
+
+    @property
+    def sends(self):
+        return sum(1 for _, kind, _ in self.log if kind == "send")
+
+    @property
+    def edits(self):
+        return sum(1 for _, kind, _ in self.log if kind == "edit")
+
+    async def send(self, content=None, embed=None, file=None, **kwargs):
+        await self._delay()
+        message = StubMessage(self, content, embed)
+        self.messages.append(message)
+        self.record("send", {"content": content, "embed": embed, "file": file, **kwargs})
+        return message
+
+    def get_partial_message(self, message_id):
+        # Wie discord.TextChannel.get_partial_message: nur ID, bearbeitbar ohne Abruf
+        for message in self.messages:
+            if message.id == message_id:
+                return message
+        message = StubMessage(self)
+        message.id = message_id
+        self.messages.append(message)
+        return message
+
+class StubContext:
+    """
+    Minimaler Ersatz für commands.Context – genug für die Befehls-Callbacks.
+    Mit slash=True verhält er sich wie ein Slash-Befehl: acked_at hält fest, wann die
+    Interaktion bestätigt wurde (erste Antwort oder defer()).
+    """
+
+    def __init__(self, channel, command_name, author="bench-user", slash=False, **kwargs):
+        self.channel = channel
+        self.command = types.SimpleNamespace(name=command_name)
+        self.author = types.SimpleNamespace(name=author, id=next(_ids), mention=f"@{author}")
+        self.guild = None
+        self.perf_started = None
+        self.interaction = types.SimpleNamespace(id=next(_ids)) if slash else None
+        self.kwargs = kwargs
+        self.acked_at = None
+        self.deferred = False
+
+    async def defer(self, ephemeral=False):
+        self.deferred = True
+        self.acked_at = self.acked_at or time.monotonic()
+
+    async def send(self, *args, ephemeral=False, **kwargs):
+        message = await self.channel.send(*args, **kwargs)
+        self.acked_at = self.acked_at or time.monotonic()
+        return message
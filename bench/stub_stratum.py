@@ -0,0 +1,112 @@
+"""
+Stub-Stratum-Pool für Benchmarks: beantwortet mining.subscribe wie ein Stratum-V1-Pool.
+
+Antwortzeit, Jitter, Fehlerquote (Antwort mit error), hängende Verbindungen und
+abgewiesene Verbindungen lassen sich zur Laufzeit ändern – so lässt sich prüfen,
+ob der Stratum-Prober einen gestörten Pool erkennt.
+Standalone: python bench/stub_stratum.py --port 3333 --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import random
+
+class StubStratum:
+    """
+    asyncio-Server. latency/jitter in Sekunden, error_rate und hang_rate als Anteil
+    (0..1) der Anfragen. Mit refuse=True wird jede Verbindung sofort geschlossen.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, hang_rate=0.0, seed=1):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.refuse = False
+        self.rng = random.Random(seed)
+        self.connections = 0
+        self.subscribes = 0
+        self._server = None
+
+    def configure(self, **options):
+        """Ändert das Verhalten zur Laufzeit, z. B. configure(latency=2.0)."""
+        for key, value in options.items():
+            if not hasattr(self, key) or key.startswith("_"):
+                raise AttributeError(key)
+            setattr(self, key, value)
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            if self.refuse:
+                return
+            line = await reader.readline()
+            if not line:
+                return
+            request = json.loads(line)
+            self.subscribes += 1
+            roll = self.rng.random()
+            if roll < self.hang_rate:
+                await reader.read()  # bis der Client aufgibt
+                return
+            delay = self.latency + (self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Echte Pools schicken oft schon vor der Antwort eine Notification
+            writer.write(b'{"id": null, "method": "mining.set_difficulty", "params": [1024]}\n')
+            if roll >= 1.0 - self.error_rate:
+                response = {"id": request.get("id"), "result": None, "error": [20, "Other/Unknown", None]}
+            else:
+                response = {
+                    "id": request.get("id"),
+                    "result": [[["mining.set_difficulty", "1"], ["mining.notify", "1"]], "08000002", 4],
+                    "error": None,
+                }
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+            await reader.read()  # Client schließt nach der Antwort
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self.handle, self.host, self.port)
+        if not self.port:
+            self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub-Stratum-Pool für Benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3333)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    async def serve():
+        server = StubStratum(args.host, args.port, args.latency, args.jitter, args.error_rate, args.hang_rate)
+        await server.start()
+        print(f"Stub-Stratum läuft: stratum+tcp://{server.host}:{server.port}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Abruf und Dekodierung von /api/system/info ohne Discord, config.ini oder Historie:
+Snapshot und Difficulty, die HTTP-Session und die Poller-Worker. Der Bot importiert
+von hier, die Worker-Prozesse starten diese Datei direkt:
+
+    python bitaxe_poller.py <socket-fd> '<http-optionen als JSON>'
+"""
+import asyncio
+import json
+import marshal
+import socket
+import struct
+import sys
+import time
+
+import aiohttp
+
+# Difficulty-Suffixe, wie AxeOS sie ausgibt (z. B. "4.29G")
+DIFFICULTY_SUFFIXES = {"K": 1e3, "M": 1e6, "G": 1e9, "T": 1e12, "P": 1e15}
+
+class Difficulty(float):
+    """Float, der sich wie in AxeOS mit Suffix ausgibt: str(Difficulty(4.29e9)) == "4.29G"."""
+    __slots__ = ()
+
+    def __str__(self):
+        return format_difficulty(self)
+
+    def __format__(self, spec):
+        return float.__format__(self, spec) if spec else str(self)
+
+def format_difficulty(value):
+    for suffix, factor in reversed(DIFFICULTY_SUFFIXES.items()):
+        if value >= factor:
+            return f"{value / factor:.3g}{suffix}"
+    return f"{value:.0f}"
+
+def parse_difficulty(raw):
+    """
+    Konvertiert einen Wert wie "567M", "4.29G" oder 1234 in eine Difficulty.
+    Unterstützt die Suffixe K, M, G, T und P. Gibt None zurück, wenn nicht lesbar.
+    """
+    if isinstance(raw, bool) or raw is None:
+        return None
+    if isinstance(raw, (int, float)):
+        return Difficulty(raw)
+    text = str(raw).strip().replace(",", ".")
+    multiplier = DIFFICULTY_SUFFIXES.get(text[-1:].upper())
+    if multiplier is not None:
+        text = text[:-1].strip()
+    try:
+        return Difficulty(float(text) * (multiplier or 1.0))
+    except ValueError:
+        return None
+
+def _number(factor=1.0):
+    def convert(raw):
+        if isinstance(raw, bool) or raw is None:
+            return None
+        try:
+            return float(raw) * factor
+        except (TypeError, ValueError):
+            return None
+    return convert
+
+def _integer(raw):
+    if isinstance(raw, bool) or raw is None:
+        return None
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        try:
+            return int(float(raw))
+        except (TypeError, ValueError):
+            return None
+
+def _flag(raw):
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        return raw.strip().lower() in ("1", "true", "yes")
+    return bool(raw)
+
+def _text(raw):
+    # Texte wie Firmware-Version oder Stratum-URL wiederholen sich in jedem Abruf:
+    # internieren, damit alle Snapshots dasselbe String-Objekt teilen
+    return None if raw is None else sys.intern(str(raw))
+
+# (API-Feld, Attribut, Umwandlung). Spannungen und Ströme liefert die API in mV/mA,
+# im Snapshot stehen sie in V/A.
+SNAPSHOT_FIELDS = [
+    ("hashRate", "hashrate", _number()),
+    ("expectedHashrate", "expected_hashrate", _number()),
+    ("temp", "temp", _number()),
+    ("vrTemp", "vr_temp", _number()),
+    ("power", "power", _number()),
+    ("voltage", "voltage", _number(0.001)),
+    ("current", "current", _number(0.001)),
+    ("coreVoltage", "core_voltage", _number(0.001)),
+    ("coreVoltageActual", "core_voltage_actual", _number(0.001)),
+    ("frequency", "frequency", _number()),
+    ("fanspeed", "fan_speed", _number()),
+    ("fanrpm", "fan_rpm", _integer),
+    ("autofanspeed", "auto_fan", _flag),
+    ("freeHeap", "free_heap", _integer),
+    ("sharesAccepted", "shares_accepted", _integer),
+    ("sharesRejected", "shares_rejected", _integer),
+    ("uptimeSeconds", "uptime", _integer),
+    ("bestDiff", "best_diff", parse_difficulty),
+    ("bestSessionDiff", "best_session_diff", parse_difficulty),
+    ("isUsingFallbackStratum", "using_fallback", _flag),
+    ("wifiRSSI", "wifi_rssi", _integer),
+    ("ASICModel", "asic_model", _text),
+    ("deviceModel", "device_model", _text),
+    ("version", "version", _text),
+    ("runningPartition", "running_partition", _text),
+    ("lastResetReason", "reset_reason", _text),
+    ("hostname", "hostname", _text),
+    ("hostip", "host_ip", _text),
+    ("ssid", "ssid", _text),
+    ("wifiStatus", "wifi_status", _text),
+    ("stratumURL", "stratum_url", _text),
+    ("stratumPort", "stratum_port", _integer),
+    ("stratumUser", "stratum_user", _text),
+    ("fallbackStratumURL", "fallback_url", _text),
+    ("fallbackStratumPort", "fallback_port", _integer),
+    ("fallbackStratumUser", "fallback_user", _text),
+]
+SNAPSHOT_ATTRS = {key: attr for key, attr, _ in SNAPSHOT_FIELDS}
+# Was Snapshot.from_tuple nach der Übertragung wiederherstellt
+SNAPSHOT_RESTORE = [
+    Difficulty if convert is parse_difficulty else sys.intern if convert is _text else None
+    for _, _, convert in SNAPSHOT_FIELDS
+]
+
+class Snapshot:
+    """
+    Ein einmal dekodierter Abruf von /api/system/info: feste Felder mit Typen und
+    umgerechneten Einheiten, fehlende oder ungültige Werte sind None. Unveränderlich,
+    damit alle Befehle, Regeln und die Historie dasselbe Objekt teilen können.
+    """
+    __slots__ = tuple(attr for _, attr, _ in SNAPSHOT_FIELDS)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Snapshot ist unveränderlich")
+
+    @classmethod
+    def from_api(cls, raw):
+        if not isinstance(raw, dict):
+            return None
+        snapshot = object.__new__(cls)
+        for key, attr, convert in SNAPSHOT_FIELDS:
+            object.__setattr__(snapshot, attr, convert(raw.get(key)))
+        return snapshot
+
+    def to_tuple(self):
+        """Kompakte Form für die Übertragung zwischen Prozessen (nur eingebaute Typen)."""
+        return tuple(
+            float(value) if isinstance(value, Difficulty) else value
+            for value in map(self.__getattribute__, self.__slots__)
+        )
+
+    @classmethod
+    def from_tuple(cls, values):
+        snapshot = object.__new__(cls)
+        for attr, restore, value in zip(cls.__slots__, SNAPSHOT_RESTORE, values):
+            object.__setattr__(snapshot, attr, value if restore is None or value is None else restore(value))
+        return snapshot
+
+    def replace(self, **changes):
+        """Kopie mit geänderten Feldern, z. B. aus einem Ereignis im Log-Stream."""
+        snapshot = object.__new__(Snapshot)
+        for attr in self.__slots__:
+            object.__setattr__(snapshot, attr, changes[attr] if attr in changes else getattr(self, attr))
+        return snapshot
+
+    def get(self, field, default=None):
+        """Wert per API-Feldname ("hashRate") oder Attribut ("hashrate")."""
+        value = getattr(self, SNAPSHOT_ATTRS.get(field, field), None)
+        return default if value is None else value
+
+    def __repr__(self):
+        return f"Snapshot(hashrate={self.hashrate}, temp={self.temp}, best_diff={self.best_diff})"
+
+def create_http_session(limit, limit_per_host, keepalive, connect_timeout, read_timeout):
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=connect_timeout + read_timeout,
+        sock_connect=connect_timeout,
+        sock_read=read_timeout,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+async def request_bitaxe_data(session, url, timeout=None):
+    if session is None:
+        return None, "error"
+    try:
+        async with session.get(url, timeout=timeout) as response:
+            text = await response.text()
+            if response.status == 200 and text.strip():
+                return json.loads(text), "success"
+            return None, "error"
+    except asyncio.TimeoutError:
+        return None, "timeout"
+    except Exception:
+        return None, "error"
+
+# Rahmen zwischen Bot und Worker: Länge (4 Byte) + marshal-Daten
+WORKER_FRAME = struct.Struct("<I")
+
+async def read_frame(reader):
+    size, = WORKER_FRAME.unpack(await reader.readexactly(WORKER_FRAME.size))
+    return marshal.loads(await reader.readexactly(size))
+
+def write_frame(writer, message):
+    payload = marshal.dumps(message)
+    writer.write(WORKER_FRAME.pack(len(payload)) + payload)
+
+async def poller_worker(sock, http_options):
+    # Anfragen: (id, url, timeout) – Antworten: (id, snapshot-tupel oder None, outcome, dauer)
+    session = create_http_session(**http_options)
+    reader, writer = await asyncio.open_unix_connection(sock=sock)
+    tasks = set()
+
+    async def handle(request_id, url, timeout):
+        started = time.monotonic()
+        raw, outcome = await request_bitaxe_data(session, url, aiohttp.ClientTimeout(total=timeout) if timeout else None)
+        snapshot = Snapshot.from_api(raw)
+        write_frame(writer, (request_id, snapshot.to_tuple() if snapshot else None, outcome, time.monotonic() - started))
+        await writer.drain()
+
+    try:
+        while True:
+            try:
+                request_id, url, timeout = await read_frame(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break  # Bot-Prozess hat die Verbindung geschlossen
+            task = asyncio.ensure_future(handle(request_id, url, timeout))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await session.close()
+        writer.close()
+
+def main():
+    """Einstiegspunkt eines Worker-Prozesses."""
+    sock = socket.socket(fileno=int(sys.argv[1]))
+    try:
+        asyncio.run(poller_worker(sock, json.loads(sys.argv[2])))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
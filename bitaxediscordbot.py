@@ -1,21 +1,48 @@
 import discord
+import aiohttp
+from aiohttp import web
 import configparser
 import os
-import requests
+import re
+import sys
 import json
 import pathlib
-import matplotlib.pyplot as plt
 import datetime
+import gzip
 import io
 import asyncio
 import math
+import time
+import sqlite3
+import struct
+import marshal
+import socket
+import urllib.parse
+import zlib
+import array
+import itertools
+import operator
+import heapq
+import bisect
+import random
+import collections
+import concurrent.futures
 
+from discord import app_commands
+import bitaxe_poller
+from bitaxe_poller import (
+    Difficulty, Snapshot, SNAPSHOT_FIELDS, SNAPSHOT_ATTRS, create_http_session,
+    format_difficulty, parse_difficulty, read_frame, request_bitaxe_data, write_frame,
+)
 from discord.ext import commands
 from colorama import init, Fore, Style
 from zoneinfo import ZoneInfo 
 
 init(autoreset=True)
 
+# Bezugspunkt für die Startzeit ("bereit und fragt ab")
+STARTED_AT = time.monotonic()
+
 # Konfiguration laden
 config = configparser.ConfigParser()
 config.read('config.ini')
@@ -24,42 +51,447 @@ console_interval = int(config['settings'].get('console_interval_sec', 30))
 
 token = config['discord']['token']
 channel_id = int(config['discord']['channel_id'])
-BITAXE_API_URL = config['bitaxe']['api_url']
-history_file = 'best_difficulty_history.json'  # Datei für die Historie
+BITAXE_API_URL = config['bitaxe'].get('api_url')
+history_file = 'best_difficulty_history.jsonl'  # Journal der Best Difficulties
+legacy_history_file = 'best_difficulty_history.json'  # altes Format, wird einmalig übernommen
+
+# Prefix-Befehle (!status) brauchen den privilegierten message_content-Intent und damit
+# jede Nachricht aus jedem sichtbaren Channel. Ohne sie laufen nur die Slash-Befehle.
+PREFIX_COMMANDS = config['discord'].getboolean('prefix_commands', True)
+SLASH_COMMANDS = config['discord'].getboolean('slash_commands', True)
+# Optional: Slash-Befehle nur in diesem Server registrieren (sofort verfügbar statt global)
+SLASH_GUILD_ID = int(config['discord'].get('guild_id', 0)) or None
+COMMAND_SIGIL = "!" if PREFIX_COMMANDS else "/"
 
 intents = discord.Intents.default()
-intents.messages = True
+intents.messages = PREFIX_COMMANDS
 intents.guilds = True
-intents.message_content = True
-
-bot = commands.Bot(command_prefix="!", intents=intents, help_command=None)
+intents.message_content = PREFIX_COMMANDS
 
 DASHBOARD_INTERVAL = int(config['settings'].get('dashboard_interval', 30))
+SNAPSHOT_TTL = float(config['settings'].get('snapshot_ttl_sec', 5))
+# AxeOS liefert hashRate in GH/s – so steht es in allen Anzeigen, Regeltexten und Metriken
+HASHRATE_UNIT = "GH/s"
+# Bewertung der Hashrate in GH/s (Emoji in Anzeigen und Konsole, Standardregel
+# hashrate_low). Die Voreinstellung passt zu einem Bitaxe Ultra (~500 GH/s),
+# für Supra oder Gamma in [bitaxe] höher setzen.
+HASHRATE_LOW = float(config['bitaxe'].get('hashrate_low', 350))
+HASHRATE_OK = float(config['bitaxe'].get('hashrate_ok', 400))
 
-# Live Dashboard
-def fetch_bitaxe_data():
-    return {
-        "temp": 56.7,
-        "hashRate": 375.32,
-        "uptimeSeconds": 123456,
-        "bestDiff": "568M",  # Beispielwert, z. B. "568M" – Steigt er, soll dies hervorgehoben werden
-        "stratumURL": "pool.example.com",
-        "voltage": 5141.25,  # Korrekte Spannung in mV
-        "current": 1500,      # Stromstärke in mA
-        "power": 350.00       # Stromverbrauch in Watt
-    }
+def joules_per_terahash(power, hashrate):
+    """Effizienz in J/TH aus Leistung (W) und Hashrate (GH/s); None ohne Hashrate."""
+    return power / (hashrate / 1000.0) if power is not None and hashrate else None
 
-# Funktion zum Parsen eines Best Diff-Strings (zum Vergleich)
-def parse_best(best_str):
-    try:
-        # Suche nach Zahlen im String (z. B. "568" aus "568M")
-        number_str = re.sub(r"[^\d.,]", "", best_str)
-        number_str = number_str.replace(',', '.')
-        return float(number_str)
-    except Exception:
-        return None
+# HTTP-Einstellungen für die Verbindung zum Miner
+HTTP_CONNECT_TIMEOUT = float(config['bitaxe'].get('connect_timeout_sec', 2))
+HTTP_READ_TIMEOUT = float(config['bitaxe'].get('read_timeout_sec', 5))
+HTTP_POOL_SIZE = int(config['bitaxe'].get('pool_size', 4))
+HTTP_KEEPALIVE = float(config['bitaxe'].get('keepalive_sec', 30))
+
+# Fleet-Einstellungen: wie viele Miner gleichzeitig abgefragt werden dürfen
+FLEET_CONCURRENCY = int(config['fleet'].get('concurrency', 128)) if config.has_section('fleet') else 128
+
+# Gemeinsame aiohttp-Session (Keep-Alive, begrenzter Connection-Pool).
+# Wird in setup_hook geöffnet und beim Beenden des Bots geschlossen.
+http_session = None
+
+# Für create_http_session, auch an die Poller-Worker übergeben
+HTTP_SESSION_OPTIONS = {
+    "limit": max(FLEET_CONCURRENCY, HTTP_POOL_SIZE),
+    "limit_per_host": HTTP_POOL_SIZE,
+    "keepalive": HTTP_KEEPALIVE,
+    "connect_timeout": HTTP_CONNECT_TIMEOUT,
+    "read_timeout": HTTP_READ_TIMEOUT,
+}
+
+class BitaxeBot(commands.Bot):
+    async def setup_hook(self):
+        global http_session
+        # Gespeicherte Dateien erst beim Start lesen (und ggf. migrieren), nicht beim Import
+        best_journal.load(default_miner=fleet.default.name, legacy_path=legacy_history_file)
+        runtime_state.load()
+        runtime_state.restore()
+        http_session = create_http_session(**HTTP_SESSION_OPTIONS)
+        if poller_pool is not None:
+            await poller_pool.start()
+            fleet.remote = poller_pool
+        if sample_store is not None:
+            asyncio.create_task(sample_store.run())
+            asyncio.create_task(sample_store.maintain())
+        if recorder is not None:
+            asyncio.create_task(recorder.run())
+        if metrics_exporter is not None:
+            await metrics_exporter.start()
+        if log_streams is not None:
+            log_streams.start()
+        if stratum_prober is not None:
+            self.stratum_task = asyncio.create_task(stratum_prober.run())
+        asyncio.create_task(probe_loop_lag())
+
+    async def close(self):
+        global http_session
+        await runtime_state.save()
+        runtime_state.close()
+        if poller_pool is not None:
+            fleet.remote = None
+            await poller_pool.stop()
+        if metrics_exporter is not None:
+            await metrics_exporter.stop()
+        if log_streams is not None:
+            await log_streams.stop()
+        if stratum_prober is not None and getattr(self, "stratum_task", None) is not None:
+            self.stratum_task.cancel()
+        if sample_store is not None:
+            await sample_store.close()
+        if recorder is not None:
+            await recorder.close()
+        await asyncio.to_thread(best_journal.close)
+        if chart_renderer.pool is not None:
+            chart_renderer.pool.shutdown(wait=False, cancel_futures=True)
+        if http_session is not None:
+            await http_session.close()
+            http_session = None
+        await super().close()
+
+bot = BitaxeBot(command_prefix="!" if PREFIX_COMMANDS else commands.when_mentioned, intents=intents, help_command=None)
+
+# Startzeitpunkt eines Befehls für die Antwortzeit-Messung. Slash-Befehle müssen
+# innerhalb von 3 s beantwortet werden: sie werden nur zurückgestellt ("denkt nach …"),
+# wenn die Antwort nicht aus dem Snapshot-Cache kommen kann.
+@bot.before_invoke
+async def mark_command_start(ctx):
+    ctx.perf_started = time.monotonic()
+    if ctx.interaction is not None and needs_deferral(ctx):
+        await ctx.defer()
+        perf.count("slash_deferred")
+
+# Interne Messwerte: Latenz-Histogramme mit festen, logarithmischen Grenzen.
+# Ein Messwert kostet nur eine binäre Suche und ein paar Additionen.
+class LatencyHistogram:
+    BOUNDS = [0.001 * 2 ** i for i in range(17)]  # 1 ms bis ~65 s
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """Näherung: lineare Interpolation innerhalb des Buckets."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.BOUNDS[i - 1] if i > 0 else 0.0
+                upper = self.BOUNDS[i] if i < len(self.BOUNDS) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+class PerfRegistry:
+    def __init__(self):
+        self.histograms = {}
+        self.counters = collections.Counter()
+        self.started = time.monotonic()
+
+    def observe(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def summary(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None or not histogram.count:
+            return None
+        return {
+            "count": histogram.count,
+            "p50": histogram.percentile(0.50),
+            "p95": histogram.percentile(0.95),
+            "p99": histogram.percentile(0.99),
+            "max": histogram.max,
+        }
 
-def generate_dashboard_embed(data, highlight_best=False):
+    def format(self, name):
+        summary = self.summary(name)
+        if summary is None:
+            return "keine Daten"
+        return (
+            f"p50 {summary['p50'] * 1000:.0f} ms | p95 {summary['p95'] * 1000:.0f} ms | "
+            f"p99 {summary['p99'] * 1000:.0f} ms | n={summary['count']}"
+        )
+
+perf = PerfRegistry()
+PERF_LOG_INTERVAL = float(config['settings'].get('perf_log_interval_sec', 300))
+LOOP_PROBE_INTERVAL = 0.5
+
+# Misst die Verzögerung des Event-Loops: wie viel später als geplant wacht der Probe-Task auf?
+async def probe_loop_lag():
+    while True:
+        expected = time.monotonic() + LOOP_PROBE_INTERVAL
+        await asyncio.sleep(LOOP_PROBE_INTERVAL)
+        perf.observe("loop_lag", max(0.0, time.monotonic() - expected))
+
+# Ausgangs-Queue für alle Nachrichten an Discord. Pro Channel gibt es eine Spur mit
+# eigenem Token-Bucket; innerhalb einer Spur gehen Befehlsantworten vor Alerts vor
+# Dashboard-Edits. Überholte Dashboard-Edits werden zusammengefasst, Alerts innerhalb
+# eines kurzen Fensters zu einer Nachricht gebündelt.
+PRIORITY_COMMAND = 0
+PRIORITY_ALERT = 1
+PRIORITY_DASHBOARD = 2
+PRIORITY_NAMES = {PRIORITY_COMMAND: "Befehle", PRIORITY_ALERT: "Alerts", PRIORITY_DASHBOARD: "Dashboards"}
+
+SEND_RATE = int(config['discord'].get('send_rate', 5))
+SEND_PER_SEC = float(config['discord'].get('send_per_sec', 5))
+ALERT_BATCH_SEC = float(config['discord'].get('alert_batch_sec', 2))
+DISCORD_MESSAGE_LIMIT = 2000
+
+class OutboundJob:
+    __slots__ = ("priority", "seq", "action", "kwargs", "future", "enqueued_at", "edit_key")
+
+    def __init__(self, priority, seq, action, kwargs, edit_key=None):
+        self.priority = priority
+        self.seq = seq
+        self.action = action
+        self.kwargs = kwargs
+        self.future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.monotonic()
+        self.edit_key = edit_key
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+class OutboundLane:
+    def __init__(self, rate):
+        self.heap = []
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.worker = None
+
+def channel_id_of(target):
+    channel = getattr(target, "channel", target)
+    return getattr(channel, "id", id(channel))
+
+class OutboundDispatcher:
+    def __init__(self, rate, per, alert_window):
+        self.rate = rate
+        self.per = per
+        self.alert_window = alert_window
+        self._lanes = {}   # Channel-ID -> OutboundLane
+        self._edits = {}   # Message-ID -> noch nicht gesendeter Edit
+        self._alerts = {}  # Channel-ID -> gesammelte Alert-Texte
+        self._seq = 0
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.batched = 0
+        self.wait_total = dict.fromkeys(PRIORITY_NAMES, 0.0)
+        self.wait_max = dict.fromkeys(PRIORITY_NAMES, 0.0)
+        self.wait_count = dict.fromkeys(PRIORITY_NAMES, 0)
+
+    def _enqueue(self, channel_id, priority, action, kwargs, edit_key=None):
+        self._seq += 1
+        job = OutboundJob(priority, self._seq, action, kwargs, edit_key)
+        lane = self._lanes.get(channel_id)
+        if lane is None:
+            lane = self._lanes[channel_id] = OutboundLane(self.rate)
+        heapq.heappush(lane.heap, job)
+        if lane.worker is None:
+            lane.worker = asyncio.ensure_future(self._drain(lane))
+        return job
+
+    async def send(self, target, priority=PRIORITY_COMMAND, **kwargs):
+        """Sendet über target.send (Context oder Channel) und gibt die Nachricht zurück."""
+        job = self._enqueue(channel_id_of(target), priority, target.send, kwargs)
+        return await job.future
+
+    def edit(self, message, **kwargs):
+        """
+        Reiht einen Dashboard-Edit ein. Liegt für dieselbe Nachricht noch ein Edit in
+        der Queue, wird nur dessen Inhalt ersetzt. Gibt ein Future zurück.
+        """
+        pending = self._edits.get(message.id)
+        if pending is not None:
+            pending.kwargs = kwargs
+            self.coalesced += 1
+            return pending.future
+        job = self._enqueue(channel_id_of(message), PRIORITY_DASHBOARD, message.edit, kwargs, edit_key=message.id)
+        self._edits[message.id] = job
+        return job.future
+
+    def alert(self, channel, text):
+        """Sammelt Alerts für alert_window Sekunden und sendet sie als eine Nachricht."""
+        batch = self._alerts.get(channel.id)
+        if batch is None:
+            batch = self._alerts[channel.id] = []
+            asyncio.get_running_loop().call_later(self.alert_window, self._flush_alerts, channel)
+        else:
+            self.batched += 1
+        batch.append(text)
+
+    def _flush_alerts(self, channel):
+        texts = self._alerts.pop(channel.id, [])
+        chunk = ""
+        for text in texts:
+            if chunk and len(chunk) + len(text) + 1 > DISCORD_MESSAGE_LIMIT:
+                self._send_alert_chunk(channel, chunk)
+                chunk = ""
+            chunk = f"{chunk}\n{text}" if chunk else text
+        if chunk:
+            self._send_alert_chunk(channel, chunk)
+
+    def _send_alert_chunk(self, channel, content):
+        job = self._enqueue(channel.id, PRIORITY_ALERT, channel.send, {"content": content[:DISCORD_MESSAGE_LIMIT]})
+        job.future.add_done_callback(self._report_error)
+
+    @staticmethod
+    def _report_error(future):
+        if not future.cancelled() and future.exception() is not None:
+            print(f"{Fore.RED}Fehler beim Senden an Discord: {future.exception()}{Style.RESET_ALL}")
+
+    async def _take_token(self, lane):
+        while True:
+            now = time.monotonic()
+            lane.tokens = min(self.rate, lane.tokens + (now - lane.updated) * self.rate / self.per)
+            lane.updated = now
+            if lane.tokens >= 1:
+                lane.tokens -= 1
+                return
+            await asyncio.sleep((1 - lane.tokens) * self.per / self.rate)
+
+    async def _drain(self, lane):
+        try:
+            while lane.heap:
+                await self._take_token(lane)
+                # Erst nach dem Token wählen, damit zwischenzeitlich eingetroffene
+                # Befehlsantworten noch vorgezogen werden
+                job = heapq.heappop(lane.heap)
+                if job.edit_key is not None:
+                    self._edits.pop(job.edit_key, None)
+                wait = time.monotonic() - job.enqueued_at
+                self.wait_total[job.priority] += wait
+                self.wait_count[job.priority] += 1
+                self.wait_max[job.priority] = max(self.wait_max[job.priority], wait)
+                started = time.monotonic()
+                try:
+                    result = await job.action(**job.kwargs)
+                except Exception as e:
+                    self.failed += 1
+                    perf.count("discord_errors")
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                else:
+                    self.sent += 1
+                    perf.observe("discord_edit" if job.edit_key is not None else "discord_send", time.monotonic() - started)
+                    if not job.future.done():
+                        job.future.set_result(result)
+        finally:
+            lane.worker = None
+
+    def depth(self):
+        return sum(len(lane.heap) for lane in self._lanes.values())
+
+    def stats(self):
+        """Kennzahlen zum Rückstau: Tiefe, Durchsätze und Wartezeiten je Priorität."""
+        waits = {
+            name: (
+                self.wait_total[prio] / self.wait_count[prio] if self.wait_count[prio] else 0.0,
+                self.wait_max[prio],
+            )
+            for prio, name in PRIORITY_NAMES.items()
+        }
+        return {
+            "depth": self.depth(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "batched": self.batched,
+            "waits": waits,
+        }
+
+outbound = OutboundDispatcher(SEND_RATE, SEND_PER_SEC, ALERT_BATCH_SEC)
+
+# Antwort auf einen Befehl – läuft mit höchster Priorität über die Ausgangs-Queue.
+# Slash-Befehle antworten über die Interaktion, die nicht zum Channel-Limit zählt.
+async def reply(ctx, content=None, **kwargs):
+    if ctx.interaction is not None:
+        message = await ctx.send(content=content, **kwargs)
+    else:
+        message = await outbound.send(ctx, PRIORITY_COMMAND, content=content, **kwargs)
+    started = getattr(ctx, "perf_started", None)
+    if started is not None:
+        # Dauer vom Eingang des Befehls bis zur gesendeten (ersten) Antwort
+        perf.observe(f"command:{ctx.command.name}", time.monotonic() - started)
+        perf.observe("commands", time.monotonic() - started)
+        ctx.perf_started = None
+    return message
+
+# Slash-Befehle: Beschreibungen der Argumente und Autovervollständigung
+MINER_PARAM = "Miner-Name, tag:<tag> oder leer für den Standard"
+SLASH_CHOICES = 25  # mehr Vorschläge lässt Discord nicht zu
+
+def choices_for(current, values):
+    current = current.lower()
+    return [app_commands.Choice(name=value, value=value) for value in values if current in value.lower()][:SLASH_CHOICES]
+
+async def miner_autocomplete(interaction, current):
+    tags = sorted({f"tag:{tag}" for miner in fleet.miners.values() for tag in miner.tags})
+    return choices_for(current, list(fleet.miners) + tags)
+
+async def dashboard_autocomplete(interaction, current):
+    return (await miner_autocomplete(interaction, current) + choices_for(current, ["stop"]))[:SLASH_CHOICES]
+
+async def metric_autocomplete(interaction, current):
+    return choices_for(current, list(CHART_METRICS))
+
+async def period_autocomplete(interaction, current):
+    return choices_for(current, ["1h", "6h", "24h", "7d", "30d", "90d"])
+
+async def window_autocomplete(interaction, current):
+    return choices_for(current, list(STATS_WINDOWS) + (["7d", "30d", "90d"] if sample_store is not None else []))
+
+def needs_deferral(ctx):
+    """Muss der Befehl erst beim Miner abfragen, in der Historie suchen oder ein Diagramm zeichnen?"""
+    name = ctx.command.name
+    if name in ("help", "queue", "perf"):
+        return False
+    if name == "chart":
+        return True
+    if name == "stats":
+        return ctx.kwargs.get("window", "1h").lower() not in STATS_WINDOWS
+    selector = ctx.kwargs.get("miner")
+    if selector is not None and selector.lower() == "stop":
+        return False
+    if wants_fleet_view(selector):
+        miners = fleet.select(selector)
+    else:
+        miners = [miner for miner in [resolve_miner(selector)] if miner is not None]
+    return any(miner.cache.would_fetch() for miner in miners)
+
+def slash_description(text):
+    # Discord erlaubt höchstens 100 Zeichen: ohne Hinweise wie "Optional: …" oder "Beispiel: …"
+    text = re.split(r"\. (?=\w+:)| – ", text or "", maxsplit=1)[0].strip() or "…"
+    return text if len(text) <= 100 else text[:99] + "…"
+
+# Anzeige eines Snapshot-Werts, None wird zu "N/A"
+def show(value, spec=""):
+    return "N/A" if value is None else format(value, spec)
+
+def generate_dashboard_embed(data, highlight_best=False, age=None):
     embed = discord.Embed(
         title="🚀 Live Dashboard",
         color=0x3498db,
@@ -67,11 +499,9 @@ def generate_dashboard_embed(data, highlight_best=False):
     )
     
     # Hilfsfunktion für die Temperatur
-    def format_temperature(temp):
-        try:
-            temp_val = float(temp)
-        except Exception:
-            return f"🌡 {temp} °C"
+    def format_temperature(temp_val):
+        if temp_val is None:
+            return "🌡 N/A °C"
         if temp_val >= 60:
             emoji = "🔥"  # sehr heiß
         elif temp_val >= 55:
@@ -81,30 +511,24 @@ def generate_dashboard_embed(data, highlight_best=False):
         return f"{emoji} {temp_val:.1f} °C"
     
     # Hilfsfunktion für die Hashrate
-    def format_hashrate(hr):
-        try:
-            hr_val = float(hr)
-        except Exception:
-            return f"💪 {hr} MH/s"
-        if hr_val >= 400:
+    def format_hashrate(hr_val):
+        if hr_val is None:
+            return f"💪 N/A {HASHRATE_UNIT}"
+        if hr_val >= HASHRATE_OK:
             emoji = "💪"  # Top-Performance
-        elif hr_val >= 350:
+        elif hr_val >= HASHRATE_LOW:
             emoji = "⚡"  # in Ordnung
         else:
             emoji = "🔥"  # niedrig
-        return f"{emoji} {hr_val:.2f} MH/s"
+        return f"{emoji} {hr_val:.2f} {HASHRATE_UNIT}"
     
     # Hilfsfunktion für die Uptime
     def format_uptime(uptime_sec):
-        try:
-            uptime_int = int(uptime_sec)
-        except Exception:
-            uptime_int = 0
-        uptime_str = str(datetime.timedelta(seconds=uptime_int))
-        return f"⌛ {uptime_str}"
+        return f"⌛ {datetime.timedelta(seconds=uptime_sec or 0)}"
     
     # Hilfsfunktion für Best Difficulty
     def format_best_diff(best):
+        best = show(best)
         if highlight_best:
             return f"✨🏆 {best}"  # Hervorhebung bei Anstieg
         else:
@@ -119,175 +543,2209 @@ def generate_dashboard_embed(data, highlight_best=False):
             return f"{emoji} {stratum}"
     
     # Hilfsfunktion für Stromverbrauch und Spannung kombiniert
-    def format_power_and_voltage(power, voltage_mV):
-        try:
-            power_val = float(power)  # Stromverbrauch in Watt
-            voltage_val = float(voltage_mV) / 1000.0  # Spannung von mV in V umrechnen
-            return f"🔌 {power_val:.2f} W @ {voltage_val:.2f} V"
-        except Exception:
+    def format_power_and_voltage(power, voltage):
+        if power is None or voltage is None:
             return "🔌 Stromverbrauch: N/A"
+        return f"🔌 {power:.2f} W @ {voltage:.2f} V"
 
 
     if data:
-        # Werte aus den Daten abrufen
-        temp = data.get("temp", "N/A")
-        hr = data.get("hashRate", "N/A")
-        uptime_seconds = data.get("uptimeSeconds", 0)
-        best = data.get("bestDiff", "N/A")
-        stratum = data.get("stratumURL", "N/A")
-        power = data.get("power", "N/A")
-        voltage_mV = data.get("voltage", "N/A")  # Spannung in mV abrufen
-        
         # Felder für das Embed hinzufügen
-        embed.add_field(name="Temperatur", value=format_temperature(temp), inline=True)
-        embed.add_field(name="Hashrate", value=format_hashrate(hr), inline=True)
-        embed.add_field(name="Uptime", value=format_uptime(uptime_seconds), inline=True)
-        embed.add_field(name="Best Difficulty", value=format_best_diff(best), inline=True)
-        embed.add_field(name="Stratum", value=format_stratum(stratum), inline=True)
-        embed.add_field(name="Stromverbrauch", value=format_power_and_voltage(power, voltage_mV), inline=True)
+        embed.add_field(name="Temperatur", value=format_temperature(data.temp), inline=True)
+        embed.add_field(name="Hashrate", value=format_hashrate(data.hashrate), inline=True)
+        embed.add_field(name="Uptime", value=format_uptime(data.uptime), inline=True)
+        embed.add_field(name="Best Difficulty", value=format_best_diff(data.best_diff), inline=True)
+        embed.add_field(name="Stratum", value=format_stratum(data.stratum_url), inline=True)
+        embed.add_field(name="Stromverbrauch", value=format_power_and_voltage(data.power, data.voltage), inline=True)
     else:
         embed.add_field(name="Status", value="🚫 Keine Verbindung zur Bitaxe API.", inline=False)
     
-    embed.set_footer(text=f"Dashboard aktualisiert sich alle {DASHBOARD_INTERVAL} Sekunden")
+    embed.set_footer(text=f"Dashboard aktualisiert sich alle {DASHBOARD_INTERVAL} Sekunden · {format_age(age)}")
+    return embed
+
+# Fleet-Übersicht: Gesamtwerte plus eine Zeile pro Miner
+FLEET_SUMMARY_MAX_LINES = 40
+
+def fleet_aggregates(miners, source=None):
+    """Gibt (Gesamt-Hashrate, Max-Temperatur, Anzahl offline) der Miner zurück."""
+    source = fleet if source is None else source
+    return source.aggregates([m.name for m in miners])
+
+def format_fleet_line(miner, data):
+    if not data:
+        return f"🔴 **{miner.name}** – offline"
+    return f"🟢 **{miner.name}** – {show(data.hashrate, '.2f')} {HASHRATE_UNIT} | {show(data.temp)} °C"
+
+def generate_fleet_embed(results, title="🛰️ Fleet Übersicht", source=None):
+    miners = [miner for miner, _, _ in results]
+    total_hr, max_temp, offline = fleet_aggregates(miners, source)
+    embed = discord.Embed(
+        title=title,
+        color=0x3498db,
+        timestamp=datetime.datetime.utcnow()
+    )
+    embed.add_field(name="Gesamt-Hashrate", value=f"⚡ {total_hr:.2f} {HASHRATE_UNIT}", inline=True)
+    embed.add_field(name="Max. Temperatur", value=f"🌡 {max_temp:.1f} °C" if max_temp is not None else "N/A", inline=True)
+    embed.add_field(name="Offline", value=f"🚫 {offline} / {len(miners)}", inline=True)
+
+    lines = [format_fleet_line(miner, data) for miner, data, _ in results[:FLEET_SUMMARY_MAX_LINES]]
+    if len(results) > FLEET_SUMMARY_MAX_LINES:
+        lines.append(f"… und {len(results) - FLEET_SUMMARY_MAX_LINES} weitere")
+    embed.description = "\n".join(lines)
+
+    ages = [age for _, _, age in results if age is not None]
+    embed.set_footer(text=format_age(max(ages) if ages else None))
     return embed
 
+# Entscheidet, ob ein Befehl die Fleet-Übersicht zeigen soll: kein Argument bei
+# mehreren Minern oder ein Tag-Filter ("tag:<name>")
+def wants_fleet_view(selector):
+    if selector is None:
+        return len(fleet.miners) > 1
+    return selector.lower().startswith("tag:")
+
+# Vergleichsschlüssel eines Embeds: Zeitstempel und Footer (enthält das Snapshot-Alter)
+# zählen nicht als Änderung, damit unveränderte Dashboards nicht bearbeitet werden.
+def embed_content_key(embed):
+    content = embed.to_dict()
+    content.pop("timestamp", None)
+    content.pop("footer", None)
+    return json.dumps(content, sort_keys=True)
+
+class DashboardEntry:
+    def __init__(self, message, selector):
+        self.message = message
+        self.selector = selector
+        self.last_key = None
+
+# Zentrale Verwaltung aller Live-Dashboards: jeder Tick des Schedulers rendert jedes
+# Embed einmal pro Snapshot und verteilt es an alle Dashboards mit derselben Auswahl.
+class DashboardManager:
+    def __init__(self, source=None):
+        self.entries = {}    # Channel-ID -> DashboardEntry (ein Dashboard pro Channel)
+        self._last_best = {}  # Miner -> zuletzt gesehene Best Difficulty (für die Hervorhebung)
+        self.edits_sent = 0
+        self.edits_skipped = 0
+        self._source = source  # eigene Fleet (Replay), sonst die des Bots
+
+    @property
+    def fleet(self):
+        return fleet if self._source is None else self._source
+
+    def selector_for(self, miner):
+        """
+        Normalisiert das Befehlsargument zu ("fleet", filter) oder ("miner", name).
+        Gibt None zurück, wenn der Miner bzw. Tag unbekannt ist.
+        """
+        if wants_fleet_view(miner):
+            return ("fleet", miner) if self.fleet.select(miner) else None
+        target = resolve_miner(miner, self.fleet)
+        return ("miner", target.name) if target else None
+
+    async def render(self, selector, fresh=False):
+        """
+        Baut das Embed für eine Auswahl. Ohne fresh werden nur die vom Scheduler
+        gefüllten Caches gelesen, ein Dashboard löst also keine eigene Abfrage aus.
+        """
+        kind, value = selector
+        if kind == "fleet":
+            miners = self.fleet.select(value)
+            results = await self.fleet.sweep(miners) if fresh else self.fleet.peek(miners)
+            embed = generate_fleet_embed(results, title="🚀 Fleet Dashboard", source=self.fleet)
+        else:
+            cache = self.fleet.miners[value].cache
+            data, age = await cache.get() if fresh else cache.peek()
+            new_best = data.best_diff if data else None
+            last_best = self._last_best.get(value)
+            # Hervorheben, wenn sich der Best Difficulty-Wert erhöht hat
+            highlight = last_best is not None and new_best is not None and new_best > last_best
+            if new_best is not None:
+                self._last_best[value] = new_best
+            embed = generate_dashboard_embed(data, highlight_best=highlight, age=age)
+        embed.timestamp = datetime.datetime.now(ZoneInfo(config['settings'].get('timezone', 'Europe/Berlin')))
+        return embed
+
+    async def start(self, channel, selector):
+        embed = await self.render(selector, fresh=True)
+        message = await outbound.send(channel, PRIORITY_COMMAND, embed=embed)
+        entry = DashboardEntry(message, selector)
+        entry.last_key = embed_content_key(embed)
+        # Ein bestehendes Dashboard im selben Channel wird ersetzt
+        self.entries[channel.id] = entry
+        return message
+
+    def stop(self, channel_id):
+        return self.entries.pop(channel_id, None) is not None
+
+    def forget(self, miner):
+        """Beendet die Dashboards eines aus der Fleet entfernten Miners."""
+        self._last_best.pop(miner, None)
+        for channel_id, entry in list(self.entries.items()):
+            if entry.selector == ("miner", miner):
+                del self.entries[channel_id]
+
+    def export(self):
+        return {
+            "entries": {
+                str(channel_id): {"message_id": entry.message.id, "selector": list(entry.selector)}
+                for channel_id, entry in self.entries.items()
+            },
+            "last_best": dict(self._last_best),
+        }
+
+    def restore_entries(self, saved):
+        """
+        Übernimmt die Dashboards von vor dem Neustart: die bestehenden Nachrichten
+        werden weiter bearbeitet, statt neue zu senden.
+        """
+        for channel_id, entry in saved.get("entries", {}).items():
+            channel = bot.get_channel(int(channel_id))
+            kind, value = entry["selector"]
+            if channel is None or (kind == "miner" and value not in self.fleet.miners):
+                continue
+            self.entries[channel.id] = DashboardEntry(channel.get_partial_message(entry["message_id"]), (kind, value))
+        return len(self.entries)
+
+    async def tick(self):
+        groups = {}
+        for channel_id, entry in list(self.entries.items()):
+            groups.setdefault(entry.selector, []).append((channel_id, entry))
+        for selector, entries in groups.items():
+            embed = await self.render(selector)
+            key = embed_content_key(embed)
+            for channel_id, entry in entries:
+                if entry.last_key == key:
+                    self.edits_skipped += 1
+                    continue
+                # Nicht warten: die Ausgangs-Queue fasst überholte Edits zusammen
+                entry.last_key = key
+                self.edits_sent += 1
+                future = outbound.edit(entry.message, embed=embed)
+                future.add_done_callback(lambda f, c=channel_id, e=entry: self._edit_done(f, c, e))
+
+    def _edit_done(self, future, channel_id, entry):
+        if future.cancelled() or future.exception() is None:
+            return
+        if isinstance(future.exception(), discord.NotFound):
+            # Nachricht wurde gelöscht: Dashboard abmelden
+            if self.entries.get(channel_id) is entry:
+                del self.entries[channel_id]
+        else:
+            # Beim nächsten Tick erneut versuchen
+            entry.last_key = None
+            print(f"Fehler beim Aktualisieren des Dashboards: {future.exception()}")
+
+dashboard_manager = DashboardManager()
+
 # Dashboard-Command, der das Live-Dashboard anzeigt und regelmäßig aktualisiert
-@bot.command(help="Zeigt ein Live-Dashboard mit kontinuierlichen Updates.")
-async def dashboard(ctx):
-    channel = ctx.channel
-    timezone_str = config['settings'].get('timezone', 'Europe/Berlin')
-    
-    # Initiale Daten abrufen und Embed senden
-    data = fetch_bitaxe_data()
-    dashboard_message = await channel.send(embed=generate_dashboard_embed(data, highlight_best=False))
-    
-    # Den letzten Best Difficulty-Wert (als float) speichern
-    last_best = parse_best(data.get("bestDiff", "N/A"))
-    
-    # Endlosschleife für regelmäßige Updates
-    while True:
-        data = fetch_bitaxe_data()
-        new_best_str = data.get("bestDiff", "N/A")
-        new_best_val = parse_best(new_best_str)
-        
-        # Überprüfen, ob sich der Best Difficulty-Wert erhöht hat
-        if last_best is not None and new_best_val is not None and new_best_val > last_best:
-            highlight = True
+@bot.hybrid_command(help="Zeigt ein Live-Dashboard mit kontinuierlichen Updates. Optional: Miner-Name, tag:<tag> oder stop")
+@app_commands.describe(miner=MINER_PARAM + " – oder stop")
+@app_commands.autocomplete(miner=dashboard_autocomplete)
+async def dashboard(ctx, miner: str = None):
+    if miner is not None and miner.lower() == "stop":
+        if dashboard_manager.stop(ctx.channel.id):
+            runtime_state.save_soon()
+            await reply(ctx, "🛑 Dashboard in diesem Channel gestoppt.")
         else:
-            highlight = False
-        
-        # Aktualisieren: Neuer Wert wird gespeichert
-        if new_best_val is not None:
-            last_best = new_best_val
-        
-        now = datetime.datetime.now(ZoneInfo(timezone_str))
-        new_embed = generate_dashboard_embed(data, highlight_best=highlight)
-        new_embed.timestamp = now
-        try:
-            await dashboard_message.edit(embed=new_embed)
-        except Exception as e:
-            print(f"Fehler beim Aktualisieren des Dashboards: {e}")
-        await asyncio.sleep(DASHBOARD_INTERVAL)
+            await reply(ctx, "ℹ️ In diesem Channel läuft kein Dashboard.")
+        return
 
-# Optional: Im on_ready-Event kannst du auch das Dashboard automatisch an einem bestimmten Channel posten und anpinnen.
-@bot.event
-async def on_ready():
-    print(f"{bot.user} ist jetzt online!")
+    selector = dashboard_manager.selector_for(miner)
+    if selector is None:
+        await reply(ctx, unknown_miner_text(miner))
+        return
+    await dashboard_manager.start(ctx.channel, selector)
+    runtime_state.save_soon()
+    if ctx.interaction is not None:
+        # Das Dashboard ist eine eigene Nachricht im Channel; die Interaktion nur bestätigen
+        await reply(ctx, "📊 Live-Dashboard gestartet.", ephemeral=True)
+
+# Optional: Im on_ready-Event wird das Dashboard automatisch an einem bestimmten Channel gepostet und angepinnt.
+async def post_pinned_dashboard():
     dashboard_channel_id = int(config['settings'].get("dashboard_channel_id", "123456789012345678"))
     channel = bot.get_channel(dashboard_channel_id)
-    if channel is not None:
-        embed = generate_dashboard_embed()
-        dashboard_message = await channel.send(embed=embed)
+    if channel is None:
+        print("Dashboard-Channel nicht gefunden.")
+        return
+    entry = dashboard_manager.entries.get(channel.id)
+    if entry is not None:
+        # Nach einem Neustart: das angepinnte Dashboard von vorher weiter bearbeiten
+        entry.selector = dashboard_manager.selector_for(None)
+        print("Angepinntes Dashboard von vor dem Neustart wird weiter aktualisiert.")
+        return
+    dashboard_message = await dashboard_manager.start(channel, dashboard_manager.selector_for(None))
+    runtime_state.save_soon()
+    try:
+        await dashboard_message.pin()
+        print("Dashboard-Nachricht angepinnt.")
+    except Exception as e:
+        print(f"Fehler beim Anpinnen des Dashboards: {e}")
+
+# Funktion zum Abrufen der Bitaxe-Daten (nicht blockierend über die gemeinsame Session).
+# Gibt (data, outcome) zurück, outcome ist "success", "timeout" oder "error".
+def record_fetch(duration, outcome):
+    perf.observe("fetch", duration)
+    perf.count(f"fetch_{outcome}")
+
+async def fetch_bitaxe_data(url=BITAXE_API_URL, timeout=None):
+    started = time.monotonic()
+    data, outcome = await request_bitaxe_data(http_session, url, timeout)
+    record_fetch(time.monotonic() - started, outcome)
+    return data
+
+# Circuit Breaker je Miner: nach breaker_failures Fehlschlägen in Folge wird der Miner
+# nicht mehr abgefragt, bis die (exponentiell wachsende) Wartezeit abgelaufen ist.
+# Dann darf genau eine Probe-Anfrage durch (half-open); Erfolg schließt ihn sofort.
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half-open"
+
+BREAKER_FAILURES = int(config['bitaxe'].get('breaker_failures', 3))
+BREAKER_BACKOFF = float(config['bitaxe'].get('breaker_backoff_sec', 10))
+BREAKER_MAX_BACKOFF = float(config['bitaxe'].get('breaker_max_backoff_sec', 300))
+
+class CircuitBreaker:
+    def __init__(self, threshold, backoff, max_backoff):
+        self.threshold = max(1, threshold)
+        self.backoff = backoff
+        self.max_backoff = max(max_backoff, backoff)
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.trips = 0          # wie oft der Breaker seit dem letzten Erfolg geöffnet wurde
+        self.open_until = 0.0
+        self.opened_at = None   # time.monotonic() des ersten Öffnens dieses Ausfalls
+        self.listeners = []     # werden bei jedem Zustandswechsel mit (alt, neu) aufgerufen
+
+    def _set_state(self, state):
+        old, self.state = self.state, state
+        if old != state:
+            for listener in self.listeners:
+                listener(old, state)
+
+    def allow(self):
+        """Darf jetzt eine Anfrage an den Miner gehen?"""
+        if self.state == BREAKER_CLOSED:
+            return True
+        if self.state == BREAKER_OPEN and time.monotonic() >= self.open_until:
+            self._set_state(BREAKER_HALF_OPEN)
+            return True
+        return False
+
+    def retry_in(self):
+        """Sekunden bis zur nächsten Probe-Anfrage (0, wenn der Breaker geschlossen ist)."""
+        if self.state != BREAKER_OPEN:
+            return 0.0
+        return max(0.0, self.open_until - time.monotonic())
+
+    def record_success(self):
+        self.failures = 0
+        self.trips = 0
+        self.opened_at = None
+        self._set_state(BREAKER_CLOSED)
+
+    def export(self):
+        """Zustand für den Neustart, monotone Zeiten als Wanduhrzeit."""
+        now = time.time()
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_at": now + self.retry_in() if self.state == BREAKER_OPEN else None,
+            "down_since": now - (time.monotonic() - self.opened_at) if self.opened_at is not None else None,
+        }
+
+    def restore(self, saved):
+        # Ohne Listener: der Ausfall wurde vor dem Neustart schon gemeldet
+        now = time.time()
+        self.failures = saved.get("failures", 0)
+        self.trips = saved.get("trips", 0)
+        if saved.get("state", BREAKER_CLOSED) != BREAKER_CLOSED:
+            # half-open wird zur sofort fälligen Probe
+            self.state = BREAKER_OPEN
+            self.open_until = time.monotonic() + max(0.0, (saved.get("retry_at") or now) - now)
+            down_since = saved.get("down_since")
+            self.opened_at = time.monotonic() - (max(0.0, now - down_since) if down_since is not None else 0.0)
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == BREAKER_HALF_OPEN or self.failures >= self.threshold:
+            self.trips += 1
+            if self.opened_at is None:
+                self.opened_at = time.monotonic()
+            self.open_until = time.monotonic() + min(self.max_backoff, self.backoff * 2 ** (self.trips - 1))
+            self._set_state(BREAKER_OPEN)
+
+# Zentraler Snapshot-Speicher: alle Befehle und Hintergrund-Tasks lesen von hier,
+# damit der Webserver des Miners höchstens eine Anfrage pro TTL sieht.
+class SnapshotCache:
+    def __init__(self, fetcher, ttl, breaker=None):
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.breaker = breaker
+        self.data = None
+        self.fetched_at = None  # time.monotonic() des letzten Abrufs
+        self.last_good = None   # letzter erfolgreicher Snapshot (für Ausfälle)
+        self.last_good_at = None
+        self.fetch_count = 0
+        self.listeners = []  # werden nach jedem Abruf mit den neuen Daten aufgerufen
+        self._inflight = None
+
+    def age(self):
+        if self.fetched_at is None:
+            return None
+        return time.monotonic() - self.fetched_at
+
+    def peek(self):
+        """Letzter Snapshot (data, age) ohne Abruf beim Miner."""
+        return self.data, self.age()
+
+    @property
+    def offline(self):
+        return self.breaker is not None and self.breaker.state != BREAKER_CLOSED
+
+    def would_fetch(self, max_age=None):
+        """Müsste get() jetzt auf eine Anfrage beim Miner warten?"""
+        age = self.age()
+        if age is not None and age <= (self.ttl if max_age is None else max_age):
+            return False
+        if self._inflight is not None or self.breaker is None:
+            return True
+        # Wie breaker.allow(), aber ohne den Zustand zu ändern
+        return self.breaker.state == BREAKER_CLOSED or (self.breaker.state == BREAKER_OPEN and self.breaker.retry_in() == 0)
+
+    async def get(self, max_age=None):
+        """
+        Gibt (data, age) zurück. Ist der Snapshot älter als max_age (Standard: TTL),
+        wird neu abgerufen. Gleichzeitige Aufrufer teilen sich denselben HTTP-Request.
+        Ist der Circuit Breaker offen, wird sofort der (leere) letzte Stand geliefert.
+        """
+        if max_age is None:
+            max_age = self.ttl
+        age = self.age()
+        if age is not None and age <= max_age:
+            return self.data, age
+        if self._inflight is None:
+            if self.breaker is not None and not self.breaker.allow():
+                return self.data, age
+            self._inflight = asyncio.ensure_future(self._refresh())
+        # shield: bricht ein Aufrufer ab, läuft der Abruf für die anderen weiter
+        await asyncio.shield(self._inflight)
+        return self.data, self.age()
+
+    async def latest(self):
+        """
+        Für Befehle: wie get(), liefert bei nicht erreichbarem Miner aber den letzten
+        bekannten Snapshot. Gibt (data, age, stale) zurück.
+        """
+        data, age = await self.get()
+        if data or self.last_good is None:
+            return data, age, False
+        return self.last_good, time.monotonic() - self.last_good_at, True
+
+    def push(self, data):
+        """
+        Übernimmt einen Snapshot ohne Anfrage beim Miner (Log-Stream, Replay).
+        Das Alter bleibt das des letzten Abrufs – die übrigen Felder stammen von dort.
+        """
+        self.data = data
+        if data:
+            self.last_good = data
+            if self.last_good_at is None:
+                self.last_good_at = time.monotonic()
+        for listener in self.listeners:
+            listener(data)
+
+    async def _refresh(self):
+        try:
+            self.fetch_count += 1
+            # Auch Fehlschläge (None) werden für die TTL gemerkt, damit ein
+            # nicht erreichbarer Miner nicht bei jedem Befehl erneut abgefragt wird.
+            self.data = await self.fetcher()
+            self.fetched_at = time.monotonic()
+        finally:
+            self._inflight = None
+        if self.data:
+            self.last_good = self.data
+            self.last_good_at = self.fetched_at
+        if self.breaker is not None:
+            if self.data:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+        for listener in self.listeners:
+            listener(self.data)
+
+# Ein einzelner Miner der Fleet mit eigenem Snapshot-Cache
+class Miner:
+    def __init__(self, name, url, tags=(), timeout=None):
+        self.name = name
+        self.url = url
+        self.tags = set(tags)
+        self.timeout = timeout
+        self.cache = None  # wird von der Fleet gesetzt
+
+# Fleet: mehrere Miner, parallel abgefragt mit begrenzter Nebenläufigkeit.
+# Die Fleet-Kennzahlen werden bei jedem eintreffenden Ergebnis inkrementell angepasst.
+class Fleet:
+    def __init__(self, miners, concurrency):
+        self.miners = {}
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.total_hashrate = 0.0
+        self.offline_count = 0
+        self.max_temp = None
+        self._max_temp_owner = None
+        self._hashrate = {}  # Beitrag jedes Miners zur Gesamt-Hashrate
+        self._temp = {}
+        self._online = {}
+        self.listeners = []  # werden mit (miner, data) nach jedem Abruf aufgerufen
+        self.breaker_listeners = []  # werden mit (miner, alt, neu) bei Breaker-Wechseln aufgerufen
+        self.membership_listeners = []  # werden mit (miner, hinzugefügt) aufgerufen
+        self.remote = None  # PollerPool, wenn Worker-Prozesse die Miner abfragen
+        for miner in miners:
+            self.add(miner)
+
+    @property
+    def default(self):
+        return next(iter(self.miners.values()))
+
+    def aggregates(self, names):
+        """
+        (Gesamt-Hashrate, Max-Temperatur, Anzahl offline) für die genannten Miner. Für
+        die ganze Fleet werden die inkrementell gepflegten Werte verwendet.
+        """
+        if len(names) == len(self.miners):
+            return self.total_hashrate, self.max_temp, self.offline_count
+        total = sum(self._hashrate.get(name, 0.0) for name in names)
+        temps = [self._temp[name] for name in names if name in self._temp]
+        offline = sum(1 for name in names if self._online.get(name) is False)
+        return total, (max(temps) if temps else None), offline
+
+    def add(self, miner):
+        async def fetch():
+            async with self.semaphore:
+                if self.remote is not None:
+                    return await self.remote.fetch(miner)
+                raw = await fetch_bitaxe_data(miner.url, timeout=miner.timeout)
+            # Einmal dekodieren, danach teilen sich alle Verbraucher den Snapshot
+            return Snapshot.from_api(raw)
+        breaker = CircuitBreaker(BREAKER_FAILURES, BREAKER_BACKOFF, BREAKER_MAX_BACKOFF)
+        breaker.listeners.append(lambda old, new: self._on_breaker(miner, old, new))
+        miner.cache = SnapshotCache(fetch, SNAPSHOT_TTL, breaker)
+        miner.cache.listeners.append(lambda data: self._on_update(miner, data))
+        self.miners[miner.name] = miner
+        for listener in self.membership_listeners:
+            listener(miner, True)
+
+    def remove(self, name):
+        miner = self.miners.pop(name, None)
+        if miner is None:
+            return None
+        # Beiträge zu den Fleet-Kennzahlen zurücknehmen
+        self.total_hashrate -= self._hashrate.pop(name, 0.0)
+        if self._online.pop(name, None) is False:
+            self.offline_count -= 1
+        self._temp.pop(name, None)
+        if name == self._max_temp_owner:
+            self._max_temp_owner = max(self._temp, key=self._temp.get) if self._temp else None
+            self.max_temp = self._temp[self._max_temp_owner] if self._temp else None
+        for listener in self.membership_listeners:
+            listener(miner, False)
+        return miner
+
+    def _on_breaker(self, miner, old, new):
+        for listener in self.breaker_listeners:
+            listener(miner, old, new)
+
+    def _on_update(self, miner, data):
+        self._apply(miner.name, data)
+        for listener in self.listeners:
+            listener(miner, data)
+
+    def find(self, name):
+        if name in self.miners:
+            return self.miners[name]
+        for miner_name, miner in self.miners.items():
+            if miner_name.lower() == name.lower():
+                return miner
+        return None
+
+    def select(self, selector=None):
+        """
+        Wählt Miner aus: None = alle, "tag:<tag>" = alle mit diesem Tag, sonst Name.
+        """
+        if selector is None:
+            return list(self.miners.values())
+        if selector.lower().startswith("tag:"):
+            tag = selector[4:].strip()
+            return [m for m in self.miners.values() if tag in m.tags]
+        miner = self.find(selector)
+        return [miner] if miner else []
+
+    async def sweep(self, miners=None, max_age=None):
+        """
+        Fragt alle (oder die übergebenen) Miner gleichzeitig ab und gibt
+        eine Liste von (miner, data, age) zurück.
+        """
+        miners = list(self.miners.values()) if miners is None else miners
+        results = await asyncio.gather(*(m.cache.get(max_age) for m in miners))
+        return [(m, data, age) for m, (data, age) in zip(miners, results)]
+
+    def peek(self, miners=None):
+        """Wie sweep, aber nur aus den Caches – ohne Anfrage an die Miner."""
+        miners = list(self.miners.values()) if miners is None else miners
+        return [(m, *m.cache.peek()) for m in miners]
+
+    def _apply(self, name, data):
+        was_online = self._online.get(name)
+        online = bool(data)
+        self._online[name] = online
+        if online and was_online is False:
+            self.offline_count -= 1
+        elif not online and was_online is not False:
+            self.offline_count += 1
+
+        hashrate = (data.hashrate or 0.0) if online else 0.0
+        self.total_hashrate += hashrate - self._hashrate.get(name, 0.0)
+        self._hashrate[name] = hashrate
+
+        temp = data.temp if online else None
+        old_temp = self._temp.pop(name, None)
+        if temp is not None:
+            self._temp[name] = temp
+        if temp is not None and (self.max_temp is None or temp >= self.max_temp):
+            self.max_temp = temp
+            self._max_temp_owner = name
+        elif name == self._max_temp_owner and temp != old_temp:
+            # Nur wenn der bisherige Spitzenreiter sinkt, muss neu gesucht werden
+            if self._temp:
+                self._max_temp_owner = max(self._temp, key=self._temp.get)
+                self.max_temp = self._temp[self._max_temp_owner]
+            else:
+                self._max_temp_owner = None
+                self.max_temp = None
+
+# Miner aus der Konfiguration lesen: Abschnitte [miner:<name>] mit api_url, tags
+# und optional timeout_sec. Ohne solche Abschnitte gilt [bitaxe] api_url.
+def load_miners(source=None):
+    source = config if source is None else source
+    miners = []
+    for section in source.sections():
+        if not section.lower().startswith("miner:"):
+            continue
+        options = source[section]
+        tags = [t.strip() for t in options.get("tags", "").split(",") if t.strip()]
+        timeout = options.get("timeout_sec")
+        miners.append(Miner(
+            section.split(":", 1)[1].strip(),
+            options["api_url"],
+            tags,
+            aiohttp.ClientTimeout(total=float(timeout)) if timeout else None,
+        ))
+    if not miners:
+        miners.append(Miner(source['bitaxe'].get('name', 'Bitaxe'), source['bitaxe'].get('api_url')))
+    return miners
+
+fleet = Fleet(load_miners(), FLEET_CONCURRENCY)
+
+# Poller-Worker (optional, [workers] processes > 0): Abruf, JSON-Dekodierung und
+# Snapshot-Aufbereitung laufen in eigenen Prozessen, jeder für einen Shard der Miner.
+# Zurück kommen nur kompakte Snapshots (marshal-Tupel) über einen Unix-Socket, der
+# Bot-Prozess hält Discord, Scheduler, Regeln und Historie. Die Worker starten
+# bitaxe_poller.py als eigenes Programm – ohne config.ini, Discord oder Historie.
+WORKER_PROCESSES = int(config['workers'].get('processes', 0)) if config.has_section('workers') else 0
+WORKER_RESTART_DELAY = float(config['workers'].get('restart_delay_sec', 1)) if config.has_section('workers') else 1.0
+class WorkerLost(Exception):
+    """Der Worker-Prozess ist während einer Anfrage ausgefallen."""
+
+class PollerWorker:
+    def __init__(self, index):
+        self.index = index
+        self.process = None
+        self.reader = None
+        self.writer = None
+        self.pending = {}  # Anfrage-ID -> Future
+        self.started_at = None
+        self.crashes = 0   # Abstürze in Folge (für die Wartezeit vor dem Neustart)
+        self.ready = asyncio.Event()
+
+class PollerPool:
+    """
+    Verteilt die Miner auf Worker-Prozesse und leitet Abrufe an den zuständigen
+    Worker. Stürzt ein Worker ab, wird er neu gestartet; laufende Anfragen werden
+    einmal wiederholt, die Discord-Verbindung bleibt davon unberührt.
+    """
+    def __init__(self, processes):
+        self.workers = [PollerWorker(i) for i in range(processes)]
+        self.assignment = {}  # Miner-Name -> Worker-Index
+        self.restarts = 0
+        self._ids = itertools.count()
+        self._tasks = set()
+        self._closed = False
+
+    def shard_sizes(self):
+        sizes = [0] * len(self.workers)
+        for index in self.assignment.values():
+            sizes[index] += 1
+        return sizes
+
+    def assign(self, name):
+        if name not in self.assignment:
+            sizes = self.shard_sizes()
+            self.assignment[name] = sizes.index(min(sizes))
+        return self.assignment[name]
+
+    def release(self, name):
+        self.assignment.pop(name, None)
+        self.rebalance()
+
+    def rebalance(self):
+        """Verschiebt einzelne Miner, bis sich die Shards um höchstens einen unterscheiden."""
+        while True:
+            sizes = self.shard_sizes()
+            largest = sizes.index(max(sizes))
+            smallest = sizes.index(min(sizes))
+            if sizes[largest] - sizes[smallest] <= 1:
+                return
+            name = next(n for n, index in self.assignment.items() if index == largest)
+            self.assignment[name] = smallest
+
+    def on_membership(self, miner, added):
+        if added:
+            self.assign(miner.name)
+        else:
+            self.release(miner.name)
+
+    async def start(self):
+        for worker in self.workers:
+            await self._spawn(worker)
+
+    async def _spawn(self, worker):
+        parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Eigenes Programm statt multiprocessing: ein "spawn"-Kind würde das Bot-Modul
+        # (config.ini, Historie, Journal, Discord-Client) noch einmal komplett importieren
+        worker.process = await asyncio.create_subprocess_exec(
+            sys.executable, bitaxe_poller.__file__, str(child.fileno()), json.dumps(HTTP_SESSION_OPTIONS),
+            pass_fds=(child.fileno(),),
+        )
+        child.close()
+        worker.reader, worker.writer = await asyncio.open_unix_connection(sock=parent)
+        worker.started_at = time.monotonic()
+        worker.ready.set()
+        task = asyncio.ensure_future(self._read(worker))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _read(self, worker):
+        reader = worker.reader
         try:
-            await dashboard_message.pin()
-            print("Dashboard-Nachricht angepinnt.")
-        except Exception as e:
-            print(f"Fehler beim Anpinnen des Dashboards: {e}")
-        # Starte den Update-Task für das Dashboard
-        async def update_dashboard():
             while True:
-                now = datetime.datetime.now(ZoneInfo(config['settings'].get("timezone", "Europe/Berlin")))
-                new_embed = generate_dashboard_embed()
-                new_embed.timestamp = now
+                request_id, values, outcome, duration = await read_frame(reader)
+                record_fetch(duration, outcome)
+                future = worker.pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result(Snapshot.from_tuple(values) if values else None)
+        except (asyncio.IncompleteReadError, ConnectionError, EOFError, ValueError):
+            pass
+        if not self._closed:
+            await self._restart(worker)
+
+    async def _restart(self, worker):
+        worker.ready.clear()
+        worker.writer.close()
+        for future in worker.pending.values():
+            if not future.done():
+                future.set_exception(WorkerLost())
+        worker.pending.clear()
+        try:
+            await asyncio.wait_for(worker.process.wait(), 5)
+        except asyncio.TimeoutError:
+            worker.process.kill()
+            await worker.process.wait()
+        # Lief der Worker länger als eine Minute, zählt der Absturz als neuer Anfang
+        worker.crashes = worker.crashes + 1 if time.monotonic() - worker.started_at < 60 else 1
+        delay = min(60.0, WORKER_RESTART_DELAY * 2 ** (worker.crashes - 1))
+        print(f"{Fore.RED}🧵 Poller-Worker {worker.index} beendet (Exit-Code {worker.process.returncode}) – Neustart in {delay:.1f} s{Style.RESET_ALL}")
+        self.restarts += 1
+        await asyncio.sleep(delay)
+        if not self._closed:
+            await self._spawn(worker)
+
+    async def fetch(self, miner):
+        """Snapshot eines Miners über seinen Worker, None bei Fehlern."""
+        timeout = miner.timeout.total if miner.timeout is not None else None
+        # Obergrenze für die Antwort, falls der Worker hängt
+        limit = (timeout or HTTP_CONNECT_TIMEOUT + HTTP_READ_TIMEOUT) + 5.0
+        for attempt in range(2):
+            worker = self.workers[self.assign(miner.name)]
+            request_id = None
+            try:
+                await asyncio.wait_for(worker.ready.wait(), timeout=limit)
+                request_id = next(self._ids)
+                future = worker.pending[request_id] = asyncio.get_running_loop().create_future()
+                write_frame(worker.writer, (request_id, miner.url, timeout))
+                return await asyncio.wait_for(future, timeout=limit)
+            except WorkerLost:
+                continue  # nach dem Neustart noch einmal versuchen
+            except asyncio.TimeoutError:
+                worker.pending.pop(request_id, None)
+                return None
+        return None
+
+    async def stop(self):
+        self._closed = True
+        for task in list(self._tasks):
+            task.cancel()
+        for worker in self.workers:
+            if worker.writer is not None:
+                worker.writer.close()
+            for future in worker.pending.values():
+                if not future.done():
+                    future.cancel()
+        for worker in self.workers:
+            if worker.process is not None and worker.process.returncode is None:
                 try:
-                    await dashboard_message.edit(embed=new_embed)
-                except Exception as e:
-                    print(f"Fehler beim Aktualisieren des Dashboards: {e}")
-                await asyncio.sleep(DASHBOARD_INTERVAL)
-        bot.loop.create_task(update_dashboard())
-    else:
-        print("Dashboard-Channel nicht gefunden.")
+                    await asyncio.wait_for(worker.process.wait(), 5)
+                except asyncio.TimeoutError:
+                    worker.process.terminate()
+                    await worker.process.wait()
 
+poller_pool = PollerPool(WORKER_PROCESSES) if WORKER_PROCESSES > 0 else None
+if poller_pool is not None:
+    for name in fleet.miners:
+        poller_pool.assign(name)
+    fleet.membership_listeners.append(poller_pool.on_membership)
 
-# Historie laden, wenn die Datei existiert
-def load_history():
-    if os.path.exists(history_file):
-        with open(history_file, 'r') as f:
-            return json.load(f)
-    return []
+# Löst das optionale Miner-Argument eines Befehls auf (None = Standard-Miner)
+def resolve_miner(name, source=None):
+    source = fleet if source is None else source
+    if name is None:
+        return source.default
+    return source.find(name)
 
-# Historie speichern
-def save_history(history):
-    with open(history_file, 'w') as f:
-        json.dump(history, f)
+def unknown_miner_text(name):
+    return f"❌ Unbekannter Miner: `{name}`. Verfügbar: {', '.join(fleet.miners)}"
 
-# Funktion zum Abrufen der Bitaxe-Daten
-def fetch_bitaxe_data():
+# Zeitangaben wie "90s", "15m", "1h", "7d" oder "2w" in Sekunden umrechnen
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+def parse_duration(text):
     try:
-        response = requests.get(BITAXE_API_URL, timeout=5)
-        if response.status_code == 200 and response.text.strip():
-            return response.json()
+        text = text.strip().lower()
+        if text[-1] in DURATION_UNITS:
+            return float(text[:-1]) * DURATION_UNITS[text[-1]]
+        return float(text)
+    except (ValueError, IndexError):
+        return None
+
+# Zeitreihen-Speicher für jeden abgefragten Sample (SQLite im WAL-Modus).
+# Telemetrie landet spaltenweise in komprimierten Chunks, selten geänderte Felder
+# (Firmware, WLAN, Stratum …) nur als Ereignis, wenn sich ihr Wert ändert.
+#
+# (Snapshot-Attribut, Spalte, Auflösung) – Werte in den Einheiten des Snapshots
+# (Spannung in V, Strom in A), gespeichert als Vielfache der Auflösung. Neue Metriken
+# nur hinten anhängen: ältere Chunks haben dann einfach weniger Spalten.
+SAMPLE_METRICS = [
+    ("temp", "temp", 0.01),
+    ("vr_temp", "vr_temp", 0.01),
+    ("hashrate", "hashrate", 0.01),
+    ("power", "power", 0.01),
+    ("voltage", "voltage", 0.001),
+    ("current", "current", 0.001),
+    ("core_voltage_actual", "core_voltage", 0.001),
+    ("frequency", "frequency", 0.1),
+    ("fan_rpm", "fanrpm", 1),
+    ("fan_speed", "fanspeed", 0.1),
+    ("shares_accepted", "shares_accepted", 1),
+    ("shares_rejected", "shares_rejected", 1),
+    ("uptime", "uptime", 1),
+]
+SAMPLE_COLUMNS = [column for _, column, _ in SAMPLE_METRICS]
+SAMPLE_ATTR_COLUMNS = {attr: column for attr, column, _ in SAMPLE_METRICS}
+# Teilen statt mit der Auflösung malnehmen: 5930 / 100 ergibt exakt 59.3
+SAMPLE_SCALES = [round(1 / resolution) for _, _, resolution in SAMPLE_METRICS]
+SAMPLE_CONFIG_FIELDS = [
+    "asic_model", "device_model", "version", "running_partition", "reset_reason", "hostname",
+    "host_ip", "ssid", "stratum_url", "stratum_port", "stratum_user",
+    "fallback_url", "fallback_port", "fallback_user", "core_voltage",
+]
+
+# Spalte als Differenzen zum Vorgänger (erster Wert absolut); die Umkehrung ist
+# itertools.accumulate. Beides läuft ohne Python-Schleife pro Wert.
+def delta_encode(values):
+    if not values:
+        return array.array("q")
+    return array.array("q", itertools.chain((values[0],), map(operator.sub, values[1:], values[:-1])))
+
+def pack_int64(values):
+    packed = array.array("q", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+def unpack_int64(raw):
+    values = array.array("q")
+    values.frombytes(raw)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+# Chunk-Format (zlib-komprimiert): Anzahl n und Spalten (je uint32), n Zeitstempel in ms
+# als Differenzen, dann je Spalte ein Flag-Byte (0 = vollständig, 1 = Maske mit n Bytes
+# folgt, 2 = keine Werte) und n quantisierte Werte als Differenzen (int64).
+CHUNK_COMPLETE, CHUNK_MASKED, CHUNK_EMPTY = 0, 1, 2
+
+def encode_chunk(timestamps, columns, masks):
+    parts = [struct.pack("<II", len(timestamps), len(columns)), pack_int64(delta_encode(timestamps))]
+    for values, mask in zip(columns, masks):
+        if mask is None:
+            parts.append(bytes((CHUNK_COMPLETE,)))
+        elif all(mask):
+            parts.append(bytes((CHUNK_EMPTY,)))
+            continue
         else:
-            return None
-    except Exception:
+            parts.append(bytes((CHUNK_MASKED,)))
+            parts.append(bytes(mask))
+        parts.append(pack_int64(delta_encode(values)))
+    return zlib.compress(b"".join(parts), 6)
+
+def decode_columns(blob, wanted):
+    """
+    Gibt (Zeitstempel in ms, {Spaltenindex: quantisierte Werte}) zurück. Dekodiert
+    werden nur die Spalten aus wanted, fehlende Werte sind None.
+    """
+    raw = zlib.decompress(blob)
+    count, column_count = struct.unpack_from("<II", raw)
+    width = 8 * count
+    offset = 8
+    timestamps = list(itertools.accumulate(unpack_int64(raw[offset:offset + width])))
+    offset += width
+    result = {}
+    for index in range(column_count):
+        flag = raw[offset]
+        offset += 1
+        mask = None
+        if flag == CHUNK_MASKED:
+            mask = raw[offset:offset + count]
+            offset += count
+        if flag != CHUNK_EMPTY:
+            if index in wanted:
+                values = list(itertools.accumulate(unpack_int64(raw[offset:offset + width])))
+                if mask is not None:
+                    values = [None if missing else v for v, missing in zip(values, mask)]
+                result[index] = values
+            offset += width
+    for index in wanted:
+        if index not in result:
+            result[index] = [None] * count  # keine Werte oder Spalte jünger als der Chunk
+    return timestamps, result
+
+def decode_chunk(blob, wanted, scales=SAMPLE_SCALES):
+    """Wie decode_columns, aber mit Zeitstempeln in s und Werten in ihrer Einheit."""
+    timestamps, columns = decode_columns(blob, wanted)
+    return [ms / 1000.0 for ms in timestamps], {
+        index: [None if q is None else q / scales[index] for q in values]
+        for index, values in columns.items()
+    }
+
+# Rollup-Chunks: Spalte 0 = Anzahl Samples im Bucket, danach je Metrik min/max/mean/last
+ROLLUP_STATS = ("min", "max", "mean", "last")
+ROLLUP_SCALES = [1] + [scale for scale in SAMPLE_SCALES for _ in ROLLUP_STATS]
+
+def rollup_columns(index):
+    first = 1 + index * len(ROLLUP_STATS)
+    return range(first, first + len(ROLLUP_STATS))
+
+def aggregate_buckets(records, width, metrics):
+    """
+    Fasst [(ts, anzahl, [(min, max, mean, last) oder None je Metrik]), ...] (nach ts
+    sortiert) zu Buckets der Breite width zusammen. Mittelwerte werden mit der Anzahl
+    Samples gewichtet.
+    """
+    buckets = []
+    current = None
+    for ts, count, stats in records:
+        start = ts - ts % width
+        if current is None or current[0] != start:
+            current = [start, 0, [None] * metrics, [0] * metrics]
+            buckets.append(current)
+        current[1] += count
+        merged, weights = current[2], current[3]
+        for i, stat in enumerate(stats):
+            if stat is None:
+                continue
+            m = merged[i]
+            if m is None:
+                merged[i] = [stat[0], stat[1], stat[2] * count, stat[3]]
+            else:
+                if stat[0] < m[0]:
+                    m[0] = stat[0]
+                if stat[1] > m[1]:
+                    m[1] = stat[1]
+                m[2] += stat[2] * count
+                m[3] = stat[3]
+            weights[i] += count
+    return [
+        (start, count, [None if m is None else (m[0], m[1], m[2] / w, m[3]) for m, w in zip(merged, weights)])
+        for start, count, merged, weights in buckets
+    ]
+
+def weighted_percentile(pairs, q):
+    """Perzentil q aus [(wert, gewicht), ...]."""
+    pairs = sorted(pairs)
+    rank = q * sum(weight for _, weight in pairs)
+    seen = 0
+    for value, weight in pairs:
+        seen += weight
+        if seen >= rank:
+            return value
+    return pairs[-1][0] if pairs else None
+
+class SampleChunk:
+    """Offener Chunk im Speicher: eine int64-Spalte je Metrik."""
+    __slots__ = ("start", "timestamps", "columns", "masks")
+
+    def __init__(self, width=len(SAMPLE_METRICS)):
+        self.start = None
+        self.timestamps = array.array("q")
+        self.columns = [array.array("q") for _ in range(width)]
+        self.masks = [None] * width  # bytearray, sobald ein Wert fehlt
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def append(self, ts_ms, values):
+        count = len(self.timestamps)
+        if self.start is None:
+            self.start = ts_ms
+        self.timestamps.append(ts_ms)
+        for index, value in enumerate(values):
+            column = self.columns[index]
+            mask = self.masks[index]
+            if value is None:
+                if mask is None:
+                    mask = self.masks[index] = bytearray(count)
+                mask.append(1)
+                # Letzten Wert wiederholen, damit die Differenz 0 wird
+                column.append(column[-1] if column else 0)
+            else:
+                if mask is not None:
+                    mask.append(0)
+                column.append(value)
+
+    def tail(self, offset):
+        """Neuer Chunk mit den Samples ab Position offset."""
+        piece = SampleChunk(len(self.columns))
+        piece.timestamps = self.timestamps[offset:]
+        piece.start = piece.timestamps[0] if piece.timestamps else None
+        piece.columns = [column[offset:] for column in self.columns]
+        piece.masks = [mask[offset:] if mask is not None and any(mask[offset:]) else None for mask in self.masks]
+        return piece
+
+    def encode(self):
+        return encode_chunk(self.timestamps, self.columns, self.masks)
+
+class RetentionTier:
+    """Rollup-Stufe: Buckets von width Sekunden, aufbewahrt für retention Sekunden (0 = für immer)."""
+    __slots__ = ("width", "retention")
+
+    def __init__(self, width, retention):
+        self.width = int(width)
+        self.retention = retention
+
+    @property
+    def label(self):
+        # Größte passende Einheit: 60 -> "1m", 3600 -> "1h"
+        for unit, factor in sorted(DURATION_UNITS.items(), key=lambda item: -item[1]):
+            if self.width % factor == 0:
+                return f"{self.width // factor}{unit}-Rollups"
+
+def parse_retention_tiers(text):
+    """ "1m:90d, 1h:forever" -> [RetentionTier(60, 7776000), RetentionTier(3600, 0)] """
+    tiers = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        width, _, retention = part.partition(":")
+        width = parse_duration(width)
+        retention = retention.strip().lower()
+        retention = 0 if retention in ("", "0", "forever", "immer") else parse_duration(retention)
+        if not width or width < 1 or retention is None:
+            raise ValueError(f"Ungültige Rollup-Stufe '{part}' in [history] rollups")
+        tiers.append(RetentionTier(width, retention))
+    tiers.sort(key=lambda tier: tier.width)
+    return tiers
+
+class SampleStore:
+    """
+    Nimmt Samples aus der Abfrage-Schleife entgegen, puffert sie im Speicher und
+    schreibt sie gebündelt in einem eigenen Thread weg. Der Event-Loop wartet nie
+    auf SQLite. Der Thread besitzt auch die offenen Chunks und den zuletzt
+    gespeicherten Konfigurationsstand je Miner.
+
+    Rohdaten werden nach raw_retention Sekunden gelöscht, vorher aber in die
+    Rollup-Stufen (tiers) verdichtet: jede Stufe fasst die nächstfeinere zu
+    Buckets mit min/max/mean/last je Metrik zusammen.
+    """
+    # Höchstens so viel Quellzeitraum (Rohdaten) bzw. so viele Quell-Buckets pro Batch
+    ROLLUP_RAW_BATCH_SEC = 3600
+    ROLLUP_BATCH_BUCKETS = 1000
+    # Freigegebene Seiten, die pro Batch an das Dateisystem zurückgehen
+    VACUUM_PAGES = 256
+    # Pause zwischen zwei Batches, damit Schreiben und Abfragen dazwischen drankommen
+    MAINTENANCE_PAUSE = 0.05
+
+    def __init__(self, path, flush_interval=5.0, max_buffer=50000, chunk_samples=720,
+                 raw_retention=0, tiers=(), maintenance_interval=60.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.chunk_samples = chunk_samples
+        self.raw_retention = raw_retention
+        self.tiers = list(tiers)
+        self.maintenance_interval = maintenance_interval
+        self.dropped = 0
+        self._buffer = []
+        self._last_id = {}  # Miner -> Anzahl der bisher angenommenen Samples
+        self._conn = None
+        self._chunks = {}   # Miner -> offener SampleChunk (nur im Schreib-Thread)
+        self._pieces = {}   # Miner -> (geschriebene Samples, [Start je Teil-Chunk]) des offenen Chunks
+        self._config = {}   # Miner -> {Feld: gespeicherter Wert} (nur im Schreib-Thread)
+        self._progress = {}  # (Miner, Stufe) -> Rollup fertig bis (nur im Schreib-Thread)
+        # Ein einziger Thread besitzt die SQLite-Verbindung
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="sample-store")
+        self._closed = False
+
+    def add(self, miner, data, ts=None):
+        if not data:
+            return
+        if len(self._buffer) >= self.max_buffer:
+            # Schreiben kommt nicht hinterher: lieber Samples verwerfen als Speicher sprengen
+            self.dropped += 1
+            return
+        values = []
+        for attr, _, resolution in SAMPLE_METRICS:
+            value = getattr(data, attr)
+            values.append(None if value is None else round(value / resolution))
+        config_values = tuple(getattr(data, field) for field in SAMPLE_CONFIG_FIELDS)
+        self._buffer.append((miner, time.time() if ts is None else ts, values, config_values))
+        self._last_id[miner] = self._last_id.get(miner, 0) + 1
+
+    def last_id(self, miner):
+        """Laufende Nummer des letzten Samples eines Miners (z. B. als Cache-Schlüssel)."""
+        return self._last_id.get(miner, 0)
+
+    def pick_tier(self, since, resolution, now=None):
+        """
+        Gröbste Rollup-Stufe, deren Bucket-Breite für die gewünschte Auflösung (Sekunden
+        pro Punkt) reicht. None heißt Rohdaten.
+        """
+        now = time.time() if now is None else now
+        chosen = None
+        for position, tier in enumerate(self.tiers):
+            if tier.width <= resolution:
+                chosen = position
+        if chosen is None:
+            if not self.tiers or not self.raw_retention or since >= now - self.raw_retention:
+                return None
+            chosen = 0  # So weit reichen die Rohdaten nicht zurück
+        # Reicht die Aufbewahrung nicht bis since, die nächstgröbere Stufe nehmen
+        for tier in self.tiers[chosen:]:
+            if not tier.retention or since >= now - tier.retention:
+                return tier
+        return self.tiers[-1]
+
+    def source_label(self, since, resolution):
+        tier = self.pick_tier(since, resolution)
+        return "Rohdaten" if tier is None else tier.label
+
+    async def _call(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            # Gilt nur für neue Datenbanken, ältere werden unten einmalig umgestellt
+            self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sample_chunks (miner TEXT NOT NULL, start REAL NOT NULL, "
+                "end REAL NOT NULL, count INTEGER NOT NULL, data BLOB NOT NULL, PRIMARY KEY (miner, start))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rollup_chunks (miner TEXT NOT NULL, tier INTEGER NOT NULL, "
+                "start REAL NOT NULL, end REAL NOT NULL, count INTEGER NOT NULL, data BLOB NOT NULL, "
+                "PRIMARY KEY (miner, tier, start))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rollup_progress (miner TEXT NOT NULL, tier INTEGER NOT NULL, "
+                "done_until REAL NOT NULL, PRIMARY KEY (miner, tier))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS config_events (miner TEXT NOT NULL, ts REAL NOT NULL, "
+                "field TEXT NOT NULL, value TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_config_events ON config_events (miner, ts)")
+            self._conn.commit()
+            self._migrate_rows()
+            if self._conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                self._conn.execute("VACUUM")
+            self._progress = {
+                (miner, tier): done for miner, tier, done in self._conn.execute("SELECT * FROM rollup_progress")
+            }
+        return self._conn
+
+    def _migrate_rows(self):
+        """Übernimmt die zeilenweise Tabelle früherer Versionen einmalig in Chunks."""
+        conn = self._conn
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'samples'").fetchone():
+            return
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(samples)")]
+        selected = [c if c in columns else "NULL" for c in SAMPLE_COLUMNS]
+        miners = [row[0] for row in conn.execute("SELECT DISTINCT miner FROM samples")]
+        migrated = 0
+        with conn:
+            for miner in miners:
+                chunk = SampleChunk()
+                cursor = conn.execute(
+                    f"SELECT ts, {', '.join(selected)} FROM samples WHERE miner = ? ORDER BY ts", (miner,)
+                )
+                for ts, *values in cursor:
+                    chunk.append(round(ts * 1000), [
+                        None if v is None else round(v / resolution)
+                        for v, (_, _, resolution) in zip(values, SAMPLE_METRICS)
+                    ])
+                    migrated += 1
+                    if len(chunk) >= self.chunk_samples:
+                        self._store_chunk(miner, chunk)
+                        chunk = SampleChunk()
+                if len(chunk):
+                    self._store_chunk(miner, chunk)
+            conn.execute("DROP TABLE samples")
+        print(f"{Fore.GREEN}Historie: {migrated} Samples in das Chunk-Format übernommen.{Style.RESET_ALL}")
+
+    def _store_chunk(self, miner, chunk):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sample_chunks VALUES (?, ?, ?, ?, ?)",
+            (miner, chunk.start / 1000.0, chunk.timestamps[-1] / 1000.0, len(chunk), chunk.encode()),
+        )
+
+    def _config_changes(self, miner, ts, config_values):
+        state = self._config.get(miner)
+        if state is None:
+            # Letzten gespeicherten Stand je Feld aus der Datenbank holen
+            state = self._config[miner] = dict(self._conn.execute(
+                "SELECT field, value FROM config_events AS e WHERE miner = ? AND ts = "
+                "(SELECT MAX(ts) FROM config_events WHERE miner = e.miner AND field = e.field)",
+                (miner,),
+            ).fetchall())
+        events = []
+        for field, value in zip(SAMPLE_CONFIG_FIELDS, config_values):
+            text = None if value is None else str(value)
+            if field not in state or state[field] != text:
+                state[field] = text
+                events.append((miner, ts, field, text))
+        return events
+
+    def _store_piece(self, miner):
+        """Schreibt die seit dem letzten Flush neuen Samples des offenen Chunks als Teil-Chunk."""
+        chunk = self._chunks[miner]
+        written, starts = self._pieces.setdefault(miner, (0, []))
+        if written >= len(chunk):
+            return
+        piece = chunk.tail(written)
+        self._store_chunk(miner, piece)
+        starts.append(piece.start / 1000.0)
+        self._pieces[miner] = (len(chunk), starts)
+
+    def _seal_chunk(self, miner):
+        """Ersetzt die Teil-Chunks eines vollen Chunks durch den fertigen Chunk."""
+        _, starts = self._pieces.pop(miner, (0, []))
+        self._conn.executemany(
+            "DELETE FROM sample_chunks WHERE miner = ? AND start = ?", [(miner, start) for start in starts]
+        )
+        self._store_chunk(miner, self._chunks[miner])
+        self._chunks[miner] = SampleChunk()
+
+    def _write(self, rows):
+        conn = self._connect()
+        events = []
+        touched = set()
+        with conn:
+            for miner, ts, values, config_values in rows:
+                chunk = self._chunks.get(miner)
+                if chunk is None:
+                    chunk = self._chunks[miner] = SampleChunk()
+                chunk.append(round(ts * 1000), values)
+                touched.add(miner)
+                if len(chunk) >= self.chunk_samples:
+                    self._seal_chunk(miner)
+                    touched.discard(miner)
+                events.extend(self._config_changes(miner, ts, config_values))
+            # Vom offenen Chunk kommen bei jedem Flush nur die neuen Samples als Teil-Chunk
+            # dazu, damit nach einem Absturz höchstens ein Flush-Intervall fehlt. Lesen
+            # behandelt Teil-Chunks wie normale Chunks; die eines vor dem Neustart offenen
+            # Chunks bleiben einfach als kleine Chunks liegen.
+            for miner in touched:
+                self._store_piece(miner)
+            if events:
+                conn.executemany("INSERT INTO config_events VALUES (?, ?, ?, ?)", events)
+
+    def _raw_rows(self, miner, since, until, indices):
+        """Rohdaten [(ts, wert, ...)] mit since <= ts <= until."""
+        wanted = set(indices)
+        rows = []
+        cursor = self._conn.execute(
+            "SELECT data FROM sample_chunks WHERE miner = ? AND end >= ? AND start <= ? ORDER BY start",
+            (miner, since, until),
+        )
+        for (blob,) in cursor:
+            timestamps, values = decode_chunk(blob, wanted)
+            series = [values[index] for index in indices]
+            for i, ts in enumerate(timestamps):
+                if since <= ts <= until:
+                    rows.append((ts, *(column[i] for column in series)))
+        return rows
+
+    def _rollup_rows(self, miner, width, since, until, indices):
+        """Buckets [(start, anzahl, [(min, max, mean, last) oder None, ...])] mit since <= start < until."""
+        wanted = {0}
+        for index in indices:
+            wanted.update(rollup_columns(index))
+        rows = []
+        cursor = self._conn.execute(
+            "SELECT data FROM rollup_chunks WHERE miner = ? AND tier = ? AND end > ? AND start < ? ORDER BY start",
+            (miner, width, since, until),
+        )
+        for (blob,) in cursor:
+            timestamps, values = decode_chunk(blob, wanted, ROLLUP_SCALES)
+            counts = values[0]
+            series = [[values[column] for column in rollup_columns(index)] for index in indices]
+            for i, ts in enumerate(timestamps):
+                if since <= ts < until:
+                    rows.append((ts, counts[i], [
+                        None if stats[0][i] is None else tuple(column[i] for column in stats)
+                        for stats in series
+                    ]))
+        return rows
+
+    def _buckets(self, miner, since, until, indices, resolution):
+        """
+        Buckets aus der passenden Stufe, der noch nicht verdichtete Rest kommt aus den
+        Rohdaten (ein Sample = ein Bucket).
+        """
+        tier = self.pick_tier(since, resolution)
+        records = []
+        if tier is not None:
+            done = self._progress.get((miner, tier.width))
+            if done:
+                records = self._rollup_rows(miner, tier.width, since, min(until, done), indices)
+                since = max(since, done)
+        for ts, *values in self._raw_rows(miner, since, until, indices):
+            records.append((ts, 1, [None if v is None else (v, v, v, v) for v in values]))
+        return records
+
+    def _query(self, miner, since, until, indices, resolution):
+        self._connect()
+        tier = self.pick_tier(since, resolution)
+        rows = []
+        done = None if tier is None else self._progress.get((miner, tier.width))
+        if done:
+            # Rollups als Mittelwert in der Bucket-Mitte, der Rest kommt aus den Rohdaten
+            half = tier.width / 2
+            rows = [
+                (start + half, *(None if stats is None else stats[2] for stats in values))
+                for start, _, values in self._rollup_rows(miner, tier.width, since, min(until, done), indices)
+            ]
+            since = max(since, done)
+        rows.extend(self._raw_rows(miner, since, until, indices))
+        return rows
+
+    def _summarize(self, miner, since, until, indices, resolution):
+        self._connect()
+        records = self._buckets(miner, since, until, indices, resolution)
+        result = {}
+        for k, index in enumerate(indices):
+            pairs = []
+            total = weight = 0
+            low, high = math.inf, -math.inf
+            for _, count, values in records:
+                stats = values[k]
+                if stats is None:
+                    continue
+                low = min(low, stats[0])
+                high = max(high, stats[1])
+                total += stats[2] * count
+                weight += count
+                pairs.append((stats[2], count))
+            if not weight:
+                continue
+            mean = total / weight
+            variance = sum(count * (value - mean) ** 2 for value, count in pairs) / weight
+            result[SAMPLE_COLUMNS[index]] = {
+                "count": weight,
+                "mean": mean,
+                "min": low,
+                "max": high,
+                "std": math.sqrt(variance),
+                "p50": weighted_percentile(pairs, 0.5),
+                "p95": weighted_percentile(pairs, 0.95),
+            }
+        return result
+
+    def _query_config(self, miner, since, until):
+        return self._connect().execute(
+            "SELECT ts, field, value FROM config_events WHERE miner = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+            (miner, since, until),
+        ).fetchall()
+
+    def _rollup_step(self, miner, level, now):
+        """Verdichtet einen Batch eines Miners in Stufe level. True, wenn etwas getan wurde."""
+        conn = self._conn
+        tier = self.tiers[level]
+        width = tier.width
+        if level == 0:
+            # Nur Buckets, deren Samples sicher schon geschrieben sind
+            limit = now - max(2 * self.flush_interval, 10.0)
+            first = conn.execute("SELECT MIN(start) FROM sample_chunks WHERE miner = ?", (miner,)).fetchone()[0]
+            batch = self.ROLLUP_RAW_BATCH_SEC
+        else:
+            source = self.tiers[level - 1].width
+            limit = self._progress.get((miner, source))
+            first = conn.execute(
+                "SELECT MIN(start) FROM rollup_chunks WHERE miner = ? AND tier = ?", (miner, source)
+            ).fetchone()[0]
+            batch = source * self.ROLLUP_BATCH_BUCKETS
+        done = self._progress.get((miner, width))
+        if done is None:
+            if first is None:
+                return False
+            done = first - first % width
+        if limit is None:
+            return False
+        span = width * self.chunk_samples
+        chunk_start = done - done % span
+        until = min(limit - limit % width, chunk_start + span, done + max(width, batch - batch % width))
+        if until <= done:
+            return False
+
+        indices = range(len(SAMPLE_METRICS))
+        if level == 0:
+            records = [
+                (ts, 1, [None if v is None else (v, v, v, v) for v in values])
+                for ts, *values in self._raw_rows(miner, done, until, indices) if ts < until
+            ]
+        else:
+            records = self._rollup_rows(miner, source, done, until, indices)
+        buckets = aggregate_buckets(records, width, len(SAMPLE_METRICS))
+
+        with conn:
+            if buckets:
+                # An den Chunk der Stufe anhängen, in den der Zeitraum fällt
+                chunk = SampleChunk(len(ROLLUP_SCALES))
+                row = conn.execute(
+                    "SELECT data FROM rollup_chunks WHERE miner = ? AND tier = ? AND start = ?",
+                    (miner, width, chunk_start),
+                ).fetchone()
+                if row is not None:
+                    timestamps, columns = decode_columns(row[0], range(len(ROLLUP_SCALES)))
+                    for i, ts_ms in enumerate(timestamps):
+                        chunk.append(ts_ms, [columns[c][i] for c in range(len(ROLLUP_SCALES))])
+                for start, count, stats in buckets:
+                    values = [round(count)]
+                    for stat, scale in zip(stats, SAMPLE_SCALES):
+                        values.extend((None,) * len(ROLLUP_STATS) if stat is None else (round(v * scale) for v in stat))
+                    chunk.append(round(start * 1000), values)
+                conn.execute(
+                    "INSERT OR REPLACE INTO rollup_chunks VALUES (?, ?, ?, ?, ?, ?)",
+                    (miner, width, chunk_start, chunk.timestamps[-1] / 1000.0 + width, len(chunk), chunk.encode()),
+                )
+            conn.execute("INSERT OR REPLACE INTO rollup_progress VALUES (?, ?, ?)", (miner, width, until))
+        self._progress[(miner, width)] = until
+        return True
+
+    def _expire(self, now):
+        """Löscht abgelaufene Daten, aber nur, was die nächste Stufe schon enthält."""
+        conn = self._conn
+        levels = [(None, self.raw_retention)] + [(tier.width, tier.retention) for tier in self.tiers]
+        with conn:
+            for k, (width, retention) in enumerate(levels):
+                if not retention:
+                    continue
+                cutoff = now - retention
+                covered = levels[k + 1][0] if k + 1 < len(levels) else None
+                if width is None:
+                    where, args = "end < ?", [cutoff]
+                    if covered is not None:
+                        where += (" AND end < COALESCE((SELECT done_until FROM rollup_progress AS p "
+                                  "WHERE p.miner = sample_chunks.miner AND p.tier = ?), 0)")
+                        args.append(covered)
+                    conn.execute(f"DELETE FROM sample_chunks WHERE {where}", args)
+                    for miner, chunk in list(self._chunks.items()):
+                        if chunk.timestamps and chunk.timestamps[-1] / 1000.0 < cutoff:
+                            del self._chunks[miner]
+                            self._pieces.pop(miner, None)
+                else:
+                    where, args = "tier = ? AND end < ?", [width, cutoff]
+                    if covered is not None:
+                        where += (" AND end <= COALESCE((SELECT done_until FROM rollup_progress AS p "
+                                  "WHERE p.miner = rollup_chunks.miner AND p.tier = ?), 0)")
+                        args.append(covered)
+                    conn.execute(f"DELETE FROM rollup_chunks WHERE {where}", args)
+
+    def _maintain_batch(self, now):
+        """Ein kleiner Wartungsschritt. True, solange noch Arbeit übrig ist."""
+        conn = self._connect()
+        if self.tiers:
+            miners = [row[0] for row in conn.execute(
+                "SELECT DISTINCT miner FROM sample_chunks UNION SELECT DISTINCT miner FROM rollup_chunks"
+            )]
+            for level in range(len(self.tiers)):
+                for miner in miners:
+                    if self._rollup_step(miner, level, now):
+                        return True
+        self._expire(now)
+        if conn.execute("PRAGMA freelist_count").fetchone()[0]:
+            conn.execute(f"PRAGMA incremental_vacuum({self.VACUUM_PAGES})")
+            return bool(conn.execute("PRAGMA freelist_count").fetchone()[0])
+        return False
+
+    async def flush(self):
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        try:
+            await self._call(self._write, rows)
+        except Exception as e:
+            print(f"{Fore.RED}Fehler beim Schreiben der Historie: {e}{Style.RESET_ALL}")
+
+    def _indices(self, metrics):
+        columns = list(metrics or SAMPLE_COLUMNS)
+        unknown = [c for c in columns if c not in SAMPLE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unbekannte Metrik: {', '.join(unknown)}")
+        return [SAMPLE_COLUMNS.index(column) for column in columns]
+
+    async def query(self, miner, since, until=None, metrics=None, resolution=0):
+        """
+        Liefert [(ts, wert1, wert2, ...), ...] für einen Miner im Zeitraum [since, until].
+        metrics sind Spaltennamen aus SAMPLE_COLUMNS (Standard: alle). Mit resolution
+        (Sekunden pro Punkt) kommen die Werte aus der gröbsten passenden Rollup-Stufe
+        (Mittelwert je Bucket).
+        """
+        indices = self._indices(metrics)
+        # Noch gepufferte Samples zuerst schreiben, damit die Abfrage vollständig ist
+        await self.flush()
+        until = time.time() if until is None else until
+        return await self._call(self._query, miner, since, until, indices, resolution)
+
+    async def summarize(self, miner, since, until=None, metrics=None, resolution=0):
+        """
+        {Spalte: {count, mean, min, max, std, p50, p95}} im Zeitraum. Min/Max und
+        Mittelwert sind exakt, Streuung und Perzentile beziehen sich bei Rollups auf
+        die Bucket-Mittelwerte.
+        """
+        indices = self._indices(metrics)
+        await self.flush()
+        until = time.time() if until is None else until
+        return await self._call(self._summarize, miner, since, until, indices, resolution)
+
+    async def query_config(self, miner, since=0.0, until=None):
+        """Konfigurationsänderungen [(ts, feld, wert), ...] eines Miners im Zeitraum."""
+        await self.flush()
+        until = time.time() if until is None else until
+        return await self._call(self._query_config, miner, since, until)
+
+    async def compact(self):
+        """Verdichtet und räumt auf, bis nichts mehr zu tun ist – in kleinen Batches."""
+        await self.flush()
+        while not self._closed and await self._call(self._maintain_batch, time.time()):
+            await asyncio.sleep(self.MAINTENANCE_PAUSE)
+
+    async def run(self):
+        while not self._closed:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def maintain(self):
+        while not self._closed:
+            await asyncio.sleep(self.maintenance_interval)
+            try:
+                await self.compact()
+            except Exception as e:
+                print(f"{Fore.RED}Fehler bei der Wartung der Historie: {e}{Style.RESET_ALL}")
+
+    async def close(self):
+        self._closed = True
+        await self.flush()
+        if self._conn is not None:
+            await self._call(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=False)
+
+def load_sample_store():
+    if not config.has_section('history') or config['history'].getboolean('enabled', True):
+        options = config['history'] if config.has_section('history') else {}
+        return SampleStore(
+            options.get('database', 'bitaxe_history.db'),
+            float(options.get('flush_interval_sec', 5)),
+            chunk_samples=int(options.get('chunk_samples', 720)),
+            raw_retention=parse_duration(options.get('raw_retention', '48h')) or 0,
+            tiers=parse_retention_tiers(options.get('rollups', '1m:90d, 1h:forever')),
+            maintenance_interval=float(options.get('rollup_interval_sec', 60)),
+        )
+    return None
+
+sample_store = load_sample_store()
+if sample_store is not None:
+    fleet.listeners.append(lambda miner, data: sample_store.add(miner.name, data))
+
+# Aufnahme des rohen Snapshot-Stroms (optional, [recording] enabled = true) für das
+# Replay: Regeln und Schwellen lassen sich so gegen echte Verläufe nachprüfen.
+# Datei: aneinandergehängte gzip-Blöcke, jeder ein marshal-Tupel
+# (Version, Snapshot-Felder, Start in ms, [(ms seit Vorgänger, Miner, Änderungen)]).
+# Änderungen ist {Feldindex: Wert} gegenüber dem vorigen Sample desselben Miners im
+# Block, None heißt nicht erreichbar. Jeder Block ist für sich lesbar.
+RECORDING_VERSION = 1
+
+def encode_recording_block(samples):
+    """[(ts, miner, Snapshot oder None)] -> ein gzip-Block."""
+    empty = (None,) * len(Snapshot.__slots__)
+    previous = {}
+    records = []
+    start = last = round(samples[0][0] * 1000)
+    for ts, miner, data in samples:
+        ms = round(ts * 1000)
+        changes = None
+        if data:
+            values = data.to_tuple()
+            before = previous.get(miner, empty)
+            changes = {i: value for i, (value, old) in enumerate(zip(values, before)) if value != old}
+            previous[miner] = values
+        records.append((ms - last, miner, changes))
+        last = ms
+    return gzip.compress(marshal.dumps((RECORDING_VERSION, Snapshot.__slots__, start, records)), compresslevel=6)
+
+def read_recording(path):
+    """Liefert (ts, miner, Snapshot oder None) in Aufnahmereihenfolge. Ein abgeschnittener letzter Block wird übersprungen."""
+    slots = Snapshot.__slots__
+    # marshal liest in sehr kleinen Stücken: ein Puffer davor spart die meisten gzip-Aufrufe
+    with gzip.open(path, "rb") as raw, io.BufferedReader(raw, 1 << 16) as f:
+        while True:
+            try:
+                version, fields, ms, records = marshal.load(f)
+            except (EOFError, ValueError, OSError, zlib.error):
+                return
+            if version != RECORDING_VERSION:
+                raise ValueError(f"Unbekannte Aufnahme-Version {version}")
+            # Felder über den Namen zuordnen, damit ältere Aufnahmen lesbar bleiben
+            mapping = [slots.index(field) if field in slots else None for field in fields]
+            state = {}
+            for delta, miner, changes in records:
+                ms += delta
+                if changes is None:
+                    yield ms / 1000, miner, None
+                    continue
+                values = state.setdefault(miner, [None] * len(slots))
+                for index, value in changes.items():
+                    if mapping[index] is not None:
+                        values[mapping[index]] = value
+                yield ms / 1000, miner, Snapshot.from_tuple(values)
+
+class SnapshotRecorder:
+    """
+    Puffert jeden Snapshot aller Miner im Speicher und hängt ihn gebündelt in einem
+    eigenen Thread als Block an die Aufnahme an – wie die Historie wartet der
+    Event-Loop nie auf die Platte.
+    """
+
+    def __init__(self, path, flush_interval=60.0, max_buffer=50000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.samples = 0
+        self.dropped = 0
+        self.bytes_written = 0
+        self._buffer = []
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="recorder")
+        self._closed = False
+
+    def add(self, miner, data, ts=None):
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+        # Snapshots sind unveränderlich: erst der Schreib-Thread kodiert sie
+        self._buffer.append((time.time() if ts is None else ts, miner, data))
+        self.samples += 1
+
+    def _write(self, samples):
+        block = encode_recording_block(samples)
+        with open(self.path, "ab") as f:
+            f.write(block)
+        return len(block)
+
+    async def flush(self):
+        if not self._buffer:
+            return
+        samples, self._buffer = self._buffer, []
+        loop = asyncio.get_running_loop()
+        try:
+            self.bytes_written += await loop.run_in_executor(self._executor, self._write, samples)
+        except Exception as e:
+            print(f"{Fore.RED}Fehler beim Schreiben der Aufnahme: {e}{Style.RESET_ALL}")
+
+    async def run(self):
+        while not self._closed:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def close(self):
+        self._closed = True
+        await self.flush()
+        self._executor.shutdown(wait=False)
+
+def load_recorder():
+    if config.has_section('recording') and config['recording'].getboolean('enabled', False):
+        options = config['recording']
+        return SnapshotRecorder(
+            options.get('file', 'bitaxe_recording.bin'),
+            float(options.get('flush_interval_sec', 60)),
+        )
+    return None
+
+recorder = load_recorder()
+if recorder is not None:
+    fleet.listeners.append(lambda miner, data: recorder.add(miner.name, data))
+
+# Journal der Best Difficulties: nur angehängte, per fsync gesicherte JSON-Zeilen.
+# Ein Checkpoint (Top-N und Allzeit-Maximum je Miner) am Dateianfang ersetzt bei
+# der Kompaktierung alle älteren Zeilen, beim Start wird nur der Rest nachgespielt.
+# Erst vollständig in eine temporäre Datei schreiben, dann atomar ersetzen
+def write_file_atomic(path, text):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+class BestJournal:
+    def __init__(self, path, top_n=100, compact_after=1000):
+        self.path = path
+        self.top_n = top_n
+        self.compact_after = compact_after
+        self._heaps = {}  # Miner -> Min-Heap aus (best, timestamp), höchstens top_n Einträge
+        self._max = {}    # Miner -> Allzeit-Maximum
+        self._since_checkpoint = 0
+        # Ein Thread für alle Schreibzugriffe hält die Reihenfolge der Zeilen ein
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="best-journal")
+
+    def max(self, miner):
+        return self._max.get(miner)
+
+    def top(self, miner, count):
+        """Die count höchsten Einträge [(best, timestamp), ...], absteigend sortiert."""
+        return heapq.nlargest(count, self._heaps.get(miner, []))
+
+    def qualifies(self, miner, best):
+        """Käme der Wert in die Top-N? Schon vorhandene Werte (z. B. nach einem Neustart) nicht."""
+        heap = self._heaps.get(miner, [])
+        if any(entry[0] == best for entry in heap):
+            return False
+        return len(heap) < self.top_n or best > heap[0][0]
+
+    def _index(self, miner, best, timestamp):
+        heap = self._heaps.setdefault(miner, [])
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, (best, timestamp))
+        elif (best, timestamp) > heap[0]:
+            heapq.heapreplace(heap, (best, timestamp))
+        if best > self._max.get(miner, float("-inf")):
+            self._max[miner] = best
+
+    def _checkpoint(self):
+        return {
+            miner: {"max": self._max.get(miner), "top": sorted(heap, reverse=True)}
+            for miner, heap in self._heaps.items()
+        }
+
+    def load(self, default_miner=None, legacy_path=None):
+        if not os.path.exists(self.path):
+            if legacy_path and os.path.exists(legacy_path):
+                self._load_legacy(legacy_path, default_miner)
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Unvollständige letzte Zeile nach einem Absturz
+                    continue
+                if "checkpoint" in record:
+                    self._heaps.clear()
+                    self._max.clear()
+                    self._since_checkpoint = 0
+                    for miner, entry in record["checkpoint"].items():
+                        self._heaps[miner] = [tuple(item) for item in entry["top"]]
+                        heapq.heapify(self._heaps[miner])
+                        if entry.get("max") is not None:
+                            self._max[miner] = entry["max"]
+                else:
+                    self._index(record.get("miner", default_miner), record["best"], record["timestamp"])
+                    self._since_checkpoint += 1
+
+    def _load_legacy(self, legacy_path, miner):
+        with open(legacy_path, 'r') as f:
+            for rec in json.load(f):
+                if isinstance(rec.get("best"), (int, float)):
+                    self._index(miner, rec["best"], rec.get("timestamp", "Unbekannt"))
+        self._write_checkpoint(self._checkpoint())
+
+    def record(self, miner, best, timestamp=None):
+        """Nimmt einen neuen Wert auf. Index sofort, Datei im Hintergrund."""
+        timestamp = timestamp or datetime.datetime.now().isoformat()
+        self._index(miner, best, timestamp)
+        line = json.dumps({"miner": miner, "timestamp": timestamp, "best": best}) + "\n"
+        self._submit(self._append, line)
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= self.compact_after:
+            self._since_checkpoint = 0
+            self._submit(self._write_checkpoint, self._checkpoint())
+
+    def _submit(self, fn, *args):
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._report_error)
+
+    @staticmethod
+    def _report_error(future):
+        if future.exception() is not None:
+            print(f"{Fore.RED}Fehler beim Schreiben des Best-Difficulty-Journals: {future.exception()}{Style.RESET_ALL}")
+
+    def _append(self, line):
+        with open(self.path, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_checkpoint(self, checkpoint):
+        write_file_atomic(self.path, json.dumps({"checkpoint": checkpoint, "timestamp": datetime.datetime.now().isoformat()}) + "\n")
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+best_journal = BestJournal(history_file)
+
+# Neue Höchstwerte aus jedem Abruf ins Journal übernehmen: das Allzeit-Maximum und jede
+# neue Session-Best-Difficulty, die in die Top-N der Historie kommt
+last_session_best = {}  # Miner -> zuletzt gesehene Session-Best-Difficulty
+
+def record_best_difficulty(miner, data):
+    if not data:
+        return
+    value = data.best_diff
+    if value is not None and value > (best_journal.max(miner.name) or 0):
+        best_journal.record(miner.name, value)
+    session_best = data.best_session_diff
+    if session_best and session_best != last_session_best.get(miner.name):
+        last_session_best[miner.name] = session_best
+        if best_journal.qualifies(miner.name, session_best):
+            best_journal.record(miner.name, session_best)
+
+fleet.listeners.append(record_best_difficulty)
+
+# Gleitende Statistiken je Miner und Metrik für die Fenster 1m/15m/1h/24h.
+# Jedes Fenster besteht aus STATS_BUCKETS Zeit-Buckets; ein neuer Sample ändert nur den
+# aktuellen Bucket und die laufenden Summen (O(1)), abgelaufene Buckets werden abgezogen.
+# Perzentile kommen aus einem logarithmischen Histogramm (relative Genauigkeit ~1 %).
+STATS_WINDOWS = {"1m": 60, "15m": 900, "1h": 3600, "24h": 86400}
+STATS_BUCKETS = 30
+STATS_METRICS = {
+    "hashrate": ("⚡ Hashrate", HASHRATE_UNIT),
+    "temp": ("🌡️ Temperatur", "°C"),
+    "vr_temp": ("🌡️ VRM-Temperatur", "°C"),
+    "power": ("🔌 Leistung", "W"),
+    "fan_rpm": ("🌀 Lüfter", "RPM"),
+}
+SKETCH_GAMMA = 1.02
+SKETCH_LOG_GAMMA = math.log(SKETCH_GAMMA)
+SKETCH_ZERO = -(10 ** 9)  # Bin für Werte <= 0
+
+def sketch_key(value):
+    if value <= 0:
+        return SKETCH_ZERO
+    return math.ceil(math.log(value) / SKETCH_LOG_GAMMA)
+
+def sketch_value(key):
+    if key == SKETCH_ZERO:
+        return 0.0
+    # Mitte des Bins (gamma^(k-1), gamma^k]
+    return 2 * SKETCH_GAMMA ** key / (SKETCH_GAMMA + 1)
+
+class StatsBucket:
+    __slots__ = ("start", "count", "total", "total_sq", "min", "max", "hist")
+
+    def __init__(self, start):
+        self.start = start
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.hist = {}
+
+class RollingWindow:
+    __slots__ = ("span", "width", "buckets", "count", "total", "total_sq", "hist")
+
+    def __init__(self, span):
+        self.span = span
+        self.width = span / STATS_BUCKETS
+        self.buckets = collections.deque()
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.hist = {}  # Summe der Bucket-Histogramme
+
+    def expire(self, now):
+        while self.buckets and self.buckets[0].start + self.width <= now - self.span:
+            bucket = self.buckets.popleft()
+            self.count -= bucket.count
+            self.total -= bucket.total
+            self.total_sq -= bucket.total_sq
+            for key, n in bucket.hist.items():
+                remaining = self.hist[key] - n
+                if remaining:
+                    self.hist[key] = remaining
+                else:
+                    del self.hist[key]
+
+    def add(self, ts, value, key):
+        self.expire(ts)
+        start = ts - ts % self.width
+        if not self.buckets or self.buckets[-1].start < start:
+            self.buckets.append(StatsBucket(start))
+        bucket = self.buckets[-1]
+        bucket.count += 1
+        bucket.total += value
+        bucket.total_sq += value * value
+        bucket.min = min(bucket.min, value)
+        bucket.max = max(bucket.max, value)
+        bucket.hist[key] = bucket.hist.get(key, 0) + 1
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        self.hist[key] = self.hist.get(key, 0) + 1
+
+    def percentile(self, q):
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.hist):
+            seen += self.hist[key]
+            if seen > rank:
+                return sketch_value(key)
         return None
 
+    def summary(self, now):
+        """Mittelwert, Min, Max, Standardabweichung, p50, p95 – oder None ohne Daten."""
+        self.expire(now)
+        if self.count <= 0:
+            return None
+        mean = self.total / self.count
+        variance = max(0.0, self.total_sq / self.count - mean * mean)
+        return {
+            "count": self.count,
+            "mean": mean,
+            "min": min(b.min for b in self.buckets),
+            "max": max(b.max for b in self.buckets),
+            "std": math.sqrt(variance),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+        }
+
+class StatsEngine:
+    def __init__(self):
+        self._windows = {}      # (Miner, Metrik) -> {Fenstername: RollingWindow}
+        self._last_shares = {}  # Miner -> (shares_accepted, shares_rejected)
+
+    def _stream(self, miner, metric):
+        windows = self._windows.get((miner, metric))
+        if windows is None:
+            windows = self._windows[(miner, metric)] = {name: RollingWindow(span) for name, span in STATS_WINDOWS.items()}
+        return windows
+
+    def _add(self, miner, metric, value, ts):
+        key = sketch_key(value)
+        for window in self._stream(miner, metric).values():
+            window.add(ts, value, key)
+
+    def feed(self, miner, data, ts=None):
+        if not data:
+            return
+        ts = time.time() if ts is None else ts
+        for metric in STATS_METRICS:
+            value = getattr(data, metric)
+            if value is not None:
+                self._add(miner, metric, float(value), ts)
+
+        # Shares als Differenzen; nach einem Neustart des Miners zählen die Zähler von vorn
+        accepted, rejected = data.shares_accepted, data.shares_rejected
+        if accepted is not None and rejected is not None:
+            previous = self._last_shares.get(miner)
+            self._last_shares[miner] = (accepted, rejected)
+            if previous is not None:
+                delta_accepted = accepted - previous[0] if accepted >= previous[0] else accepted
+                delta_rejected = rejected - previous[1] if rejected >= previous[1] else rejected
+                self._add(miner, "shares_accepted", float(delta_accepted), ts)
+                self._add(miner, "shares_rejected", float(delta_rejected), ts)
+
+    def summary(self, miner, metric, window, now=None):
+        windows = self._windows.get((miner, metric))
+        if windows is None:
+            return None
+        return windows[window].summary(time.time() if now is None else now)
+
+    def acceptance(self, miner, window, now=None):
+        """(akzeptiert, abgelehnt, Quote in %) im Fenster oder None."""
+        now = time.time() if now is None else now
+        accepted = self.summary(miner, "shares_accepted", window, now)
+        rejected = self.summary(miner, "shares_rejected", window, now)
+        if accepted is None or rejected is None:
+            return None
+        total = accepted["mean"] * accepted["count"] + rejected["mean"] * rejected["count"]
+        accepted_total = accepted["mean"] * accepted["count"]
+        rate = 100.0 * accepted_total / total if total else None
+        return round(accepted_total), round(total - accepted_total), rate
+
+stats_engine = StatsEngine()
+fleet.listeners.append(lambda miner, data: stats_engine.feed(miner.name, data))
+
+# Optionaler Prometheus/OpenMetrics-Endpunkt im selben Event-Loop. Antworten kommen
+# ausschließlich aus den Snapshot-Caches, ein Scrape erzeugt also keine Anfrage beim Miner.
+# (Name, Typ, Hilfetext, Snapshot-Attribut)
+EXPORTED_METRICS = [
+    ("bitaxe_hashrate", "gauge", f"Hashrate in {HASHRATE_UNIT}", "hashrate"),
+    ("bitaxe_temperature_celsius", "gauge", "ASIC-Temperatur", "temp"),
+    ("bitaxe_vr_temperature_celsius", "gauge", "Temperatur des Spannungsreglers", "vr_temp"),
+    ("bitaxe_power_watts", "gauge", "Leistungsaufnahme", "power"),
+    ("bitaxe_voltage_volts", "gauge", "Eingangsspannung", "voltage"),
+    ("bitaxe_current_amperes", "gauge", "Stromstärke", "current"),
+    ("bitaxe_core_voltage_volts", "gauge", "Gemessene Kernspannung", "core_voltage_actual"),
+    ("bitaxe_frequency_mhz", "gauge", "ASIC-Frequenz", "frequency"),
+    ("bitaxe_fan_rpm", "gauge", "Lüfterdrehzahl", "fan_rpm"),
+    ("bitaxe_fan_speed_percent", "gauge", "Lüftergeschwindigkeit", "fan_speed"),
+    ("bitaxe_shares_accepted_total", "counter", "Akzeptierte Shares seit dem Start des Miners", "shares_accepted"),
+    ("bitaxe_shares_rejected_total", "counter", "Abgelehnte Shares seit dem Start des Miners", "shares_rejected"),
+    ("bitaxe_uptime_seconds", "gauge", "Uptime des Miners", "uptime"),
+    ("bitaxe_fallback_stratum", "gauge", "1, wenn der Fallback-Stratum aktiv ist", "using_fallback"),
+    ("bitaxe_best_difficulty", "gauge", "Höchste Difficulty des Miners", "best_diff"),
+    ("bitaxe_session_best_difficulty", "gauge", "Höchste Difficulty seit dem Start", "best_session_diff"),
+]
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def render_metrics():
+    lines = []
+
+    def family(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for miner, value in samples:
+            lines.append(f'{name}{{miner="{escape_label(miner.name)}"}} {value}')
+
+    snapshots = [(miner, miner.cache.data, miner.cache.age()) for miner in fleet.miners.values()]
+    family("bitaxe_up", "gauge", "1, wenn der letzte Abruf erfolgreich war",
+           [(m, 1 if data else 0) for m, data, age in snapshots if age is not None])
+    family("bitaxe_snapshot_age_seconds", "gauge", "Alter des letzten Abrufs",
+           [(m, f"{age:.3f}") for m, _, age in snapshots if age is not None])
+    for name, kind, help_text, attr in EXPORTED_METRICS:
+        samples = []
+        for miner, data, _ in snapshots:
+            value = getattr(data, attr) if data else None
+            if value is not None:
+                samples.append((miner, round(float(value), 6)))
+        family(name, kind, help_text, samples)
+
+    lines.append(f"# HELP bitaxe_fleet_hashrate Gesamt-Hashrate der Fleet in {HASHRATE_UNIT}")
+    lines.append("# TYPE bitaxe_fleet_hashrate gauge")
+    lines.append(f"bitaxe_fleet_hashrate {fleet.total_hashrate}")
+    lines.append("# HELP bitaxe_fleet_offline Anzahl nicht erreichbarer Miner")
+    lines.append("# TYPE bitaxe_fleet_offline gauge")
+    lines.append(f"bitaxe_fleet_offline {fleet.offline_count}")
+    return "\n".join(lines) + "\n"
+
+class MetricsExporter:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.scrapes = 0
+        self._runner = None
+
+    async def handle(self, request):
+        self.scrapes += 1
+        # Textformat 0.0.4 des Prometheus-Exposition-Formats
+        return web.Response(text=render_metrics(), content_type="text/plain; version=0.0.4", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"{Fore.CYAN}📈 Metriken unter http://{self.host}:{self.port}/metrics{Style.RESET_ALL}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+def load_metrics_exporter():
+    if config.has_section('metrics') and config['metrics'].getboolean('enabled', False):
+        options = config['metrics']
+        return MetricsExporter(options.get('host', '127.0.0.1'), int(options.get('port', 9101)))
+    return None
+
+metrics_exporter = load_metrics_exporter()
+
+# Formatiert das Alter eines Snapshots für Footer und Textantworten
+def format_age(age, stale=False):
+    if age is None:
+        return "Snapshot-Alter: unbekannt"
+    if stale:
+        return f"⚠️ Miner offline – letzter bekannter Stand vor {format_duration(age)}"
+    return f"Snapshot-Alter: {age:.0f} s"
+
+def format_duration(seconds):
+    return str(datetime.timedelta(seconds=int(seconds)))
+
+startup_done = False
+
 @bot.event
 async def on_ready():
+    global startup_done
     print(f"{Fore.CYAN}✅ Bot ist eingeloggt als {bot.user}{Style.RESET_ALL}")
+    # on_ready kommt nach jedem Reconnect erneut – Tasks nur einmal starten
+    if startup_done:
+        return
+    startup_done = True
+    # Zuerst abfragen; Startnachricht und Dashboard laufen danach über die Ausgangs-Queue
+    bot.loop.create_task(scheduler.run())
+    restored = dashboard_manager.restore_entries(runtime_state.saved.get("dashboards", {}))
+    if restored:
+        print(f"{restored} Dashboard(s) von vor dem Neustart übernommen.")
+    if SLASH_COMMANDS:
+        bot.loop.create_task(sync_app_commands())
     await send_startup_help()
-    bot.loop.create_task(monitor_changes())
+    await post_pinned_dashboard()
 
-async def send_startup_help():
-    await bot.wait_until_ready()
-    channel = bot.get_channel(channel_id)
-    if channel:
-        categories = {
-            "🟢 Status": ["status", "hashrate", "temp", "uptime"],
-            "🔧 System": ["chip", "power", "fans", "version"],
-            "🌐 Netzwerk": ["wifi"],
-            "📋 Übersicht": ["info", "best", "stratum"]
-        }
-        help_text = (
-            "🤖 **BitaxeDiscordBot ist online!** 🎉\n"
-            "Hier sind deine wichtigsten Befehle – direkt einsatzbereit!\n\n"
-            "📌 **Top-Befehl:**\n"
-            "  🔹 `!dashboard` – zeigt ein live aktualisiertes Embed mit allen zentralen Systemwerten (wie Temperatur, Hashrate, Uptime, Best Difficulty, Stratum, Chip Voltage und Stromverbrauch) an\n\n"
-            "📘 **Weitere Kategorien:**\n\n"
-        )
-        for category, commands_list in categories.items():
+# Die Slash-Befehle werden nur neu an Discord übertragen, wenn sie sich seit dem letzten
+# Sync geändert haben – ein Sync ist langsam und stark rate-limitiert.
+async def sync_app_commands():
+    guild = discord.Object(SLASH_GUILD_ID) if SLASH_GUILD_ID else None
+    if guild is not None:
+        bot.tree.copy_global_to(guild=guild)
+    payload = [command.to_dict(bot.tree) for command in bot.tree.get_commands(guild=guild)]
+    digest = zlib.crc32(json.dumps(payload, sort_keys=True).encode("utf-8"))
+    if runtime_state.app_commands == {"guild_id": SLASH_GUILD_ID, "digest": digest}:
+        print("Slash-Befehle unverändert – kein Sync nötig.")
+        return
+    try:
+        synced = await bot.tree.sync(guild=guild)
+    except discord.HTTPException as e:
+        print(f"{Fore.RED}Fehler beim Registrieren der Slash-Befehle: {e}{Style.RESET_ALL}")
+        return
+    print(f"{len(synced)} Slash-Befehle registriert" + (f" (Server {SLASH_GUILD_ID})" if guild is not None else " (global)"))
+    runtime_state.app_commands = {"guild_id": SLASH_GUILD_ID, "digest": digest}
+    runtime_state.save_soon()
+
+STARTUP_HELP_HEADER = (
+    "🤖 **BitaxeDiscordBot ist online!** 🎉\n"
+    "Hier sind deine wichtigsten Befehle – direkt einsatzbereit!\n\n"
+    "📌 **Top-Befehl:**\n"
+    "  🔹 `{sigil}dashboard` – zeigt ein live aktualisiertes Embed mit allen zentralen Systemwerten (wie Temperatur, Hashrate, Uptime, Best Difficulty, Stratum, Chip Voltage und Stromverbrauch) an\n\n"
+    "📘 **Weitere Kategorien:**\n\n"
+)
+HELP_CATEGORIES = {
+    "🟢 Status": ["status", "hashrate", "temp", "uptime", "miners"],
+    "🔧 System": ["chip", "power", "fans", "version"],
+    "🌐 Netzwerk": ["wifi"],
+    "📋 Übersicht": ["info", "best", "stratum"],
+    "📈 Historie": ["chart", "stats"],
+    "🛠 Diagnose": ["queue", "perf"],
+    "🎛️ Tuning": ["autotune"]
+}
+_help_lines = None
+
+def help_command_lines():
+    """Befehle nach Kategorien – einmal gebaut, nach dem Import stehen die Befehle fest."""
+    global _help_lines
+    if _help_lines is None:
+        help_text = ""
+        for category, commands_list in HELP_CATEGORIES.items():
             help_text += f"{category}:\n"
             for name in commands_list:
                 command = bot.get_command(name)
                 if command and not command.hidden:
-                    help_text += f"  🔹 `!{command.name}` – {command.help or 'Keine Beschreibung'}\n"
+                    help_text += f"  🔹 `{COMMAND_SIGIL}{command.name}` – {command.help or 'Keine Beschreibung'}\n"
             help_text += "\n"
-        await channel.send(help_text)
+        _help_lines = help_text
+    return _help_lines
+
+# Die Startnachricht wird nur gesendet, wenn sie sich seit dem letzten Start geändert
+# hat – dann wird die vorhandene Nachricht bearbeitet statt eine neue zu posten.
+async def send_startup_help():
+    await bot.wait_until_ready()
+    channel = bot.get_channel(channel_id)
+    if channel is None:
+        return
+    help_text = STARTUP_HELP_HEADER.format(sigil=COMMAND_SIGIL) + help_command_lines()
+    digest = zlib.crc32(help_text.encode("utf-8"))
+    saved = runtime_state.startup_message
+    same_channel = saved.get("channel_id") == channel.id
+    if same_channel and saved.get("digest") == digest:
+        print("Startnachricht unverändert – wird nicht erneut gesendet.")
+        return
+    message_id = saved.get("message_id") if same_channel else None
+    if message_id is not None:
+        try:
+            await outbound.edit(channel.get_partial_message(message_id), content=help_text)
+        except discord.HTTPException:
+            message_id = None
+    if message_id is None:
+        message = await outbound.send(channel, PRIORITY_ALERT, content=help_text)
+        message_id = message.id
+    runtime_state.startup_message = {"channel_id": channel.id, "message_id": message_id, "digest": digest}
+    runtime_state.save_soon()
+
+@bot.hybrid_command(help="Zeigt den aktuellen Status des Bitaxe inkl. Temperatur, Uptime, Shares und freiem Speicher. Optional: Miner-Name oder tag:<tag>")
+@app_commands.describe(miner=MINER_PARAM)
+@app_commands.autocomplete(miner=miner_autocomplete)
+async def status(ctx, miner: str = None):
+    if wants_fleet_view(miner):
+        selected = fleet.select(miner)
+        if not selected:
+            await reply(ctx, unknown_miner_text(miner))
+            return
+        await reply(ctx, embed=generate_fleet_embed(await fleet.sweep(selected)))
+        return
 
-@bot.command(help="Zeigt den aktuellen Status des Bitaxe inkl. Temperatur, Uptime, Shares und freiem Speicher")
-async def status(ctx):
-    data = fetch_bitaxe_data()
+    target = resolve_miner(miner)
+    if target is None:
+        await reply(ctx, unknown_miner_text(miner))
+        return
+    data, age, stale = await target.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
+        await reply(ctx, "❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
         return
 
-    temp = data.get("temp", "N/A")
-    hr = data.get("hashRate", 0)
-    uptime_sec = int(data.get("uptimeSeconds", 0))
-    uptime = str(datetime.timedelta(seconds=uptime_sec))
-    shares_accepted = data.get("sharesAccepted", 0)
-    shares_rejected = data.get("sharesRejected", 0)
-    free_heap = data.get("freeHeap", "N/A")
+    uptime = str(datetime.timedelta(seconds=data.uptime or 0))
 
     # Embed erstellen
     embed = discord.Embed(
@@ -295,123 +2753,114 @@ async def status(ctx):
         color=0x3498db,
         timestamp=datetime.datetime.utcnow()
     )
-    embed.add_field(name="🌡️ Temperatur", value=f"{temp}°C", inline=True)
-    embed.add_field(name="⚡ Hashrate", value=f"{hr:.2f} MH/s", inline=True)
+    embed.add_field(name="🌡️ Temperatur", value=f"{show(data.temp)}°C", inline=True)
+    embed.add_field(name="⚡ Hashrate", value=f"{show(data.hashrate, '.2f')} {HASHRATE_UNIT}", inline=True)
     embed.add_field(name="⏱️ Uptime", value=uptime, inline=True)
-    embed.add_field(name="📈 Shares", value=f"✅ {shares_accepted} / ❌ {shares_rejected}", inline=True)
-    embed.add_field(name="💾 Freier Speicher", value=f"{free_heap} Bytes", inline=False)
+    embed.add_field(name="📈 Shares", value=f"✅ {data.shares_accepted or 0} / ❌ {data.shares_rejected or 0}", inline=True)
+    embed.add_field(name="💾 Freier Speicher", value=f"{show(data.free_heap)} Bytes", inline=False)
     
-    embed.set_footer(text="Status aktuell.")
-    await ctx.send(embed=embed)
+    embed.set_footer(text=f"Status aktuell. · {format_age(age, stale)}")
+    await reply(ctx, embed=embed)
 
-@bot.command(help="Zeigt die aktuelle Hashrate in MH/s")
+@bot.hybrid_command(help=f"Zeigt die aktuelle Hashrate in {HASHRATE_UNIT}")
 async def hashrate(ctx):
-    data = fetch_bitaxe_data()
+    data, age, stale = await fleet.default.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
+        await reply(ctx, "❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
         return
 
-    hr = data.get("hashRate", 0)
     embed = discord.Embed(
         title="⚡ Aktuelle Hashrate",
         color=0x3498db,
         timestamp=datetime.datetime.utcnow()
     )
-    embed.add_field(name="Hashrate", value=f"{hr:.2f} MH/s", inline=False)
-    embed.set_footer(text="Hashrate-Details abgerufen.")
-    await ctx.send(embed=embed)
+    embed.add_field(name="Hashrate", value=f"{show(data.hashrate, '.2f')} {HASHRATE_UNIT}", inline=False)
+    embed.set_footer(text=f"Hashrate-Details abgerufen. · {format_age(age, stale)}")
+    await reply(ctx, embed=embed)
 
-@bot.command(help="Zeigt die aktuelle Temperatur und VRM-Temperatur")
+@bot.hybrid_command(help="Zeigt die aktuelle Temperatur und VRM-Temperatur")
 async def temp(ctx):
-    data = fetch_bitaxe_data()
+    data, age, stale = await fleet.default.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
+        await reply(ctx, "❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
         return
 
-    temp = data.get("temp", "N/A")
-    vr_temp = data.get("vrTemp", "N/A")
     embed = discord.Embed(
         title="🌡️ Temperatur Übersicht",
         color=0x3498db,
         timestamp=datetime.datetime.utcnow()
     )
-    embed.add_field(name="Temperatur", value=f"{temp}°C", inline=True)
-    embed.add_field(name="VRM-Temperatur", value=f"{vr_temp}°C", inline=True)
-    embed.set_footer(text="Temperatur-Details abgerufen.")
-    await ctx.send(embed=embed)
+    embed.add_field(name="Temperatur", value=f"{show(data.temp)}°C", inline=True)
+    embed.add_field(name="VRM-Temperatur", value=f"{show(data.vr_temp)}°C", inline=True)
+    embed.set_footer(text=f"Temperatur-Details abgerufen. · {format_age(age, stale)}")
+    await reply(ctx, embed=embed)
 
-@bot.command(help="Zeigt die aktuelle Uptime des Miners")
+@bot.hybrid_command(help="Zeigt die aktuelle Uptime des Miners")
 async def uptime(ctx):
-    data = fetch_bitaxe_data()
+    data, age, stale = await fleet.default.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
+        await reply(ctx, "❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
         return
 
-    uptime_sec = int(data.get("uptimeSeconds", 0))
-    uptime_str = str(datetime.timedelta(seconds=uptime_sec))
+    uptime_str = str(datetime.timedelta(seconds=data.uptime or 0))
     embed = discord.Embed(
         title="⏱️ Uptime Übersicht",
         color=0x3498db,
         timestamp=datetime.datetime.utcnow()
     )
     embed.add_field(name="Uptime", value=uptime_str, inline=False)
-    embed.set_footer(text="Uptime-Daten abgerufen.")
-    await ctx.send(embed=embed)
+    embed.set_footer(text=f"Uptime-Daten abgerufen. · {format_age(age, stale)}")
+    await reply(ctx, embed=embed)
 
-@bot.command(help="Zeigt das Chipmodell, die Frequenz und die Chip Voltage (2 Nachkommastellen, Aktuell/Soll)")
+@bot.hybrid_command(help="Zeigt das Chipmodell, die Frequenz und die Chip Voltage (2 Nachkommastellen, Aktuell/Soll)")
 async def chip(ctx):
-    data = fetch_bitaxe_data()
+    data, age, stale = await fleet.default.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
+        await reply(ctx, "❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
         return
 
-    model = data.get("ASICModel", "N/A")
-    freq = data.get("frequency", "N/A")
-    voltage_actual = float(data.get("coreVoltageActual", "0")) / 1000.0
-    voltage_set = float(data.get("coreVoltage", "0")) / 1000.0
-
     embed = discord.Embed(
         title="🔎 Chip-Informationen",
         color=0x3498db,
         timestamp=datetime.datetime.utcnow()
     )
-    embed.add_field(name="Modell", value=model, inline=True)
-    embed.add_field(name="Frequenz", value=f"{freq} MHz", inline=True)
-    embed.add_field(name="Spannung", value=f"Aktuell: {voltage_actual:.2f} V | Soll: {voltage_set:.2f} V", inline=False)
-    embed.set_footer(text="Chip-Daten abgerufen.")
-    await ctx.send(embed=embed)
+    embed.add_field(name="Modell", value=show(data.asic_model), inline=True)
+    embed.add_field(name="Frequenz", value=f"{show(data.frequency, 'g')} MHz", inline=True)
+    embed.add_field(
+        name="Spannung",
+        value=f"Aktuell: {show(data.core_voltage_actual, '.2f')} V | Soll: {show(data.core_voltage, '.2f')} V",
+        inline=False
+    )
+    embed.set_footer(text=f"Chip-Daten abgerufen. · {format_age(age, stale)}")
+    await reply(ctx, embed=embed)
 
-@bot.command(help="Zeigt Stromverbrauch, Spannung und Stromstärke sowie minPower und maxPower")
+@bot.hybrid_command(help="Zeigt Stromverbrauch, Spannung und Stromstärke sowie minPower und maxPower")
 async def power(ctx):
-    data = fetch_bitaxe_data()
+    data, age, stale = await fleet.default.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
+        await reply(ctx, "❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
         return
 
-    power = data.get("power", "N/A")
-    voltage = float(data.get("voltage", "0")) / 1000.0
-    current = float(data.get("current", "0")) / 1000.0
-
     embed = discord.Embed(
         title="🔌 Power-Informationen",
         color=0x3498db,
         timestamp=datetime.datetime.utcnow()
     )
-    embed.add_field(name="Leistung", value=f"{power:.2f} W", inline=True)
-    embed.add_field(name="Spannung", value=f"{voltage:.2f} V", inline=True)
-    embed.add_field(name="Stromstärke", value=f"{current:.2f} A", inline=True)
-    embed.set_footer(text="Power-Daten abgerufen.")
-    await ctx.send(embed=embed)
+    embed.add_field(name="Leistung", value=f"{show(data.power, '.2f')} W", inline=True)
+    embed.add_field(name="Spannung", value=f"{show(data.voltage, '.2f')} V", inline=True)
+    embed.add_field(name="Stromstärke", value=f"{show(data.current, '.2f')} A", inline=True)
+    embed.set_footer(text=f"Power-Daten abgerufen. · {format_age(age, stale)}")
+    await reply(ctx, embed=embed)
 
-@bot.command(help="Zeigt Lüftergeschwindigkeit, RPM und Auto-Fan-Status")
+@bot.hybrid_command(help="Zeigt Lüftergeschwindigkeit, RPM und Auto-Fan-Status")
 async def fans(ctx):
-    data = fetch_bitaxe_data()
+    data, age, stale = await fleet.default.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
+        await reply(ctx, "❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
         return
-    fanspeed = data.get("fanspeed", "N/A")
-    fanrpm = data.get("fanrpm", "N/A")
-    if isinstance(fanrpm, (int, float)):
+    fanspeed = data.fan_speed
+    fanrpm = data.fan_rpm
+    if fanrpm is not None:
         if fanrpm >= 5000:
             rpm_icon = "🟢"
         elif fanrpm >= 3000:
@@ -420,9 +2869,8 @@ async def fans(ctx):
             rpm_icon = "🔴"
     else:
         rpm_icon = "❓"
-    autofanspeed = data.get("autofanspeed", None)
-    autofan_status = "✅ Auto-Fan aktiviert" if autofanspeed else "❌ Auto-Fan deaktiviert"
-    if isinstance(fanspeed, (int, float)):
+    autofan_status = "✅ Auto-Fan aktiviert" if data.auto_fan else "❌ Auto-Fan deaktiviert"
+    if fanspeed is not None:
         if fanspeed >= 80:
             fan_icon = "🟢"
         elif fanspeed >= 50:
@@ -431,71 +2879,66 @@ async def fans(ctx):
             fan_icon = "🔴"
     else:
         fan_icon = "❓"
-    await ctx.send(
-        f"🌀 Lüfter: {fan_icon} {fanspeed}% ({rpm_icon} {fanrpm} RPM)\n"
-        f"{autofan_status}"
+    await reply(ctx, 
+        f"🌀 Lüfter: {fan_icon} {show(fanspeed, 'g')}% ({rpm_icon} {show(fanrpm)} RPM)\n"
+        f"{autofan_status}\n"
+        f"🕒 {format_age(age, stale)}"
     )
 
-@bot.command(help="Zeigt WLAN-Status, SSID und IP-Adresse")
+@bot.hybrid_command(help="Zeigt WLAN-Status, SSID und IP-Adresse")
 async def wifi(ctx):
-    data = fetch_bitaxe_data()
+    data, age, stale = await fleet.default.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
+        await reply(ctx, "❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
         return
-    ssid = data.get("ssid", "N/A")
-    ip = data.get("hostip", "N/A")
-    wifi_status = data.get("wifiStatus", "N/A")
-    await ctx.send(f"📡 WLAN: {ssid} | IP: {ip} | Status: {wifi_status}")
+    await reply(ctx, f"📡 WLAN: {show(data.ssid)} | IP: {show(data.host_ip)} | Status: {show(data.wifi_status)}\n🕒 {format_age(age, stale)}")
 
-@bot.command(help="Zeigt Firmware-Version, Partition und Reset-Grund")
+@bot.hybrid_command(help="Zeigt Firmware-Version, Partition und Reset-Grund")
 async def version(ctx):
-    data = fetch_bitaxe_data()
+    data, age, stale = await fleet.default.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
-        return
-    version = data.get("version", "N/A")
-    partition = data.get("runningPartition", "N/A")
-    reset_reason = data.get("lastResetReason", "N/A")
-    await ctx.send(
-        f"🧱 Firmware: {version} | Partition: {partition}\n"
-        f"🔁 Letzter Reset: {reset_reason}"
+        await reply(ctx, "❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
+        return
+    await reply(ctx, 
+        f"🧱 Firmware: {show(data.version)} | Partition: {show(data.running_partition)}\n"
+        f"🔁 Letzter Reset: {show(data.reset_reason)}\n"
+        f"🕒 {format_age(age, stale)}"
     )
 
-@bot.command(help="Zeigt alle verfügbaren Befehle sortiert nach Kategorien")
+@bot.hybrid_command(help="Zeigt alle verfügbaren Befehle sortiert nach Kategorien")
 async def help(ctx):
-    categories = {
-        "🟢 Status": ["status", "hashrate", "temp", "uptime"],
-        "🔧 System": ["chip", "power", "fans", "version"],
-        "🌐 Netzwerk": ["wifi"],
-        "📋 Übersicht": ["info", "best", "stratum"]
-    }
-    help_text = "📘 **Hilfe – Verfügbare Befehle:**\n\n"
-    for category, commands_list in categories.items():
-        help_text += f"{category}:\n"
-        for name in commands_list:
-            command = bot.get_command(name)
-            if command and not command.hidden:
-                help_text += f"  🔹 `!{command.name}` – {command.help or 'Keine Beschreibung'}\n"
-        help_text += "\n"
-    await ctx.send(help_text)
-
-@bot.command(help="Zeigt Stratum- und Fallback-Stratum-Informationen")
-async def stratum(ctx):
-    data = fetch_bitaxe_data()
+    await reply(ctx, "📘 **Hilfe – Verfügbare Befehle:**\n\n" + help_command_lines())
+
+# Gemessene Latenz und Verfügbarkeit eines Pools aus dem Stratum-Prober (falls aktiv)
+def stratum_probe_line(url, port):
+    endpoint = stratum_endpoint(url, port)
+    if stratum_prober is None or endpoint is None:
+        return ""
+    return f"• Messung: {stratum_prober.summary(endpoint)}\n"
+
+@bot.hybrid_command(help="Zeigt Stratum- und Fallback-Stratum-Informationen inkl. gemessener Pool-Latenz. Optional: Miner-Name")
+@app_commands.describe(miner="Miner-Name")
+@app_commands.autocomplete(miner=miner_autocomplete)
+async def stratum(ctx, miner: str = None):
+    target = resolve_miner(miner)
+    if target is None:
+        await reply(ctx, unknown_miner_text(miner))
+        return
+    data, age, stale = await target.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler beim Abrufen der Stratum-Daten.")
+        await reply(ctx, "❌ Fehler beim Abrufen der Stratum-Daten.")
         return
 
     # Primäre Stratum-Daten
-    url = data.get("stratumURL", "N/A")
-    port = data.get("stratumPort", "N/A")
-    user = data.get("stratumUser", "N/A")
+    url = show(data.stratum_url)
+    port = show(data.stratum_port)
+    user = show(data.stratum_user)
 
     # Fallback-Daten
-    fallback = data.get("isUsingFallbackStratum", False)
-    fallback_url = data.get("fallbackStratumURL", "N/A")
-    fallback_port = data.get("fallbackStratumPort", "N/A")
-    fallback_user = data.get("fallbackStratumUser", "N/A")
+    fallback = data.using_fallback
+    fallback_url = show(data.fallback_url)
+    fallback_port = show(data.fallback_port)
+    fallback_user = show(data.fallback_user)
     fallback_status = "✅ Aktiv" if fallback else "❌ Nicht aktiv"
 
     # Allgemeine Kennzeichnung, welcher Stratum aktuell aktiv ist
@@ -507,51 +2950,36 @@ async def stratum(ctx):
         f"🔹 **Primärer Stratum:**\n"
         f"• URL: `{url}`\n"
         f"• Port: `{port}`\n"
-        f"• User: `{user}`\n\n"
+        f"• User: `{user}`\n"
+        f"{stratum_probe_line(data.stratum_url, data.stratum_port)}\n"
         f"🔄 **Fallback-Stratum:**\n"
         f"• URL: `{fallback_url}`\n"
         f"• Port: `{fallback_port}`\n"
         f"• User: `{fallback_user}`\n"
-        f"• Fallback aktiv: {fallback_status}"
+        f"• Fallback aktiv: {fallback_status}\n"
+        f"{stratum_probe_line(data.fallback_url, data.fallback_port)}\n"
+        f"🕒 {format_age(age, stale)}"
     )
-    await ctx.send(message)
+    await reply(ctx, message)
 
-@bot.command(help="Zeigt die höchste jemals erreichte Difficulty, den aktuellen Session-Bestwert und eine Historie der Best Difficulties.")
-async def best(ctx):
-    data = fetch_bitaxe_data()
+@bot.hybrid_command(help="Zeigt die höchste jemals erreichte Difficulty, den aktuellen Session-Bestwert und eine Historie der Best Difficulties. Optional: Miner-Name")
+@app_commands.describe(miner=MINER_PARAM)
+@app_commands.autocomplete(miner=miner_autocomplete)
+async def best(ctx, miner: str = None):
+    target = resolve_miner(miner)
+    if target is None:
+        await reply(ctx, unknown_miner_text(miner))
+        return
+    data, age, stale = await target.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
+        await reply(ctx, "❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
         return
 
-    best_diff = data.get("bestDiff", "N/A")
-    session_best = data.get("bestSessionDiff", "N/A")
-
-    # Historie laden
-    history = load_history()
-
-    def parse_value(raw):
-        """
-        Konvertiert einen Wert wie "567M" oder "1234" in einen float.
-        Unterstützt Suffixe: M (Millionen) und K (Tausend).
-        """
-        try:
-            raw_str = str(raw).strip()
-            multiplier = 1.0
-            if raw_str.endswith("M"):
-                multiplier = 1e6
-                raw_str = raw_str[:-1]
-            elif raw_str.endswith("K"):
-                multiplier = 1e3
-                raw_str = raw_str[:-1]
-            return float(raw_str) * multiplier
-        except Exception:
-            return None
-
-    numeric_best = parse_value(best_diff)
-    numeric_session_best = parse_value(session_best)
+    numeric_best = data.best_diff
+    numeric_session_best = data.best_session_diff
 
     # Höchste jemals erreichte Difficulty berechnen
-    highest_all_time = max([rec.get("best", 0) for rec in history] + [numeric_best or 0])
+    highest_all_time = max(best_journal.max(target.name) or 0, numeric_best or 0)
 
     # Historie formatieren
     def format_number(num):
@@ -559,28 +2987,18 @@ async def best(ctx):
         Gibt den vollständigen Wert sowie die gekürzte Version zurück.
         Beispiel: 1234567 -> "1,234,567" und "1.23M"
         """
-        full = f"{num:,.0f}"
-        if num >= 1e6:
-            abbr = f"{num / 1e6:.2f}M"
-        elif num >= 1e3:
-            abbr = f"{num / 1e3:.2f}K"
-        else:
-            abbr = f"{num:.2f}"
-        return full, abbr
+        return f"{num:,.0f}", format_difficulty(num)
 
     full_highest, abbr_highest = format_number(highest_all_time)
     full_session, abbr_session = format_number(numeric_session_best or 0)
     full_best, abbr_best = format_number(numeric_best or 0)
 
-    sorted_history = sorted(history, key=lambda rec: rec.get("best", 0), reverse=True)
     history_lines = []
-    for rec in sorted_history[:10]:  # Zeige die letzten 10 Einträge
-        ts = rec.get("timestamp", "Unbekannt")
+    for best_val, ts in best_journal.top(target.name, 10):  # Zeige die besten 10 Einträge
         try:
             ts_formatted = datetime.datetime.fromisoformat(ts).strftime("%Y-%m-%d %H:%M:%S")
         except Exception:
             ts_formatted = ts
-        best_val = rec.get("best", "N/A")
         full_val, abbr_val = format_number(best_val) if isinstance(best_val, (int, float)) else ("N/A", "N/A")
         history_lines.append(f"{ts_formatted} - {full_val} ({abbr_val})")
 
@@ -599,20 +3017,36 @@ async def best(ctx):
     embed.set_thumbnail(url="https://cdn.discordapp.com/emojis/810040487168608808.png")
 
     # Footer mit Hinweis
-    embed.set_footer(text="Best Difficulty Übersicht – Daten werden regelmäßig aktualisiert.")
+    embed.set_footer(text=f"Best Difficulty Übersicht – Daten werden regelmäßig aktualisiert. · {format_age(age, stale)}")
     
-    await ctx.send(embed=embed)
+    await reply(ctx, embed=embed)
+
+@bot.hybrid_command(help="Zeigt eine kompakte Zusammenfassung wichtiger Werte. Optional: Miner-Name oder tag:<tag>")
+@app_commands.describe(miner=MINER_PARAM)
+@app_commands.autocomplete(miner=miner_autocomplete)
+async def info(ctx, miner: str = None):
+    if wants_fleet_view(miner):
+        selected = fleet.select(miner)
+        if not selected:
+            await reply(ctx, unknown_miner_text(miner))
+            return
+        # Als Embed wie bei !status: 40 Zeilen passen nicht in eine Textnachricht (2000 Zeichen)
+        results = await fleet.sweep(selected)
+        await reply(ctx, embed=generate_fleet_embed(results, title=f"📄 Info Fleet ({len(selected)} Miner)"))
+        return
 
-@bot.command(help="Zeigt eine kompakte Zusammenfassung wichtiger Werte")
-async def info(ctx):
-    data = fetch_bitaxe_data()
+    target = resolve_miner(miner)
+    if target is None:
+        await reply(ctx, unknown_miner_text(miner))
+        return
+    data, age, stale = await target.cache.latest()
     if not data:
-        await ctx.send("❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
+        await reply(ctx, "❌ Fehler: Keine gültige Antwort von der Bitaxe API.")
         return
 
-    temp = data.get("temp", "N/A")
-    hr = data.get("hashRate", 0)
-    if isinstance(temp, (int, float)):
+    temp = data.temp
+    hr = data.hashrate
+    if temp is not None:
         if temp >= 60:
             temp_icon = "🔴"
         elif temp >= 55:
@@ -622,18 +3056,18 @@ async def info(ctx):
     else:
         temp_icon = "❓"
 
-    if isinstance(hr, (int, float)):
-        if hr >= 400:
+    if hr is not None:
+        if hr >= HASHRATE_OK:
             hr_icon = "🟢"
-        elif hr >= 350:
+        elif hr >= HASHRATE_LOW:
             hr_icon = "🟡"
         else:
             hr_icon = "🔴"
     else:
         hr_icon = "❓"
     
-    fanrpm = data.get("fanrpm", "N/A")
-    if isinstance(fanrpm, (int, float)):
+    fanrpm = data.fan_rpm
+    if fanrpm is not None:
         if fanrpm >= 5000:
             rpm_icon = "🟢"
         elif fanrpm >= 3000:
@@ -645,35 +3079,326 @@ async def info(ctx):
 
     msg = (
         f"📄 **Info NerdAxe**\n"
-        f"Modell: {data.get('deviceModel')} ({data.get('ASICModel')})\n"
-        f"Temp: {temp_icon} {temp}°C | HR: {hr_icon} {hr:.2f} MH/s\n"
-        f"Lüfter: {rpm_icon} {fanrpm} RPM\n"
-        f"IP: {data.get('hostip')} | WLAN: {data.get('ssid')}\n"
-        f"Uptime: {str(datetime.timedelta(seconds=int(data.get('uptimeSeconds', 0))))}"
+        f"Modell: {data.device_model} ({data.asic_model})\n"
+        f"Temp: {temp_icon} {show(temp)}°C | HR: {hr_icon} {show(hr, '.2f')} {HASHRATE_UNIT}\n"
+        f"Lüfter: {rpm_icon} {show(fanrpm)} RPM\n"
+        f"IP: {data.host_ip} | WLAN: {data.ssid}\n"
+        f"Uptime: {datetime.timedelta(seconds=data.uptime or 0)}\n"
+        f"🕒 {format_age(age, stale)}"
+    )
+    await reply(ctx, msg)
+
+# Diagramme: Metrik -> (Spalten in der Historie, Titel, Einheit)
+CHART_METRICS = {
+    "hashrate": (("hashrate",), "Hashrate", HASHRATE_UNIT),
+    "temp": (("temp", "vr_temp"), "Temperatur", "°C"),
+    "power": (("power",), "Leistung", "W"),
+    "efficiency": (("power", "hashrate"), "Effizienz", "J/TH"),
+}
+CHART_ALIASES = {"temperature": "temp", "temperatur": "temp", "leistung": "power", "effizienz": "efficiency", "hr": "hashrate"}
+CHART_POINTS = int(config['settings'].get('chart_points', 500))
+
+def lttb(points, threshold):
+    """
+    Largest-Triangle-Three-Buckets: reduziert [(x, y), ...] auf threshold Punkte
+    und erhält dabei Spitzen und Form der Kurve.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return points
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Durchschnitt des nächsten Buckets als dritter Dreieckspunkt
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        next_bucket = points[next_start:next_end] or [points[-1]]
+        avg_x = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[1] for p in next_bucket) / len(next_bucket)
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = points[a]
+        best_area = -1.0
+        best_index = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (points[j][1] - ay) - (ax - points[j][0]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best_index = j
+        sampled.append(points[best_index])
+        a = best_index
+    sampled.append(points[-1])
+    return sampled
+
+def render_chart(series, title, unit, max_points):
+    """
+    Läuft im Worker-Prozess: reduziert jede Serie per LTTB und rendert ein PNG.
+    series ist {Bezeichnung: [(ts, wert), ...]}.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+
+    fig, ax = plt.subplots(figsize=(8, 3.5), dpi=100)
+    for label, points in series.items():
+        points = lttb(points, max_points)
+        if not points:
+            continue
+        ax.plot([datetime.datetime.fromtimestamp(ts) for ts, _ in points], [v for _, v in points], label=label, linewidth=1.2)
+    ax.set_title(title)
+    ax.set_ylabel(unit)
+    ax.grid(True, alpha=0.3)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(ax.xaxis.get_major_locator()))
+    if len(series) > 1:
+        ax.legend(loc="upper left")
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    plt.close(fig)
+    return buffer.getvalue()
+
+class ChartRenderer:
+    """
+    Rendert Diagramme in einem Prozess-Pool und hält fertige PNGs in einem
+    kleinen LRU-Cache, Schlüssel: (Miner, Metrik, Zeitraum, letzte Sample-ID).
+    """
+    def __init__(self, workers=1, cache_size=32):
+        self.workers = workers
+        self.cache_size = cache_size
+        self.pool = None
+        self._cache = collections.OrderedDict()
+        self._pending = {}
+
+    def is_cached(self, key):
+        return key in self._cache
+
+    async def render(self, key, series, title, unit):
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        # Gleiche Anfrage läuft bereits: auf dasselbe Ergebnis warten
+        if key in self._pending:
+            return await asyncio.shield(self._pending[key])
+        if self.pool is None:
+            self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, render_chart, series, title, unit, CHART_POINTS)
+        self._pending[key] = future
+        try:
+            png = await asyncio.shield(future)
+        finally:
+            self._pending.pop(key, None)
+        self._cache[key] = png
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return png
+
+chart_renderer = ChartRenderer(int(config['settings'].get('chart_workers', 1)))
+
+@bot.hybrid_command(help="Zeichnet den Verlauf von hashrate, temp, power oder efficiency. Beispiel: !chart temp 6h [miner]")
+@app_commands.describe(metric="hashrate, temp, power oder efficiency", period="Zeitraum, z. B. 6h oder 7d", miner="Miner-Name")
+@app_commands.autocomplete(metric=metric_autocomplete, period=period_autocomplete, miner=miner_autocomplete)
+async def chart(ctx, metric: str = "hashrate", period: str = "24h", miner: str = None):
+    metric = CHART_ALIASES.get(metric.lower(), metric.lower())
+    if metric not in CHART_METRICS:
+        await reply(ctx, f"❌ Unbekannte Metrik `{metric}`. Verfügbar: {', '.join(CHART_METRICS)}")
+        return
+    seconds = parse_duration(period)
+    if not seconds or seconds <= 0:
+        await reply(ctx, f"❌ Ungültiger Zeitraum `{period}`. Beispiele: 30m, 6h, 7d")
+        return
+    if sample_store is None:
+        await reply(ctx, "❌ Die Historie ist deaktiviert ([history] enabled = false).")
+        return
+    target = resolve_miner(miner)
+    if target is None:
+        await reply(ctx, unknown_miner_text(miner))
+        return
+
+    columns, title, unit = CHART_METRICS[metric]
+    # Lange Zeiträume aus der gröbsten Rollup-Stufe, die noch genug Punkte liefert
+    since = time.time() - seconds
+    resolution = seconds / CHART_POINTS
+    key = (target.name, metric, period.lower(), sample_store.last_id(target.name))
+    if not chart_renderer.is_cached(key):
+        rows = await sample_store.query(target.name, since, metrics=columns, resolution=resolution)
+        if metric == "efficiency":
+            series = {"J/TH": [(ts, joules_per_terahash(power, hr)) for ts, power, hr in rows if power is not None and hr]}
+        else:
+            series = {
+                column: [(row[0], row[i + 1]) for row in rows if row[i + 1] is not None]
+                for i, column in enumerate(columns)
+            }
+        if not any(series.values()):
+            await reply(ctx, f"📉 Keine Daten für `{metric}` in den letzten {period}.")
+            return
+    else:
+        series = None
+    png = await chart_renderer.render(key, series, f"{title} – {target.name} ({period})", unit)
+
+    embed = discord.Embed(
+        title=f"📈 {title} – letzte {period}",
+        color=0x3498db,
+        timestamp=datetime.datetime.utcnow()
+    )
+    embed.set_image(url="attachment://chart.png")
+    embed.set_footer(text=f"Miner: {target.name} · Quelle: {sample_store.source_label(since, resolution)}")
+    await reply(ctx, embed=embed, file=discord.File(io.BytesIO(png), filename="chart.png"))
+
+# Längere Fenster als STATS_WINDOWS kommen aus der Historie, mit etwa so vielen Buckets
+STATS_HISTORY_POINTS = 1000
+
+def stats_field_value(summary, unit):
+    return (
+        f"Ø {summary['mean']:.2f} {unit} (σ {summary['std']:.2f})\n"
+        f"Min {summary['min']:.2f} | Max {summary['max']:.2f}\n"
+        f"p50 {summary['p50']:.2f} | p95 {summary['p95']:.2f}"
+    )
+
+@bot.hybrid_command(help="Zeigt Mittelwert, Min/Max, Streuung und Perzentile der letzten 1m, 15m, 1h oder 24h – längere Zeiträume (z. B. 7d, 90d) aus der Historie. Beispiel: !stats 1h [miner]")
+@app_commands.describe(window="1m, 15m, 1h, 24h oder ein längerer Zeitraum wie 7d", miner="Miner-Name")
+@app_commands.autocomplete(window=window_autocomplete, miner=miner_autocomplete)
+async def stats(ctx, window: str = "1h", miner: str = None):
+    window = window.lower()
+    seconds = None
+    if window not in STATS_WINDOWS:
+        seconds = parse_duration(window)
+        if not seconds or seconds <= 0 or sample_store is None:
+            await reply(ctx, f"❌ Unbekanntes Fenster `{window}`. Verfügbar: {', '.join(STATS_WINDOWS)}"
+                             + (" oder ein Zeitraum wie 7d aus der Historie" if sample_store is not None else ""))
+            return
+    target = resolve_miner(miner)
+    if target is None:
+        await reply(ctx, unknown_miner_text(miner))
+        return
+
+    embed = discord.Embed(
+        title=f"📊 Statistik – letzte {window}",
+        color=0x3498db,
+        timestamp=datetime.datetime.utcnow()
+    )
+    now = time.time()
+    footer = f"Miner: {target.name}"
+    if seconds is None:
+        for metric, (label, unit) in STATS_METRICS.items():
+            summary = stats_engine.summary(target.name, metric, window, now)
+            if summary is None:
+                continue
+            embed.add_field(name=label, value=stats_field_value(summary, unit), inline=True)
+        shares = stats_engine.acceptance(target.name, window, now)
+        if shares is not None:
+            accepted, rejected, rate = shares
+            rate_str = f"{rate:.2f} %" if rate is not None else "N/A"
+            embed.add_field(name="📈 Shares", value=f"✅ {accepted} / ❌ {rejected}\nAkzeptanz: {rate_str}", inline=True)
+    else:
+        since = now - seconds
+        resolution = seconds / STATS_HISTORY_POINTS
+        columns = {metric: SAMPLE_ATTR_COLUMNS[metric] for metric in STATS_METRICS}
+        summaries = await sample_store.summarize(target.name, since, metrics=list(columns.values()), resolution=resolution)
+        for metric, (label, unit) in STATS_METRICS.items():
+            summary = summaries.get(columns[metric])
+            if summary is not None:
+                embed.add_field(name=label, value=stats_field_value(summary, unit), inline=True)
+        footer += f" · Quelle: {sample_store.source_label(since, resolution)}"
+    if not embed.fields:
+        embed.description = "Noch keine Daten in diesem Zeitraum."
+    embed.set_footer(text=footer)
+    await reply(ctx, embed=embed)
+
+@bot.hybrid_command(help="Zeigt den Rückstau der Ausgangs-Queue: Tiefe, gesendete Nachrichten und Wartezeiten")
+async def queue(ctx):
+    stats = outbound.stats()
+    lines = [
+        f"📬 **Ausgangs-Queue**",
+        f"Wartend: {stats['depth']} | Gesendet: {stats['sent']} | Fehler: {stats['failed']}",
+        f"Zusammengefasste Edits: {stats['coalesced']} | Gebündelte Alerts: {stats['batched']}",
+    ]
+    for name, (avg_wait, max_wait) in stats["waits"].items():
+        lines.append(f"⏳ {name}: Ø {avg_wait * 1000:.0f} ms | max {max_wait * 1000:.0f} ms")
+    await reply(ctx, "\n".join(lines))
+
+PERF_SECTIONS = [
+    ("fetch", "🌐 API-Abfragen"),
+    ("commands", "⌨️ Befehle (bis zur Antwort)"),
+    ("discord_send", "📤 Discord senden"),
+    ("discord_edit", "✏️ Discord bearbeiten"),
+    ("loop_lag", "🔁 Event-Loop-Verzögerung"),
+]
+
+@bot.hybrid_command(name="perf", help="Zeigt interne Latenzen: API-Abfragen, Befehle, Discord-Aufrufe und Event-Loop")
+async def perf_command(ctx):
+    registry = perf
+    counters = registry.counters
+    uptime = datetime.timedelta(seconds=int(time.monotonic() - registry.started))
+    lines = [f"⏱️ **Interne Latenzen** (seit {uptime})"]
+    for name, label in PERF_SECTIONS:
+        lines.append(f"{label}: {registry.format(name)}")
+    lines.append(
+        f"📊 Abfragen: ✅ {counters['fetch_success']} | ⌛ {counters['fetch_timeout']} | ❌ {counters['fetch_error']}"
+        f" | Discord-Fehler: {counters['discord_errors']}"
+    )
+    slowest = sorted(
+        (
+            (registry.histograms[key].percentile(0.95), key.split(":", 1)[1])
+            for key in registry.histograms if key.startswith("command:")
+        ),
+        reverse=True
+    )[:3]
+    if scheduler.ready_at is not None:
+        lines.append(f"🚀 Start bis zur ersten Abfrage: {scheduler.ready_at - STARTED_AT:.2f} s")
+    if poller_pool is not None:
+        alive = sum(1 for worker in poller_pool.workers if worker.ready.is_set())
+        lines.append(
+            f"🧵 Poller-Worker: {alive}/{len(poller_pool.workers)} aktiv | Neustarts: {poller_pool.restarts}"
+            f" | Miner je Worker: {', '.join(map(str, poller_pool.shard_sizes()))}"
+        )
+    if slowest:
+        lines.append("🐢 Langsamste Befehle (p95): " + ", ".join(f"`{COMMAND_SIGIL}{name}` {p95 * 1000:.0f} ms" for p95, name in slowest))
+    if log_streams is not None:
+        streams = log_streams.streams.values()
+        lines.append(
+            f"📡 Log-Streams: {sum(1 for stream in streams if stream.connected)}/{len(streams)} verbunden"
+            f" | Shares: {counters['stream_share']} | Neu verbunden: {counters['stream_reconnects']}"
+        )
+    if stratum_prober is not None:
+        lines.append(
+            f"🌐 Stratum-Prober: {len(stratum_prober.pools)} Pools, {stratum_prober.rounds} Runden"
+            f" | Proben ok/fehlgeschlagen: {counters['stratum_probe_ok']}/{counters['stratum_probe_failed']}"
+            f" | gestört: {sum(1 for stats in stratum_prober.pools.values() if stats.alerted)}"
+        )
+    if SLASH_COMMANDS:
+        lines.append(f"⚡ Slash-Befehle zurückgestellt (Abfrage nötig): {counters['slash_deferred']}")
+    await reply(ctx, "\n".join(lines))
+
+# Kurze Latenz-Zusammenfassung in der Konsole, höchstens alle perf_log_interval_sec
+async def log_perf(polled):
+    print(
+        f"{Fore.CYAN}⏱️ Abfragen {perf.format('fetch')} | Befehle {perf.format('commands')} | "
+        f"Loop {perf.format('loop_lag')}{Style.RESET_ALL}"
     )
-    await ctx.send(msg)
 
-async def log_to_console():
-    await asyncio.sleep(1)
+# Konsolen-Ausgabe, wird vom Scheduler höchstens alle console_interval_sec mit den
+# seitdem abgefragten Minern aufgerufen
+async def log_to_console(polled):
     # Lese die Zeitzone aus der Konfigurationsdatei, Standard: Europe/Berlin
     timezone_str = config['settings'].get('timezone', 'Europe/Berlin')
-    while True:
-        data = fetch_bitaxe_data()
+    for miner, data in polled:
+        prefix = f"[{miner.name}] " if len(fleet.miners) > 1 else ""
         if data:
-            temp = data.get("temp", "N/A")
-            hr = data.get("hashRate", "N/A")
-            uptime_sec = int(data.get("uptimeSeconds", 0))
-            uptime = str(datetime.timedelta(seconds=uptime_sec))
-            best = data.get("bestDiff", "N/A")
-            stratum = data.get("stratumURL", "N/A")
+            temp = data.temp
+            hr = data.hashrate
+            uptime = str(datetime.timedelta(seconds=data.uptime or 0))
             now = datetime.datetime.now(ZoneInfo(timezone_str)).strftime('%Y-%m-%d %H:%M:%S')
 
             # Bestimme Farbe und Emoji für die Hashrate
-            if isinstance(hr, (int, float)):
-                if hr >= 400:
+            if hr is not None:
+                if hr >= HASHRATE_OK:
                     hr_color = Fore.GREEN
                     hr_emoji = "💪"
-                elif hr >= 350:
+                elif hr >= HASHRATE_LOW:
                     hr_color = Fore.YELLOW
                     hr_emoji = "⚡"
                 else:
@@ -684,15 +3409,11 @@ async def log_to_console():
                 hr_emoji = "❓"
 
             # Bestimme Farbe und Emoji für die Temperatur
-            try:
-                temp_float = float(temp)
-            except Exception:
-                temp_float = None
-            if temp_float is not None:
-                if temp_float >= 60:
+            if temp is not None:
+                if temp >= 60:
                     temp_color = Fore.RED
                     temp_emoji = "🔥"
-                elif temp_float >= 55:
+                elif temp >= 55:
                     temp_color = Fore.YELLOW
                     temp_emoji = "⚠️"
                 else:
@@ -703,96 +3424,1548 @@ async def log_to_console():
                 temp_emoji = ""
 
             print(
-                f"{Fore.BLUE}{now} [STATUS]{Style.RESET_ALL} "
-                f"Temp: {temp_color}{temp_emoji} {temp}°C{Style.RESET_ALL} | "
-                f"{hr_color}{hr_emoji} Hashrate: {hr} MH/s{Style.RESET_ALL} | "
-                f"Uptime: {uptime} | BestDiff: {best} | Stratum: {stratum}"
+                f"{Fore.BLUE}{now} [STATUS]{Style.RESET_ALL} {prefix}"
+                f"Temp: {temp_color}{temp_emoji} {show(temp)}°C{Style.RESET_ALL} | "
+                f"{hr_color}{hr_emoji} Hashrate: {show(hr)} {HASHRATE_UNIT}{Style.RESET_ALL} | "
+                f"Uptime: {uptime} | BestDiff: {show(data.best_diff)} | Stratum: {show(data.stratum_url)}"
             )
         else:
-            print(f"{Fore.RED}[STATUS] 🚫 Keine Verbindung zur Bitaxe API.{Style.RESET_ALL}")
-        
-        await asyncio.sleep(int(config['settings'].get('console_interval_sec', 30)))
+            print(f"{Fore.RED}[STATUS] {prefix}🚫 Keine Verbindung zur Bitaxe API.{Style.RESET_ALL}")
 
-async def monitor_changes():
-    # Starte den Konsolen-Logging-Task (läuft im Hintergrund)
-    bot.loop.create_task(log_to_console())
-    
-    await bot.wait_until_ready()
+# Regel-Engine für Benachrichtigungen. Regeln kommen aus [rule:<name>]-Abschnitten
+# der config.ini (ohne solche Abschnitte gelten DEFAULT_RULES) und werden pro Miner
+# bei jedem neuen Sample inkrementell ausgewertet.
+#
+# type = threshold  aktueller Wert von field
+#        average    gleitender Mittelwert über window_sec
+#        rate       Änderung pro Minute über window_sec
+#        count      wie viele der letzten m Samples "op value" erfüllen (Alarm ab n)
+#        change     jede Änderung des Werts (z. B. neue Best Difficulty)
+# clear     Hysterese-Schwelle für die Entwarnung (Standard: Bedingung nicht mehr erfüllt)
+# debounce  so viele Samples in Folge muss die Bedingung gelten (Standard 1)
+# cooldown_sec  Mindestabstand zwischen zwei Alarmen derselben Regel
+# field ist ein Feld aus /api/system/info (oder ein Snapshot-Attribut), Spannungen und
+# Ströme in V/A. Das Pseudo-Feld "_online" ist 1, wenn der Miner geantwortet hat, sonst 0.
+DEFAULT_RULES = {
+    "best_diff": {
+        "field": "bestDiff", "type": "change",
+        "message": "🎉 {prefix}**Neue Best Difficulty erreicht:** {value}",
+    },
+    "fallback": {
+        "field": "isUsingFallbackStratum", "type": "threshold", "op": "==", "value": "1",
+        "message": "⚠️ {prefix}**Achtung:** Der Miner verwendet derzeit den Fallback-Stratum!",
+    },
+    "unreachable": {
+        "field": "_online", "type": "threshold", "op": "==", "value": "0",
+        "message": "🚫 {prefix}**Bitaxe API nicht erreichbar!** Bitte Verbindung prüfen.",
+        "clear_message": "✅ {prefix}**Bitaxe wieder online!** Die API antwortet wieder.",
+    },
+    "hashrate_low": {
+        "field": "hashRate", "type": "threshold", "op": "<", "value": str(HASHRATE_LOW), "clear": str(HASHRATE_OK),
+        "message": "⚠️ {prefix}**Warnung:** Die Hashrate ist niedrig: {value:.2f} " + HASHRATE_UNIT + "!",
+        "clear_message": "✅ {prefix}**Entwarnung:** Hashrate wieder stabil bei {value:.2f} " + HASHRATE_UNIT + ".",
+    },
+}
+
+RULE_OPS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+}
+# Gegenrichtung für die Hysterese: Alarm bei "< 350" wird bei ">= clear" aufgehoben
+RULE_CLEAR_OPS = {"<": ">=", "<=": ">", ">": "<=", ">=": "<", "==": "!=", "!=": "=="}
+# Abstand (relativ zur Schwelle), ab dem ein Wert als "nahe am Alarm" gilt
+RULE_NEAR_MARGIN = 0.05
+
+class Rule:
+    __slots__ = ("name", "field", "type", "op", "value", "clear", "n", "m",
+                 "window", "debounce", "cooldown", "message", "clear_message")
+
+    def __init__(self, name, options):
+        self.name = name
+        self.field = options["field"]
+        self.type = options.get("type", "threshold")
+        if self.type not in ("threshold", "average", "rate", "count", "change"):
+            raise ValueError(f"Regel {name}: unbekannter Typ {self.type}")
+        self.op = options.get("op", ">")
+        if self.op not in RULE_OPS:
+            raise ValueError(f"Regel {name}: unbekannter Operator {self.op}")
+        self.value = float(options["value"]) if "value" in options else None
+        # Nur change kommt ohne Schwelle aus; count vergleicht jedes Sample mit value
+        if self.value is None and self.type != "change":
+            raise ValueError(f"Regel {name}: value fehlt")
+        self.clear = float(options["clear"]) if "clear" in options else None
+        self.n = int(options.get("n", 1))
+        self.m = int(options.get("m", self.n))
+        self.window = float(options.get("window_sec", 300))
+        self.debounce = int(options.get("debounce", 1))
+        self.cooldown = float(options.get("cooldown_sec", 0))
+        self.message = options.get("message", f"⚠️ {{prefix}}**{name}**: {self.field} = {{value}}")
+        self.clear_message = options.get("clear_message")
+
+# Zustand einer Regel für einen Miner – bewusst klein gehalten
+class RuleState:
+    __slots__ = ("active", "streak", "last_fired", "previous", "bits", "hits", "samples", "total")
+    # Zeitstempel (last_fired, samples) sind Wanduhrzeit und überstehen damit einen Neustart
+
+    def __init__(self):
+        self.active = False
+        self.streak = 0
+        self.last_fired = None
+        self.previous = None
+        self.bits = 0      # count: letzte m Ergebnisse als Bitmaske
+        self.hits = 0      # count: gesetzte Bits in der Maske
+        self.samples = None  # average/rate: deque aus (ts, wert)
+        self.total = 0.0     # average: laufende Summe des Fensters
+
+def snapshot_value(data, field):
+    if field == "_online":
+        return 1.0 if data else 0.0
+    if not data:
+        return None
+    value = data.get(field)
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    return value
+
+class RuleEngine:
+    def __init__(self, rules, source=None):
+        self.rules = rules
+        self._states = {}     # Miner -> [RuleState je Regel]
+        self._attention = {}  # Miner -> ist ein Alarm aktiv oder ein Wert nahe an einer Schwelle?
+        self._source = source  # eigene Fleet (Replay), sonst die des Bots
+
+    @property
+    def fleet(self):
+        return fleet if self._source is None else self._source
+
+    def needs_attention(self, miner):
+        return self._attention.get(miner, False)
+
+    def forget(self, miner):
+        self._states.pop(miner, None)
+        self._attention.pop(miner, None)
+
+    def export(self):
+        return {
+            miner: {
+                rule.name: {
+                    slot: list(getattr(state, slot)) if slot == "samples" and state.samples is not None else getattr(state, slot)
+                    for slot in RuleState.__slots__
+                }
+                for rule, state in zip(self.rules, states)
+            }
+            for miner, states in self._states.items()
+        }
+
+    def restore(self, saved):
+        """Alarmzustände von vor dem Neustart übernehmen – nach Regelname, damit geänderte Regeln neu beginnen."""
+        for miner, rules in saved.items():
+            states = self._states[miner] = [RuleState() for _ in self.rules]
+            for rule, state in zip(self.rules, states):
+                entry = rules.get(rule.name)
+                if not entry:
+                    continue
+                for slot in RuleState.__slots__:
+                    if slot in entry:
+                        setattr(state, slot, entry[slot])
+                if state.samples is not None:
+                    state.samples = collections.deque(tuple(sample) for sample in state.samples)
+            self._attention[miner] = any(state.active for state in states)
+
+    def _metric(self, rule, state, value, ts):
+        """Berechnet den Wert, der mit der Schwelle verglichen wird, und pflegt das Fenster."""
+        if rule.type == "threshold":
+            return value
+        if rule.type == "count":
+            hit = 1 if RULE_OPS[rule.op](value, rule.value) else 0
+            dropped = (state.bits >> (rule.m - 1)) & 1
+            state.bits = ((state.bits << 1) | hit) & ((1 << rule.m) - 1)
+            state.hits += hit - dropped
+            return state.hits
+        # average und rate: Zeitfenster mit laufender Summe
+        if state.samples is None:
+            state.samples = collections.deque()
+        state.samples.append((ts, value))
+        state.total += value
+        while state.samples[0][0] < ts - rule.window:
+            state.total -= state.samples.popleft()[1]
+        if rule.type == "average":
+            return state.total / len(state.samples)
+        first_ts, first_value = state.samples[0]
+        if ts - first_ts <= 0:
+            return 0.0
+        return (value - first_value) / ((ts - first_ts) / 60.0)
+
+    def _triggered(self, rule, metric):
+        if rule.type == "count":
+            return metric >= rule.n
+        return RULE_OPS[rule.op](metric, rule.value)
+
+    def _cleared(self, rule, metric):
+        if rule.type == "count":
+            return metric <= rule.clear if rule.clear is not None else metric < rule.n
+        if rule.clear is None:
+            return not RULE_OPS[rule.op](metric, rule.value)
+        return RULE_OPS[RULE_CLEAR_OPS[rule.op]](metric, rule.clear)
+
+    def _near(self, rule, metric):
+        if rule.type in ("change", "count") or rule.value is None or rule.op in ("==", "!="):
+            return False
+        return abs(metric - rule.value) <= abs(rule.value) * RULE_NEAR_MARGIN
+
+    def evaluate(self, miner, data, ts=None):
+        """
+        Wertet alle Regeln für einen neuen Sample aus und gibt eine Liste von
+        (regel, text) für fällige Alarme und Entwarnungen zurück.
+        """
+        ts = time.time() if ts is None else ts
+        states = self._states.get(miner)
+        if states is None:
+            states = self._states[miner] = [RuleState() for _ in self.rules]
+        prefix = f"[{miner}] " if len(self.fleet.miners) > 1 else ""
+        messages = []
+        attention = False
+        for rule, state in zip(self.rules, states):
+            value = snapshot_value(data, rule.field)
+            if value is None:
+                continue
+
+            if rule.type == "change":
+                # Nur melden, wenn sich der Wert nach dem ersten Sample ändert
+                if state.previous is not None and value != state.previous:
+                    messages.append((rule, self._format(rule.message, prefix, miner, value, value)))
+                state.previous = value
+                continue
+
+            if not isinstance(value, (int, float)):
+                continue
+            metric = self._metric(rule, state, value, ts)
+
+            if not state.active:
+                state.streak = state.streak + 1 if self._triggered(rule, metric) else 0
+                cooled = state.last_fired is None or ts - state.last_fired >= rule.cooldown
+                if state.streak >= rule.debounce and cooled:
+                    state.active = True
+                    state.last_fired = ts
+                    messages.append((rule, self._format(rule.message, prefix, miner, value, metric)))
+            elif self._cleared(rule, metric):
+                state.active = False
+                state.streak = 0
+                if rule.clear_message:
+                    messages.append((rule, self._format(rule.clear_message, prefix, miner, value, metric)))
+            attention = attention or state.active or self._near(rule, metric)
+        self._attention[miner] = attention
+        return messages
+
+    @staticmethod
+    def _format(template, prefix, miner, value, metric):
+        fields = {"prefix": prefix, "miner": miner, "value": value, "metric": metric}
+        try:
+            return template.format(**fields)
+        except (ValueError, KeyError, IndexError):
+            pass
+        try:
+            # Formatangabe passt nicht zum Wert (z. B. {value:.2f} bei Text): ohne erneut versuchen
+            return re.sub(r"\{(\w+):[^}]*\}", r"{\1}", template).format(**fields)
+        except (ValueError, KeyError, IndexError):
+            return template
+
+def load_rules():
+    sections = {
+        section.split(":", 1)[1].strip(): dict(config[section])
+        for section in config.sections() if section.lower().startswith("rule:")
+    }
+    return [Rule(name, options) for name, options in (sections or DEFAULT_RULES).items()]
+
+rule_engine = RuleEngine(load_rules())
+
+# Prüft jeden neuen Sample gegen die Regeln und meldet Alarme im Channel
+async def monitor_changes(polled):
     channel = bot.get_channel(channel_id)
-    last_best = None  # Best Difficulty wird hier initialisiert
-    fallback_announced = False
-    unreachable_announced = False
-    hashrate_zero_announced = False
+    fired = False
+    for miner, data in polled:
+        for rule, text in rule_engine.evaluate(miner.name, data):
+            fired = True
+            if channel is not None:
+                outbound.alert(channel, text)
+    if fired:
+        # Alarmzustand gleich sichern, damit ein Neustart ihn nicht erneut meldet
+        runtime_state.save_soon()
 
-    while True:
-        data = fetch_bitaxe_data()
-        if data:
-            best = data.get("bestDiff")
-
-            # Melde nur eine neue Best Difficulty, wenn eine Veränderung nach dem Start erkannt wird
-            if last_best is not None and best != last_best:
-                await channel.send(f"🎉 **Neue Best Difficulty erreicht:** {best}")
-            last_best = best  # Aktualisiere die Best Difficulty, ohne beim ersten Mal eine Nachricht zu senden
-
-            # Fallback-Stratum Warnungen
-            fallback = data.get("isUsingFallbackStratum", False)
-            if fallback and not fallback_announced:
-                await channel.send("⚠️ **Achtung:** Der Miner verwendet derzeit den Fallback-Stratum!")
-                fallback_announced = True
-            if not fallback:
-                fallback_announced = False
+# Gelten zwei aufeinanderfolgende Samples als unverändert?
+def is_stable(previous, data):
+    if not previous:
+        return False
+    for attr, tolerance in (("hashrate", 0.02), ("temp", 0.02), ("power", 0.03)):
+        old, new = getattr(previous, attr), getattr(data, attr)
+        if old is None or new is None:
+            continue
+        if abs(new - old) > abs(old) * tolerance:
+            return False
+    return previous.using_fallback == data.using_fallback
+
+class PollSubscriber:
+    def __init__(self, name, callback, min_interval):
+        self.name = name
+        self.callback = callback
+        self.min_interval = min_interval
+        self.last_notified = 0.0
+        self.pending = {}  # Miner-Name -> (miner, data) seit der letzten Benachrichtigung
+
+# Ein Scheduler entscheidet, wann welcher Miner abgefragt wird, und benachrichtigt
+# alle Abonnenten. Das Intervall passt sich an: schneller nahe an Alert-Schwellen und
+# nach einem Ausfall, langsamer bei stabilen Werten oder nicht erreichbarem Miner.
+class PollScheduler:
+    RECOVERY_POLLS = 3
+
+    def __init__(self, base, fast, max_interval, jitter):
+        # Nie häufiger als die Snapshot-TTL, damit der Miner höchstens eine Anfrage pro TTL sieht
+        self.base = max(base, SNAPSHOT_TTL)
+        self.fast = max(fast, SNAPSHOT_TTL)
+        self.max_interval = max(max_interval, self.base)
+        self.jitter = jitter
+        self.subscribers = []
+        self.polls = 0
+        self._next = {}        # Miner-Name -> fällig ab (monotonic)
+        self._interval = {}    # aktuelles Intervall je Miner
+        self._stable = {}      # Anzahl stabiler Samples in Folge
+        self._recovering = {}  # verbleibende schnelle Abfragen nach einem Ausfall
+        self._last = {}
+        self._delivered = {}   # Miner-Name -> fetched_at des zuletzt zugestellten Abrufs
+        self._wakeup = asyncio.Event()
+        self.ready_at = None  # monotonic der ersten abgeschlossenen Abfrage
+
+    def subscribe(self, name, callback, min_interval=0.0):
+        self.subscribers.append(PollSubscriber(name, callback, min_interval))
+
+    def interval(self, miner_name):
+        return self._interval.get(miner_name, self.base)
+
+    def poll_soon(self, miner_name):
+        """Zieht die nächste Abfrage eines Miners vor (z. B. nach einem Ereignis)."""
+        self._next[miner_name] = 0.0
+        self._wakeup.set()
+
+    def _schedule(self, miner, data):
+        name = miner.name
+        previous = self._last.get(name)
+        self._last[name] = data
+        if not data:
+            # Nicht erreichbar: bis der Circuit Breaker offen ist, schnell nachprüfen,
+            # danach erst zur nächsten Probe (exponentielles Backoff des Breakers)
+            breaker = miner.cache.breaker
+            interval = max(self.fast, breaker.retry_in()) if breaker is not None else self.fast
+            self._recovering[name] = self.RECOVERY_POLLS
+            self._stable[name] = 0
+        elif self._recovering.get(name) or rule_engine.needs_attention(name):
+            interval = self.fast
+            self._recovering[name] = max(0, self._recovering.get(name, 0) - 1)
+            self._stable[name] = 0
+        elif log_streams is not None and log_streams.connected(name):
+            # Ereignisse kommen über den Log-Stream, per HTTP nur noch die langsamen Felder
+            interval = max(self.base, STREAM_POLL_INTERVAL)
+        elif is_stable(previous, data):
+            self._stable[name] = self._stable.get(name, 0) + 1
+            interval = min(self.max_interval, self.base * 1.5 ** self._stable[name])
         else:
-            # Warnung bei nicht erreichbarer API
-            if not unreachable_announced:
-                await channel.send("🚫 **Bitaxe API nicht erreichbar!** Bitte Verbindung prüfen.")
-                unreachable_announced = True
+            self._stable[name] = 0
+            interval = self.base
+        self._interval[name] = interval
+        self._next[name] = time.monotonic() + interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _deliver(self, results):
+        """
+        Gibt neue Abrufe an die Abonnenten. Ein Treffer im Snapshot-Cache (z. B. schon
+        von einem Befehl oder vom Log-Stream geliefert) ist kein neues Sample und
+        würde sonst in count/average/rate und im Debounce doppelt zählen.
+        """
+        for miner, data, age in results:
+            stamp = miner.cache.fetched_at
+            if self._delivered.get(miner.name) == stamp:
+                continue
+            self._delivered[miner.name] = stamp
+            for subscriber in self.subscribers:
+                subscriber.pending[miner.name] = (miner, data)
 
-        await asyncio.sleep(60)
+    def ingest(self, miner, data):
+        """Neuer Snapshot außerhalb der Abfrage (Log-Stream): sofort an die Abonnenten."""
+        for subscriber in self.subscribers:
+            subscriber.pending[miner.name] = (miner, data)
+        self._wakeup.set()
 
+    async def _notify(self, force=False):
+        now = time.monotonic()
+        for subscriber in self.subscribers:
+            if not subscriber.pending or (now - subscriber.last_notified < subscriber.min_interval and not force):
+                continue
+            polled = list(subscriber.pending.values())
+            subscriber.pending.clear()
+            subscriber.last_notified = now
+            try:
+                await subscriber.callback(polled)
+            except Exception as e:
+                print(f"{Fore.RED}Fehler in {subscriber.name}: {e}{Style.RESET_ALL}")
 
-    # Hier könntest du den log_to_console Task starten oder weitere Logik unter monitor_changes hinzufügen.
-    await log_to_console()  # Beispiel: direkt ausführen
+    def _next_wakeup(self):
+        wakeups = [due for name, due in self._next.items() if name in fleet.miners]
+        wakeups += [0.0 for name in fleet.miners if name not in self._next]
+        wakeups += [
+            s.last_notified + s.min_interval for s in self.subscribers if s.pending
+        ]
+        return min(wakeups) if wakeups else time.monotonic() + self.base
 
+    async def run(self):
+        while True:
+            now = time.monotonic()
+            due = [m for m in fleet.miners.values() if self._next.get(m.name, 0.0) <= now]
+            results = await fleet.sweep(due) if due else []
+            self.polls += len(results)
+            self._deliver(results)
+            await self._notify()
+            if results and self.ready_at is None:
+                self.ready_at = time.monotonic()
+                perf.observe("startup", self.ready_at - STARTED_AT)
+                print(f"{Fore.GREEN}🚀 Bereit und fragt ab – {self.ready_at - STARTED_AT:.2f} s nach dem Start{Style.RESET_ALL}")
+            # Erst nach den Regeln planen, damit deren Einschätzung schon aktuell ist
+            for miner, data, age in results:
+                self._schedule(miner, data)
+            self._wakeup.clear()
+            delay = max(0.0, self._next_wakeup() - time.monotonic())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
 
-    bot.loop.create_task(log_to_console())
-    await bot.wait_until_ready()
-    channel = bot.get_channel(channel_id)
-    last_best = None
-    fallback_announced = False
-    unreachable_announced = False
-    hashrate_zero_announced = False
+poll_options = config['polling'] if config.has_section('polling') else {}
+scheduler = PollScheduler(
+    float(poll_options.get('base_interval_sec', 10)),
+    float(poll_options.get('fast_interval_sec', 5)),
+    float(poll_options.get('max_interval_sec', 120)),
+    float(poll_options.get('jitter', 0.1)),
+)
+# Breaker-Wechsel: in der Konsole melden; nach der Erholung sofort neu planen, damit
+# die Regeln (z. B. "wieder online") nicht erst beim nächsten Backoff-Termin laufen
+def on_breaker_change(miner, old, new):
+    if new == BREAKER_OPEN and old != BREAKER_OPEN:
+        breaker = miner.cache.breaker
+        print(f"{Fore.RED}🔌 [{miner.name}] nicht erreichbar – nächster Versuch in {breaker.retry_in():.0f} s{Style.RESET_ALL}")
+    elif new == BREAKER_CLOSED:
+        print(f"{Fore.GREEN}🔌 [{miner.name}] wieder erreichbar{Style.RESET_ALL}")
+        scheduler.poll_soon(miner.name)
 
-    while True:
-        data = fetch_bitaxe_data()
-        if data:
-            best = data.get("bestDiff")
-            fallback = data.get("isUsingFallbackStratum", False)
-            if best and best != last_best:
-                await channel.send(f"🎉 **Neue Best Difficulty erreicht:** {best}")
-                last_best = best
-            if fallback and not fallback_announced:
-                await channel.send("⚠️ **Achtung:** Der Miner verwendet derzeit den Fallback-Stratum!")
-                fallback_announced = True
-            if not fallback:
-                fallback_announced = False
+fleet.breaker_listeners.append(on_breaker_change)
+
+# Log-Stream (optional, [stream] enabled = true): AxeOS sendet sein Log über den
+# WebSocket /api/ws. Je Miner bleibt eine Verbindung offen; die Zeilen werden
+# fortlaufend zu Ereignissen geparst (Share mit Difficulty, angenommen/abgelehnt,
+# Pool-Wechsel, Neustart) und gehen sofort in Regeln, Dashboards und Historie.
+# Per HTTP wird dann nur noch alle poll_interval_sec abgefragt.
+stream_options = config['stream'] if config.has_section('stream') else {}
+STREAM_ENABLED = config.has_section('stream') and config['stream'].getboolean('enabled', False)
+STREAM_POLL_INTERVAL = float(stream_options.get('poll_interval_sec', 60))
+STREAM_RECONNECT = float(stream_options.get('reconnect_sec', 2))
+STREAM_MAX_RECONNECT = float(stream_options.get('max_reconnect_sec', 60))
+STREAM_IDLE_TIMEOUT = float(stream_options.get('idle_timeout_sec', 90))
+# Handshake-Status, bei denen ein erneuter Versuch gleich wieder scheitert (z. B. 404:
+# Firmware ohne /api/ws): dann nur noch im Abstand max_reconnect_sec versuchen
+STREAM_RETRYABLE_STATUS = {408, 425, 429}
+
+def stream_status_retryable(status):
+    return not 400 <= status < 500 or status in STREAM_RETRYABLE_STATUS
+
+# ESP-IDF-Logzeile, z. B. "I (123456) asic_result: ... diff 2345.6 of 2048."
+LOG_LINE = re.compile(r"^([EWIDV]) \((\d+)\) ([\w.-]+): (.*)$")
+LOG_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+LOG_SHARE = re.compile(r"[Nn]once [0-9A-Fa-f]+ diff ([\d.]+) of (\d+)")
+LOG_RESULT = re.compile(r"result (accepted|rejected)")
+# Je nach AxeOS-Version "Connecting to: pool.example", "...: pool.example:3333" oder
+# "...: stratum+tcp://pool.example:3333 (1.2.3.4)"
+LOG_POOL = re.compile(r"[Cc]onnect(?:ing|ed) to:? *((?:[\w+.-]+://)?[\w.-]+(?::\d+)?)")
+LOG_SUBMITS = 64  # so viele offene mining.submit-IDs je Verbindung merken
+
+class LogEvent:
+    __slots__ = ("kind", "uptime_ms", "value")
+
+    def __init__(self, kind, uptime_ms, value=None):
+        self.kind = kind  # "share", "accepted", "rejected", "pool" oder "reset"
+        self.uptime_ms = uptime_ms
+        self.value = value
+
+    def __repr__(self):
+        return f"LogEvent({self.kind}, {self.value})"
+
+class LogParser:
+    """
+    Parst den Log-Stream einer Verbindung inkrementell: Nachrichten dürfen Zeilen
+    teilen oder mehrere Zeilen enthalten. Sinkt der Zeitstempel (ms seit dem Boot),
+    hat der Miner neu gestartet.
+    """
+    def __init__(self):
+        self.buffer = ""
+        self.last_ms = None
+        self.submits = collections.deque(maxlen=LOG_SUBMITS)
+        self.lines = 0
+
+    def feed(self, text):
+        self.buffer += text
+        *lines, self.buffer = self.buffer.split("\n")
+        events = []
+        for line in lines:
+            event = self.parse_line(line)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def parse_line(self, line):
+        match = LOG_LINE.match(LOG_ANSI.sub("", line).strip())
+        if match is None:
+            return None
+        self.lines += 1
+        level, uptime_ms, tag, text = match.groups()
+        uptime_ms = int(uptime_ms)
+        restarted = self.last_ms is not None and uptime_ms < self.last_ms
+        self.last_ms = uptime_ms
+        if restarted:
+            self.submits.clear()
+            return LogEvent("reset", uptime_ms)
+        share = LOG_SHARE.search(text)
+        if share is not None:
+            return LogEvent("share", uptime_ms, float(share.group(1)))
+        if tag.startswith("stratum"):
+            return self._stratum(uptime_ms, text)
+        return None
+
+    def _stratum(self, uptime_ms, text):
+        result = LOG_RESULT.search(text)
+        if result is not None:
+            return LogEvent(result.group(1), uptime_ms)
+        if text.startswith(("tx: ", "rx: ")):
+            try:
+                message = json.loads(text[4:])
+            except ValueError:
+                return None
+            if not isinstance(message, dict):
+                return None
+            if text.startswith("tx: "):
+                if message.get("method") == "mining.submit":
+                    self.submits.append(message.get("id"))
+                return None
+            # Antwort auf ein eigenes mining.submit: angenommen oder abgelehnt
+            if message.get("id") in self.submits:
+                self.submits.remove(message["id"])
+                return LogEvent("accepted" if message.get("result") is True else "rejected", uptime_ms)
+            return None
+        pool = LOG_POOL.search(text)
+        if pool is not None:
+            return LogEvent("pool", uptime_ms, pool.group(1))
+        return None
+
+def log_pool_is(logged, url, port):
+    """Nennt die Pool-Logzeile (Host, host:port oder URL) den konfigurierten Pool url/port?"""
+    configured = stratum_endpoint(url, port)
+    # Ohne Port in der Logzeile zählt nur der Host
+    seen = stratum_endpoint(logged, port) if configured is not None else None
+    return seen is not None and seen[:2] == configured[:2]
+
+def api_url_for(api_url, endpoint, scheme=None):
+    """http://host/api/system/info + "ws" -> http://host/api/ws"""
+    parts = urllib.parse.urlsplit(api_url)
+    path = parts.path[:-len("/system/info")] if parts.path.endswith("/system/info") else "/api"
+    return urllib.parse.urlunsplit((scheme or parts.scheme, parts.netloc, f"{path}/{endpoint}", "", ""))
+
+def stream_url(api_url):
+    """http://host/api/system/info -> ws://host/api/ws"""
+    return api_url_for(api_url, "ws", "wss" if api_url.startswith("https") else "ws")
+
+class MinerStream:
+    def __init__(self, miner):
+        self.miner = miner
+        self.task = None
+        self.connected = False
+        self.connects = 0
+        self.events = collections.Counter()
+        self.last_error = None
+
+class LogStreamManager:
+    """Hält je Miner einen WebSocket offen und setzt die Ereignisse in Snapshots um."""
+
+    def __init__(self, source=None):
+        self.streams = {}    # Miner-Name -> MinerStream
+        self.listeners = []  # werden mit (miner, event) für jedes Ereignis aufgerufen
+        self._running = False
+        self._source = source  # eigene Fleet (Benchmark), sonst die des Bots
+
+    @property
+    def fleet(self):
+        return fleet if self._source is None else self._source
+
+    def connected(self, name):
+        stream = self.streams.get(name)
+        return stream is not None and stream.connected
+
+    def start(self):
+        self._running = True
+        for miner in self.fleet.miners.values():
+            self._start(miner)
+
+    def _start(self, miner):
+        stream = self.streams[miner.name] = MinerStream(miner)
+        stream.task = asyncio.ensure_future(self._run(stream))
+
+    def on_membership(self, miner, added):
+        if not self._running:
+            return
+        if added:
+            self._start(miner)
         else:
-            if not unreachable_announced:
-                await channel.send("🚫 **Bitaxe API nicht erreichbar!** Bitte Verbindung prüfen.")
-                unreachable_announced = True
-            hashrate_zero_announced = False
+            stream = self.streams.pop(miner.name, None)
+            if stream is not None:
+                stream.task.cancel()
 
-        if data:
-            hr = data.get("hashRate", 0)
-            if hr < 350 and not hashrate_zero_announced:
-                await channel.send(f"⚠️ **Warnung:** Die Hashrate ist niedrig: {hr:.2f} MH/s!")
-                hashrate_zero_announced = True
-            elif hr >= 400 and hashrate_zero_announced:
-                await channel.send(f"✅ **Entwarnung:** Hashrate wieder stabil bei {hr:.2f} MH/s.")
-                hashrate_zero_announced = False
-            unreachable_announced = False
-
-        await asyncio.sleep(60)
-      
-if __name__ == "__main__":
+    async def _run(self, stream):
+        delay = STREAM_RECONNECT
+        url = stream_url(stream.miner.url)
+        while True:
+            error = None
+            try:
+                async with http_session.ws_connect(url) as ws:
+                    stream.connected = True
+                    stream.connects += 1
+                    stream.last_error = None
+                    delay = STREAM_RECONNECT
+                    parser = LogParser()
+                    while True:
+                        message = await ws.receive(timeout=STREAM_IDLE_TIMEOUT)
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            text = message.data
+                        elif message.type == aiohttp.WSMsgType.BINARY:
+                            text = message.data.decode("utf-8", "replace")
+                        else:
+                            break
+                        for event in parser.feed(text):
+                            self._handle(stream, event)
+            except asyncio.CancelledError:
+                raise
+            except aiohttp.WSServerHandshakeError as e:
+                error = f"Handshake abgelehnt (HTTP {e.status})"
+                if not stream_status_retryable(e.status):
+                    delay = STREAM_MAX_RECONNECT
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            # Nur den ersten Fehler und jeden neuen melden, nicht jeden Versuch
+            if error is not None and error != stream.last_error:
+                print(f"{Fore.YELLOW}📡 [{stream.miner.name}] Log-Stream: {error}{Style.RESET_ALL}")
+            stream.last_error = error
+            if stream.connected:
+                stream.connected = False
+                # Verbindung weg: per HTTP nachsehen, ob der Miner noch erreichbar ist
+                scheduler.poll_soon(stream.miner.name)
+            perf.count("stream_reconnects")
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+            delay = min(delay * 2, STREAM_MAX_RECONNECT)
+
+    def _handle(self, stream, event):
+        miner = stream.miner
+        stream.events[event.kind] += 1
+        perf.count(f"stream_{event.kind}")
+        for listener in self.listeners:
+            listener(miner, event)
+        data = miner.cache.data or miner.cache.last_good
+        if event.kind == "reset":
+            print(f"{Fore.YELLOW}🔄 [{miner.name}] Neustart im Log erkannt{Style.RESET_ALL}")
+            scheduler.poll_soon(miner.name)
+        elif not data:
+            return
+        elif event.kind == "share":
+            # Auf die Genauigkeit von AxeOS runden, damit die nächste Abfrage keine "Änderung" ist
+            value = parse_difficulty(format_difficulty(event.value))
+            changes = {}
+            if value > (data.best_session_diff or 0):
+                changes["best_session_diff"] = value
+            if value > (data.best_diff or 0):
+                changes["best_diff"] = value
+            if changes:
+                self._push(miner, data.replace(**changes))
+        elif event.kind == "pool":
+            using_fallback = (log_pool_is(event.value, data.fallback_url, data.fallback_port)
+                              and not log_pool_is(event.value, data.stratum_url, data.stratum_port))
+            if using_fallback != data.using_fallback:
+                self._push(miner, data.replace(using_fallback=using_fallback))
+            scheduler.poll_soon(miner.name)
+
+    def _push(self, miner, data):
+        miner.cache.push(data)
+        scheduler.ingest(miner, data)
+
+    async def stop(self):
+        self._running = False
+        tasks = [stream.task for stream in self.streams.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.streams.clear()
+
+log_streams = LogStreamManager() if STREAM_ENABLED else None
+if log_streams is not None:
+    fleet.membership_listeners.append(log_streams.on_membership)
+
+# Autotuning (optional, [autotune] enabled = true): fährt je Miner ein Raster aus
+# Frequenz und Core-Spannung ab und schreibt die Werte über PATCH /api/system. Nach
+# jedem Schritt wird gewartet, bis sich die Hashrate eingeschwungen hat, dann die
+# Effizienz in J/TH gemessen. Übertemperatur (temp/vrTemp) bricht den Lauf ab, zu
+# viele abgelehnte Shares oder zu wenig Hashrate machen den Schritt instabil. Am Ende
+# bleibt der beste stabile Arbeitspunkt eingestellt, sonst die ursprünglichen Werte.
+# Abgelehnte Shares brechen bewusst nicht den ganzen Lauf ab: die Suche nach der
+# niedrigsten Spannung beginnt unten, wo Unterspannung zuerst Shares kostet. Ein
+# solcher Schritt endet aber, sobald die Fehlerquote feststeht, danach folgt die
+# nächsthöhere Spannung; ist auch die höchste instabil, endet der Lauf dort.
+def parse_grid(text):
+    return sorted({int(value) for value in str(text).replace(" ", "").split(",") if value})
+
+AUTOTUNE_DEFAULTS = {
+    "frequencies": "490, 525, 550, 575, 600",  # MHz
+    "voltages": "1150, 1200, 1250",             # mV
+    "max_voltage_mv": 1300,
+    "max_frequency_mhz": 600,
+    "max_temp": 65,
+    "max_vr_temp": 85,
+    "max_error_rate": 0.02,
+    "min_hashrate_ratio": 0.9,  # Anteil der erwarteten Hashrate (expectedHashrate)
+    "sample_sec": 10,
+    "settle_sec": 120,
+    "settle_tolerance": 0.01,
+    "measure_sec": 300,
+    "parallel": 4,
+    "restart": "false",  # ältere AxeOS-Versionen übernehmen Frequenz/Spannung erst nach Neustart
+    "restart_wait_sec": 20,
+    "goal": "efficiency",  # oder "hashrate"
+}
+
+# Ab so vielen Shares im Schritt gilt die Fehlerquote als belastbar
+AUTOTUNE_MIN_SHARES = 20
+
+class TuneAbort(Exception):
+    pass
+
+class TuneSession:
+    def __init__(self, miner):
+        self.miner = miner
+        self.state = "wartet"
+        self.step = None      # (MHz, mV) des laufenden Schritts
+        self.original = None  # (MHz, mV) vor dem Lauf
+        self.best = None
+        self.results = []
+        self.reason = None
+        self.task = None
+
+    @property
+    def running(self):
+        return self.task is not None and not self.task.done()
+
+class AutoTuner:
+    def __init__(self, options):
+        options = {**AUTOTUNE_DEFAULTS, **dict(options)}
+        self.max_voltage = int(options["max_voltage_mv"])
+        self.max_frequency = int(options["max_frequency_mhz"])
+        # Rasterwerte über den Grenzen werden nie an den Miner geschickt
+        self.frequencies = [f for f in parse_grid(options["frequencies"]) if f <= self.max_frequency]
+        self.voltages = [v for v in parse_grid(options["voltages"]) if v <= self.max_voltage]
+        self.max_temp = float(options["max_temp"])
+        self.max_vr_temp = float(options["max_vr_temp"])
+        self.max_error_rate = float(options["max_error_rate"])
+        self.min_hashrate_ratio = float(options["min_hashrate_ratio"])
+        self.sample_sec = float(options["sample_sec"])
+        self.settle_sec = float(options["settle_sec"])
+        self.settle_tolerance = float(options["settle_tolerance"])
+        self.measure_sec = float(options["measure_sec"])
+        # Ohne Sample gäbe es weder Einschwingen noch Messwerte
+        if self.sample_sec <= 0 or self.measure_sec <= 0:
+            raise ValueError("Autotuning: sample_sec und measure_sec müssen größer als 0 sein")
+        self.restart = str(options["restart"]).strip().lower() in ("1", "true", "yes")
+        self.restart_wait = float(options["restart_wait_sec"])
+        self.goal = options["goal"]
+        self.semaphore = asyncio.Semaphore(int(options["parallel"]))
+        self.sessions = {}  # Miner-Name -> TuneSession
+        self.writes = 0
+
+    def start(self, miners):
+        started = []
+        for miner in miners:
+            session = self.sessions.get(miner.name)
+            if session is not None and session.running:
+                continue
+            session = self.sessions[miner.name] = TuneSession(miner)
+            session.task = asyncio.ensure_future(self._run(session))
+            started.append(miner)
+        return started
+
+    def stop(self, miners):
+        stopped = []
+        for miner in miners:
+            session = self.sessions.get(miner.name)
+            if session is not None and session.running:
+                session.task.cancel()
+                stopped.append(miner)
+        return stopped
+
+    def better(self, point, best):
+        if self.goal == "hashrate":
+            return point["hashrate"] > best["hashrate"]
+        return point["efficiency"] < best["efficiency"]
+
+    async def _run(self, session):
+        miner = session.miner
+        try:
+            async with self.semaphore:
+                session.state = "läuft"
+                data, _ = await miner.cache.get(max_age=0)
+                if not data or data.frequency is None or data.core_voltage is None:
+                    raise TuneAbort("Miner nicht erreichbar oder ohne Frequenz/Spannung")
+                session.original = (round(data.frequency), round(data.core_voltage * 1000))
+                try:
+                    for frequency in self.frequencies:
+                        stable = None
+                        # Je Frequenz die niedrigste stabile Spannung suchen
+                        for voltage in self.voltages:
+                            session.step = (frequency, voltage)
+                            await self._apply(miner, frequency, voltage)
+                            point = await self._measure(session)
+                            session.results.append(point)
+                            if point["stable"]:
+                                stable = point
+                                break
+                        if stable is None:
+                            break  # auch mit der höchsten Spannung instabil – höher lohnt nicht
+                        if session.best is None or self.better(stable, session.best):
+                            session.best = stable
+                    session.state = "fertig"
+                except TuneAbort as e:
+                    session.state = "abgebrochen"
+                    session.reason = str(e)
+                finally:
+                    # Besten Punkt bzw. die ursprünglichen Werte auch bei Abbruch einstellen
+                    target = (session.best["frequency"], session.best["voltage"]) if session.best else session.original
+                    session.step = None
+                    await asyncio.shield(self._apply(miner, *target, wait=False))
+        except TuneAbort as e:
+            session.state = "abgebrochen"
+            session.reason = str(e)
+        except asyncio.CancelledError:
+            session.state = "gestoppt"
+        except Exception as e:
+            session.state = "abgebrochen"
+            session.reason = f"Fehler: {e}"
+        print(f"{Fore.CYAN}🎛️ [{miner.name}] Autotuning {session.state}"
+              + (f": {session.reason}" if session.reason else "") + f" – {self.describe(session.best)}{Style.RESET_ALL}")
+        runtime_state.save_soon()
+
+    async def _apply(self, miner, frequency, voltage, wait=True):
+        settings = {"frequency": frequency, "coreVoltage": voltage}
+        try:
+            async with http_session.patch(api_url_for(miner.url, "system"), json=settings) as response:
+                if response.status != 200:
+                    raise TuneAbort(f"Einstellungen abgelehnt (HTTP {response.status})")
+            self.writes += 1
+            if self.restart:
+                async with http_session.post(api_url_for(miner.url, "system/restart")) as response:
+                    pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TuneAbort(f"Einstellungen nicht geschrieben: {e}")
+        if self.restart and wait:
+            await asyncio.sleep(self.restart_wait)
+
+    def _check_limits(self, data):
+        if data.temp is not None and data.temp > self.max_temp:
+            raise TuneAbort(f"Temperatur {data.temp:.1f}°C über {self.max_temp:.0f}°C")
+        if data.vr_temp is not None and data.vr_temp > self.max_vr_temp:
+            raise TuneAbort(f"VR-Temperatur {data.vr_temp:.1f}°C über {self.max_vr_temp:.0f}°C")
+
+    async def _sample(self, miner):
+        await asyncio.sleep(self.sample_sec)
+        data, _ = await miner.cache.get(max_age=self.sample_sec / 2)
+        if not data:
+            raise TuneAbort("Miner nach der Änderung nicht erreichbar")
+        self._check_limits(data)
+        return data
+
+    async def _measure(self, session):
+        miner = session.miner
+        frequency, voltage = session.step
+        point = {"frequency": frequency, "voltage": voltage, "stable": False, "reason": None}
+        # Einschwingen: gleitender Mittelwert der Hashrate ändert sich kaum noch
+        window = collections.deque(maxlen=max(2, round(self.settle_sec / self.sample_sec / 2)))
+        started = time.monotonic()
+        previous = None
+        while True:
+            data = await self._sample(miner)
+            window.append(data.hashrate or 0.0)
+            average = sum(window) / len(window)
+            elapsed = time.monotonic() - started
+            if elapsed >= self.settle_sec and previous and abs(average - previous) <= previous * self.settle_tolerance:
+                break
+            if elapsed >= self.settle_sec * 3:
+                point["reason"] = "Hashrate schwingt nicht ein"
+                return point
+            if len(window) == window.maxlen:
+                previous = average
+        # Messen
+        first = data
+        hashrates, powers, temps, vr_temps = [], [], [], []
+        started = time.monotonic()
+        while time.monotonic() - started < self.measure_sec:
+            data = await self._sample(miner)
+            hashrates.append(data.hashrate or 0.0)
+            powers.append(data.power or 0.0)
+            temps.append(data.temp or 0.0)
+            vr_temps.append(data.vr_temp or 0.0)
+            accepted = (data.shares_accepted or 0) - (first.shares_accepted or 0)
+            rejected = (data.shares_rejected or 0) - (first.shares_rejected or 0)
+            # Die Einstellung erzeugt schon ungültige Shares: nicht weiter so laufen lassen
+            if accepted + rejected >= AUTOTUNE_MIN_SHARES and rejected / (accepted + rejected) > self.max_error_rate:
+                break
+        hashrate = sum(hashrates) / len(hashrates)
+        power = sum(powers) / len(powers)
+        point.update(
+            hashrate=round(hashrate, 2),
+            power=round(power, 2),
+            efficiency=round(joules_per_terahash(power, hashrate), 2) if hashrate else None,
+            temp=round(max(temps), 1),
+            vr_temp=round(max(vr_temps), 1),
+            error_rate=round(rejected / (accepted + rejected), 4) if accepted + rejected else 0.0,
+        )
+        if point["error_rate"] > self.max_error_rate:
+            point["reason"] = f"Fehlerquote {point['error_rate']:.1%}"
+        elif data.expected_hashrate and hashrate < data.expected_hashrate * self.min_hashrate_ratio:
+            point["reason"] = f"Hashrate {hashrate / data.expected_hashrate:.0%} der erwarteten"
+        elif not hashrate:
+            point["reason"] = "keine Hashrate"
+        else:
+            point["stable"] = True
+        return point
+
+    @staticmethod
+    def describe(point):
+        if not point:
+            return "kein stabiler Punkt"
+        return (f"{point['frequency']} MHz / {point['voltage']} mV: {point['hashrate']:.0f} {HASHRATE_UNIT}, "
+                f"{point['power']:.1f} W, {point['efficiency']:.2f} J/TH")
+
+    def export(self):
+        return {
+            name: {"state": session.state, "best": session.best, "results": session.results, "reason": session.reason}
+            for name, session in self.sessions.items()
+        }
+
+    def restore(self, saved):
+        for name, entry in saved.items():
+            miner = fleet.miners.get(name)
+            if miner is None:
+                continue
+            session = self.sessions[name] = TuneSession(miner)
+            # Ein beim Beenden laufender Tuning-Lauf wird nicht fortgesetzt
+            session.state = entry.get("state") if entry.get("state") != "läuft" else "unterbrochen"
+            session.best = entry.get("best")
+            session.results = entry.get("results", [])
+            session.reason = entry.get("reason")
+
+async def autotune_autocomplete(interaction, current):
+    return choices_for(current, ["status", "start", "stop"])
+
+autotuner = AutoTuner(config['autotune']) if config.has_section('autotune') and config['autotune'].getboolean('enabled', False) else None
+
+@bot.hybrid_command(help="Autotuning von Frequenz und Core-Spannung: start, stop oder status. Optional: Miner-Name oder tag:<tag>")
+@app_commands.describe(action="start, stop oder status", miner=MINER_PARAM)
+@app_commands.autocomplete(action=autotune_autocomplete, miner=miner_autocomplete)
+async def autotune(ctx, action: str = "status", miner: str = None):
+    if autotuner is None:
+        await reply(ctx, "❌ Autotuning ist deaktiviert ([autotune] enabled = false).")
+        return
+    action = action.lower()
+    miners = fleet.select(miner)
+    if not miners:
+        await reply(ctx, unknown_miner_text(miner))
+        return
+    if action in ("start", "stop"):
+        permissions = getattr(ctx.author, "guild_permissions", None)
+        if permissions is None or not permissions.manage_guild:
+            await reply(ctx, "❌ Nur mit der Berechtigung „Server verwalten“ erlaubt.")
+            return
+        if action == "start":
+            started = autotuner.start(miners)
+            await reply(ctx, f"🎛️ Autotuning gestartet für {len(started)} Miner "
+                             f"({len(autotuner.frequencies)} Frequenzen × {len(autotuner.voltages)} Spannungen).")
+        else:
+            stopped = autotuner.stop(miners)
+            await reply(ctx, f"🛑 Autotuning gestoppt für {len(stopped)} Miner – die Ausgangswerte werden wiederhergestellt.")
+        return
+    lines = ["🎛️ **Autotuning**"]
+    for target in miners[:FLEET_SUMMARY_MAX_LINES]:
+        session = autotuner.sessions.get(target.name)
+        if session is None:
+            lines.append(f"**{target.name}**: noch nicht getunt")
+            continue
+        step = f" – Schritt {session.step[0]} MHz / {session.step[1]} mV" if session.step else ""
+        reason = f" ({session.reason})" if session.reason else ""
+        lines.append(f"**{target.name}**: {session.state}{reason}{step} | {len(session.results)} Punkte | Bester: {autotuner.describe(session.best)}")
+    await reply(ctx, "\n".join(lines))
+
+# Miner zur Laufzeit hinzufügen oder entfernen: die [miner:*]-Abschnitte der
+# config.ini neu lesen. Geänderte Miner (URL, Tags, Timeout) werden ersetzt; die
+# Membership-Listener verteilen dabei u. a. die Poller-Worker-Shards neu.
+def reload_miners():
+    """Gibt (hinzugefügt, entfernt, geändert) als Listen von Namen zurück."""
+    fresh = configparser.ConfigParser()
+    fresh.read('config.ini')
+    wanted = {miner.name: miner for miner in load_miners(fresh)}
+    added, removed, changed = [], [], []
+    for name, miner in list(fleet.miners.items()):
+        new = wanted.get(name)
+        if new is not None and (new.url, new.tags, new.timeout) == (miner.url, miner.tags, miner.timeout):
+            continue
+        fleet.remove(name)
+        if new is None:
+            removed.append(name)
+            dashboard_manager.forget(name)
+            rule_engine.forget(name)
+        else:
+            changed.append(name)
+    for name, miner in wanted.items():
+        if name not in fleet.miners:
+            fleet.add(miner)
+            if name not in changed:
+                added.append(name)
+    return added, removed, changed
+
+async def miners_autocomplete(interaction, current):
+    return choices_for(current, ["list", "reload"])
+
+@bot.hybrid_command(help="Listet die Miner der Fleet. reload liest die [miner:*]-Abschnitte der config.ini neu ein")
+@app_commands.describe(action="list oder reload")
+@app_commands.autocomplete(action=miners_autocomplete)
+async def miners(ctx, action: str = "list"):
+    if action.lower() == "reload":
+        permissions = getattr(ctx.author, "guild_permissions", None)
+        if permissions is None or not permissions.manage_guild:
+            await reply(ctx, "❌ Nur mit der Berechtigung „Server verwalten“ erlaubt.")
+            return
+        added, removed, changed = reload_miners()
+        runtime_state.save_soon()
+        parts = [f"{label}: {', '.join(names)}" for label, names in
+                 (("➕ Neu", added), ("➖ Entfernt", removed), ("🔄 Geändert", changed)) if names]
+        await reply(ctx, "🛰️ **Miner neu geladen** – " + (" | ".join(parts) if parts else "keine Änderungen")
+                         + f" ({len(fleet.miners)} Miner)")
+        return
+    lines = [f"🛰️ **Fleet:** {len(fleet.miners)} Miner"]
+    length = len(lines[0])
+    for miner in list(fleet.miners.values())[:FLEET_SUMMARY_MAX_LINES]:
+        tags = f" [{', '.join(sorted(miner.tags))}]" if miner.tags else ""
+        shard = f" · Worker {poller_pool.assignment.get(miner.name)}" if poller_pool is not None else ""
+        line = f"• **{miner.name}**{tags} `{miner.url}`{shard}"
+        # Platz für die Schlusszeile lassen, damit die Nachricht unter dem Discord-Limit bleibt
+        if length + len(line) + 1 > DISCORD_MESSAGE_LIMIT - 40:
+            break
+        lines.append(line)
+        length += len(line) + 1
+    if len(lines) - 1 < len(fleet.miners):
+        lines.append(f"… und {len(fleet.miners) - (len(lines) - 1)} weitere")
+    await reply(ctx, "\n".join(lines))
+
+# Stratum-Prober (optional, [stratum_probe] enabled = true): misst regelmäßig TCP-Connect
+# und die Antwortzeit auf mining.subscribe für den Primär- und Fallback-Pool jedes
+# Miners. Pools, die sich mehrere Miner teilen, werden nur einmal geprüft. Wird der
+# Primär-Pool langsam oder unzuverlässig, kommt ein Alarm, bevor der Miner umschaltet.
+STRATUM_SUBSCRIBE = b'{"id": 1, "method": "mining.subscribe", "params": ["bitaxe-discord-bot/probe"]}\n'
+STRATUM_READ_LINES = 5  # so viele Zeilen auf die Antwort mit id 1 warten (Pools senden vorab teils Notifications)
+
+def stratum_endpoint(url, port):
+    """("stratum+ssl://pool.example:4333", 3333) -> ("pool.example", 4333, True)"""
+    if not url or not port:
+        return None
+    url = url.strip()
+    tls = False
+    if "://" in url:
+        scheme, url = url.split("://", 1)
+        tls = scheme.lower().endswith(("ssl", "tls"))
+    host, _, explicit = url.split("/", 1)[0].partition(":")
+    if explicit.isdigit():
+        port = int(explicit)
+    return (host.lower(), int(port), tls) if host else None
+
+def format_endpoint(endpoint):
+    host, port, tls = endpoint
+    return f"{host}:{port}" + (" (TLS)" if tls else "")
+
+class PoolStats:
+    __slots__ = ("probes", "alerted", "last_error")
+
+    def __init__(self, window):
+        self.probes = collections.deque(maxlen=window)  # (ts, connect_s, subscribe_s) – None = fehlgeschlagen
+        self.alerted = False
+        self.last_error = None
+
+    def availability(self):
+        if not self.probes:
+            return None
+        return sum(1 for _, _, subscribe in self.probes if subscribe is not None) / len(self.probes)
+
+    def percentile(self, index, q):
+        values = sorted(probe[index] for probe in self.probes if probe[index] is not None)
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+class StratumProber:
+    def __init__(self, options, source=None):
+        self.interval = float(options.get('interval_sec', 60))
+        self.timeout = float(options.get('timeout_sec', 5))
+        self.window = int(options.get('window', 10))
+        self.min_samples = int(options.get('min_samples', 3))
+        self.min_availability = float(options.get('min_availability', 0.8))
+        self.max_latency = float(options.get('max_latency_ms', 1000)) / 1000
+        self.semaphore = asyncio.Semaphore(int(options.get('concurrency', 32)))
+        self.pools = {}  # (host, port, tls) -> PoolStats
+        self.rounds = 0
+        self._source = source  # eigene Fleet (Benchmark), sonst die des Bots
+
+    @property
+    def fleet(self):
+        return fleet if self._source is None else self._source
+
+    def endpoints(self):
+        """Alle Pools der Fleet mit den Minern, die sie als Primär- bzw. Fallback-Pool nutzen."""
+        roles = {}
+        for miner in self.fleet.miners.values():
+            data = miner.cache.data or miner.cache.last_good
+            if not data:
+                continue
+            for role, url, port in (("primary", data.stratum_url, data.stratum_port),
+                                    ("fallback", data.fallback_url, data.fallback_port)):
+                endpoint = stratum_endpoint(url, port)
+                if endpoint is not None:
+                    roles.setdefault(endpoint, {"primary": [], "fallback": []})[role].append((miner, data))
+        return roles
+
+    def stats_for(self, endpoint):
+        stats = self.pools.get(endpoint)
+        if stats is None:
+            stats = self.pools[endpoint] = PoolStats(self.window)
+        return stats
+
+    async def probe(self, endpoint):
+        """Gibt (connect_s, subscribe_s, fehler) zurück; None für nicht erreichte Schritte."""
+        host, port, tls = endpoint
+        writer = None
+        started = time.monotonic()
+        connect = None
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port, ssl=tls or None), self.timeout)
+            connect = time.monotonic() - started
+            writer.write(STRATUM_SUBSCRIBE)
+            await writer.drain()
+            for _ in range(STRATUM_READ_LINES):
+                remaining = self.timeout - (time.monotonic() - started)
+                line = await asyncio.wait_for(reader.readline(), max(0.0, remaining))
+                if not line:
+                    return connect, None, "Verbindung geschlossen"
+                message = json.loads(line)
+                if isinstance(message, dict) and message.get("id") == 1:
+                    if message.get("error") or message.get("result") is None:
+                        return connect, None, "subscribe abgelehnt"
+                    return connect, time.monotonic() - started - connect, None
+            return connect, None, "keine Antwort auf subscribe"
+        except asyncio.TimeoutError:
+            return connect, None, "Timeout"
+        except (OSError, ValueError) as e:
+            return connect, None, str(e) or type(e).__name__
+        finally:
+            if writer is not None:
+                writer.close()
+
+    async def _probe(self, endpoint):
+        async with self.semaphore:
+            connect, subscribe, error = await self.probe(endpoint)
+        stats = self.stats_for(endpoint)
+        stats.probes.append((time.time(), connect, subscribe))
+        stats.last_error = error
+        if subscribe is not None:
+            perf.observe("stratum_subscribe", subscribe)
+        perf.count("stratum_probe_ok" if error is None else "stratum_probe_failed")
+
+    def degraded(self, stats):
+        if len(stats.probes) < self.min_samples:
+            return False
+        latency = stats.percentile(2, 0.5)
+        return stats.availability() < self.min_availability or (latency is not None and latency > self.max_latency)
+
+    async def probe_all(self):
+        """Eine Runde über alle Pools; gibt die fälligen Alarm- und Entwarnungstexte zurück."""
+        roles = self.endpoints()
+        await asyncio.gather(*(self._probe(endpoint) for endpoint in roles))
+        self.rounds += 1
+        messages = []
+        for endpoint, users in roles.items():
+            stats = self.pools[endpoint]
+            degraded = self.degraded(stats)
+            # Nur Miner, die den Pool als Primär-Pool nutzen und noch nicht umgeschaltet haben
+            waiting = [miner.name for miner, data in users["primary"] if not data.using_fallback]
+            if degraded and not stats.alerted and waiting:
+                stats.alerted = True
+                latency = stats.percentile(2, 0.5)
+                messages.append(
+                    f"⚠️ **Primär-Pool `{format_endpoint(endpoint)}` gestört:** Verfügbarkeit {stats.availability():.0%}"
+                    + (f", subscribe p50 {latency * 1000:.0f} ms" if latency is not None else "")
+                    + (f" ({stats.last_error})" if stats.last_error else "")
+                    + f" – noch nicht auf Fallback: {', '.join(waiting[:10])}"
+                    + (f" und {len(waiting) - 10} weitere" if len(waiting) > 10 else "")
+                )
+            elif not degraded and stats.alerted:
+                stats.alerted = False
+                messages.append(f"✅ **Pool `{format_endpoint(endpoint)}` antwortet wieder normal.**")
+        return messages
+
+    async def run(self):
+        while True:
+            try:
+                messages = await self.probe_all()
+            except Exception as e:
+                print(f"{Fore.RED}Fehler im Stratum-Prober: {e}{Style.RESET_ALL}")
+                messages = []
+            channel = bot.get_channel(channel_id)
+            for text in messages:
+                print(f"{Fore.YELLOW}{text}{Style.RESET_ALL}")
+                if channel is not None:
+                    outbound.alert(channel, text)
+            if messages:
+                runtime_state.save_soon()
+            await asyncio.sleep(self.interval * random.uniform(0.9, 1.1))
+
+    def summary(self, endpoint):
+        stats = self.pools.get(endpoint)
+        if stats is None or not stats.probes:
+            return "noch nicht geprüft"
+        connect = stats.percentile(1, 0.5)
+        subscribe = stats.percentile(2, 0.5)
+        subscribe_p95 = stats.percentile(2, 0.95)
+        parts = [f"Verfügbarkeit {stats.availability():.0%} (n={len(stats.probes)})"]
+        if connect is not None:
+            parts.append(f"Connect p50 {connect * 1000:.0f} ms")
+        if subscribe is not None:
+            parts.append(f"subscribe p50 {subscribe * 1000:.0f} ms / p95 {subscribe_p95 * 1000:.0f} ms")
+        if stats.last_error:
+            parts.append(f"zuletzt: {stats.last_error}")
+        return ("⚠️ " if stats.alerted else "") + " | ".join(parts)
+
+    def export(self):
+        return [list(endpoint) for endpoint, stats in self.pools.items() if stats.alerted]
+
+    def restore(self, saved):
+        for endpoint in saved:
+            self.stats_for(tuple(endpoint)).alerted = True
+
+stratum_prober = (
+    StratumProber(config['stratum_probe'])
+    if config.has_section('stratum_probe') and config['stratum_probe'].getboolean('enabled', False) else None
+)
+
+# Replay: spielt eine Aufnahme oder ein synthetisches Szenario auf einer virtuellen Uhr
+# durch Regeln und Dashboards, um Schwellen ohne tagelanges Warten zu prüfen:
+#   python bitaxediscordbot.py --replay bitaxe_recording.bin
+#   python bitaxediscordbot.py --replay scenario:mixed --days 30 --miners 5
+# Es gelten die Regeln der config.ini; nach Discord wird nichts gesendet.
+
+# Ereignis: (Häufigkeit pro Tag und Miner, Dauer min, max in Sekunden)
+REPLAY_SCENARIOS = {
+    "stable": {"best": (0.5, 0, 0)},
+    "mixed": {"dip": (2, 60, 1800), "fallback": (0.3, 300, 3600), "outage": (0.3, 30, 900), "best": (1, 0, 0)},
+    "flaky": {"dip": (24, 30, 600), "fallback": (4, 60, 900), "outage": (12, 20, 300), "best": (2, 0, 0)},
+}
+
+def synthetic_samples(scenario, miners=1, days=30.0, interval=10.0, seed=1, start=None):
+    """
+    Erzeugt (ts, miner, Snapshot oder None) wie eine Abfrage alle interval Sekunden.
+    Einbrüche der Hashrate landen zufällig zwischen 250 und 390 – also auch zwischen
+    Alarm- und Entwarnungsschwelle der Standardregel.
+    """
+    events = REPLAY_SCENARIOS[scenario]
+    rng = random.Random(seed)
+    start = time.time() - days * 86400 if start is None else start
+    base = Snapshot.from_api({
+        "ASICModel": "BM1370", "version": "v2.4.2", "frequency": 525, "coreVoltage": 1150,
+        "stratumURL": "public-pool.io", "stratumPort": 21496, "fallbackStratumURL": "solo.ckpool.org",
+        "fallbackStratumPort": 3333, "wifiStatus": "Connected!",
+    })
+    states = [
+        {"name": f"sim-{i}", "nominal": rng.uniform(450, 550), "best": rng.uniform(1e8, 1e9), "boot": start, "active": {}}
+        for i in range(miners)
+    ]
+    for step in range(int(days * 86400 / interval)):
+        ts = start + step * interval
+        for state in states:
+            active = state["active"]
+            for kind in [kind for kind, (end, _) in active.items() if end <= ts]:
+                del active[kind]
+                if kind == "outage":
+                    state["boot"] = ts
+            for kind, (per_day, low, high) in events.items():
+                if kind in active or rng.random() >= per_day * interval / 86400:
+                    continue
+                if kind == "best":
+                    state["best"] *= rng.uniform(1.05, 3.0)
+                else:
+                    active[kind] = (ts + rng.uniform(low, high), rng.uniform(250, 390) if kind == "dip" else None)
+            if "outage" in active:
+                yield ts, state["name"], None
+                continue
+            hashrate = (active["dip"][1] if "dip" in active else state["nominal"]) * rng.gauss(1.0, 0.02)
+            yield ts, state["name"], base.replace(
+                hashrate=hashrate,
+                temp=50 + hashrate / 50 + rng.gauss(0, 0.5),
+                power=hashrate * 0.03 + rng.gauss(0, 0.2),
+                best_diff=Difficulty(state["best"]),
+                using_fallback="fallback" in active,
+                uptime=int(ts - state["boot"]),
+            )
+
+class ReplayDriver:
+    """
+    Die Zeitstempel der Samples sind die Uhr: Regelfenster, Debounce und Cooldowns
+    laufen in Aufnahmezeit, Dashboards werden alle dashboard_interval Sekunden
+    Aufnahmezeit gerendert. Statt Discord sammelt eine Senke die Alarme (alerts)
+    und zählt die Dashboard-Edits, die gesendet bzw. übersprungen worden wären.
+    """
+
+    def __init__(self, rules, dashboards=None, dashboard_interval=DASHBOARD_INTERVAL):
+        # Eigene Fleet, die Regeln und Dashboards übergeben bekommen: die des Bots bleibt unberührt
+        self.fleet = Fleet([], FLEET_CONCURRENCY)
+        self.engine = RuleEngine(rules, self.fleet)
+        self.manager = DashboardManager(self.fleet)
+        self.dashboards = dashboards  # Selektoren; None = Fleet-Ansicht bzw. der einzige Miner
+        self.dashboard_interval = dashboard_interval
+        self.alerts = []  # (ts, miner, regel, text)
+        self.edits_sent = 0
+        self.edits_skipped = 0
+        self.samples = 0
+        self.first_ts = None
+        self.last_ts = None
+        self.wall = 0.0
+        self._keys = {}
+
+    async def run(self, samples):
+        started = time.perf_counter()
+        next_tick = None
+        try:
+            for ts, name, data in samples:
+                miner = self.fleet.miners.get(name)
+                if miner is None:
+                    miner = Miner(name, None)
+                    self.fleet.add(miner)
+                miner.cache.push(data)
+                for rule, text in self.engine.evaluate(name, data, ts=ts):
+                    self.alerts.append((ts, name, rule.name, text))
+                if self.first_ts is None:
+                    self.first_ts = ts
+                    next_tick = ts + self.dashboard_interval
+                elif ts >= next_tick:
+                    await self._tick()
+                    next_tick = ts + self.dashboard_interval
+                self.last_ts = ts
+                self.samples += 1
+        finally:
+            self.wall += time.perf_counter() - started
+        return self
+
+    async def _tick(self):
+        selectors = self.dashboards or (
+            [("miner", next(iter(self.fleet.miners)))] if len(self.fleet.miners) == 1 else [("fleet", None)]
+        )
+        for selector in selectors:
+            if selector[0] == "miner" and selector[1] not in self.fleet.miners:
+                continue
+            key = embed_content_key(await self.manager.render(selector))
+            if self._keys.get(selector) == key:
+                self.edits_skipped += 1
+            else:
+                self._keys[selector] = key
+                self.edits_sent += 1
+
+    def report(self):
+        span = self.last_ts - self.first_ts if self.samples else 0.0
+        return {
+            "samples": self.samples,
+            "miners": len(self.fleet.miners),
+            "span_sec": span,
+            "wall_sec": self.wall,
+            "speedup": span / self.wall if self.wall else None,
+            "samples_per_sec": self.samples / self.wall if self.wall else None,
+            "alerts": len(self.alerts),
+            "alerts_by_rule": dict(collections.Counter(rule for _, _, rule, _ in self.alerts)),
+            "dashboard_edits": self.edits_sent,
+            "dashboard_edits_skipped": self.edits_skipped,
+            "events": [{"ts": ts, "miner": miner, "rule": rule, "text": text} for ts, miner, rule, text in self.alerts],
+        }
+
+async def replay_main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="bitaxediscordbot.py --replay",
+        description="Spielt eine Aufnahme oder ein Szenario durch die Regeln der config.ini",
+    )
+    parser.add_argument("source", help="Aufnahme-Datei oder scenario:<name> (" + ", ".join(REPLAY_SCENARIOS) + ")")
+    parser.add_argument("--miners", type=int, default=1, help="nur für Szenarien")
+    parser.add_argument("--days", type=float, default=30, help="nur für Szenarien")
+    parser.add_argument("--interval", type=float, default=10, help="Sekunden zwischen Samples (nur für Szenarien)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dashboard", action="append", help="Miner-Name oder tag:<tag>, mehrfach möglich")
+    parser.add_argument("--limit", type=int, default=50, help="so viele Alarme auflisten (0 = keine)")
+    parser.add_argument("--report", help="vollständigen Bericht als JSON speichern")
+    args = parser.parse_args(argv)
+
+    if args.source.startswith("scenario:"):
+        scenario = args.source.split(":", 1)[1]
+        if scenario not in REPLAY_SCENARIOS:
+            parser.error(f"Unbekanntes Szenario {scenario}")
+        samples = synthetic_samples(scenario, args.miners, args.days, args.interval, args.seed)
+    elif os.path.exists(args.source):
+        samples = read_recording(args.source)
+    else:
+        parser.error(f"Datei nicht gefunden: {args.source}")
+    dashboards = [
+        ("fleet", selector) if wants_fleet_view(selector) else ("miner", selector) for selector in args.dashboard or ()
+    ]
+    driver = await ReplayDriver(load_rules(), dashboards or None).run(samples)
+    report = driver.report()
+
+    zone = ZoneInfo(config['settings'].get('timezone', 'Europe/Berlin'))
+    for ts, miner, rule, text in driver.alerts[:args.limit]:
+        when = datetime.datetime.fromtimestamp(ts, zone).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"{Fore.YELLOW}{when}{Style.RESET_ALL}  {miner}  {rule:<14} {text}")
+    if len(driver.alerts) > args.limit:
+        print(f"… und {len(driver.alerts) - args.limit} weitere")
+    print(
+        f"{Fore.GREEN}▶️ {report['samples']} Samples von {report['miners']} Minern über "
+        f"{format_duration(report['span_sec'])} in {report['wall_sec']:.2f} s "
+        f"({report['samples_per_sec'] or 0:.0f} Samples/s, {report['speedup'] or 0:.0f}× Echtzeit){Style.RESET_ALL}"
+    )
+    print("🔔 Alarme: " + (", ".join(f"{rule} {count}" for rule, count in report["alerts_by_rule"].items()) or "keine"))
+    print(f"📊 Dashboard-Edits: {report['dashboard_edits']} gesendet, {report['dashboard_edits_skipped']} übersprungen")
+    if args.report:
+        pathlib.Path(args.report).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Bericht gespeichert: {args.report}")
+    return 0
+
+class RuntimeState:
+    """
+    Laufzeitzustand, der einen Neustart überdauern soll: Dashboard-Nachrichten,
+    Alarmzustände, letzter bekannter Snapshot und Circuit Breaker je Miner sowie die
+    Startnachricht. Geschrieben wird nur bei Änderungen, atomar und im Hintergrund.
+    """
+    def __init__(self, path, source=None):
+        self.path = path
+        self.saved = {}
+        self.startup_message = {}  # Channel, Nachricht und Prüfsumme der Startnachricht
+        self.app_commands = {}     # Server und Prüfsumme der zuletzt registrierten Slash-Befehle
+        self.writes = 0
+        self._last_text = None
+        self._save_task = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="runtime-state")
+        self._source = source  # eigene Fleet (Benchmark), sonst die des Bots
+
+    @property
+    def fleet(self):
+        return fleet if self._source is None else self._source
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                self.saved = json.load(f)
+        except FileNotFoundError:
+            self.saved = {}
+        except (OSError, ValueError) as e:
+            print(f"{Fore.RED}Zustand aus {self.path} nicht lesbar, Start ohne: {e}{Style.RESET_ALL}")
+            self.saved = {}
+        self.startup_message = self.saved.get("startup_message", {})
+        self.app_commands = self.saved.get("app_commands", {})
+        return self.saved
+
+    def restore(self):
+        """Alles, was keinen Discord-Channel braucht; Dashboards folgen in on_ready."""
+        rule_engine.restore(self.saved.get("rules", {}))
+        if autotuner is not None:
+            autotuner.restore(self.saved.get("autotune", {}))
+        if stratum_prober is not None:
+            stratum_prober.restore(self.saved.get("stratum_alerts", []))
+        dashboard_manager._last_best.update(self.saved.get("dashboards", {}).get("last_best", {}))
+        now = time.time()
+        for name, entry in self.saved.get("miners", {}).items():
+            miner = self.fleet.miners.get(name)
+            if miner is None:
+                continue
+            if entry.get("breaker"):
+                miner.cache.breaker.restore(entry["breaker"])
+            if entry.get("last_good"):
+                # Für Befehle bis zur ersten erfolgreichen Abfrage ("letzter bekannter Stand")
+                miner.cache.last_good = Snapshot.from_tuple([entry["last_good"].get(attr) for attr in Snapshot.__slots__])
+                miner.cache.last_good_at = time.monotonic() - max(0.0, now - entry["last_good_at"])
+
+    def collect(self):
+        now = time.time()
+        miners = {}
+        for name, miner in self.fleet.miners.items():
+            cache = miner.cache
+            entry = {"breaker": cache.breaker.export()}
+            if cache.last_good is not None:
+                entry["last_good"] = dict(zip(Snapshot.__slots__, cache.last_good.to_tuple()))
+                entry["last_good_at"] = now - (time.monotonic() - cache.last_good_at)
+            miners[name] = entry
+        return {
+            "dashboards": dashboard_manager.export(),
+            "rules": rule_engine.export(),
+            "miners": miners,
+            "startup_message": self.startup_message,
+            "app_commands": self.app_commands,
+            "autotune": autotuner.export() if autotuner is not None else self.saved.get("autotune", {}),
+            "stratum_alerts": stratum_prober.export() if stratum_prober is not None else [],
+        }
+
+    async def save(self):
+        text = json.dumps(self.collect(), sort_keys=True)
+        if text == self._last_text:
+            return
+        self._last_text = text
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, write_file_atomic, self.path, text)
+            self.writes += 1
+        except Exception as e:
+            self._last_text = None
+            print(f"{Fore.RED}Fehler beim Speichern des Zustands: {e}{Style.RESET_ALL}")
+
+    def save_soon(self):
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.ensure_future(self.save())
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+# Alle Befehle sind Hybrid-Befehle: als !befehl (optional) und als /befehl verfügbar
+for command in bot.commands:
+    command.app_command.description = slash_description(command.help)
+
+STATE_SAVE_INTERVAL = float(config['settings'].get('state_save_interval_sec', 60))
+runtime_state = RuntimeState(config['settings'].get('state_file', 'bot_state.json'))
+scheduler.subscribe("Benachrichtigungen", monitor_changes)
+scheduler.subscribe("Konsole", log_to_console, console_interval)
+scheduler.subscribe("Dashboards", lambda polled: dashboard_manager.tick(), DASHBOARD_INTERVAL)
+scheduler.subscribe("Zustand", lambda polled: runtime_state.save(), STATE_SAVE_INTERVAL)
+if PERF_LOG_INTERVAL > 0:
+    scheduler.subscribe("Perf-Log", log_perf, PERF_LOG_INTERVAL)
+
+if __name__ == "__main__" and sys.argv[1:2] == ["--replay"]:
+    sys.exit(asyncio.run(replay_main(sys.argv[2:])))
+elif __name__ == "__main__":
     print(f"{Fore.YELLOW}🔁 Bot wird gestartet...{Style.RESET_ALL}")
     bot.run(token)
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Gemeinsame Fixtures. Der Bot wird wie in bench/ in einem temporären Verzeichnis mit
+eigener config.ini importiert – echte Daten werden nicht angefasst.
+"""
+import os
+import pathlib
+import sys
+
+import pytest
+
+REPO_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+TEST_CONFIG = """
+[discord]
+token = test
+channel_id = 1
+
+[bitaxe]
+name = Test
+api_url = http://127.0.0.1:9/api/system/info
+
+[settings]
+timezone = Europe/Berlin
+perf_log_interval_sec = 0
+"""
+
+@pytest.fixture(scope="session")
+def bot(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("bot")
+    (workdir / "config.ini").write_text(TEST_CONFIG, encoding="utf-8")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import bitaxediscordbot
+        yield bitaxediscordbot
+    finally:
+        os.chdir(cwd)
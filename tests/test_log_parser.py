@@ -0,0 +1,39 @@
+def test_share_and_submit_results(bot):
+    parser = bot.LogParser()
+    events = parser.feed(
+        "\x1b[0;32mI (1000) asic_result: ID: 6a1b, ver: 20000000 Nonce 0000ABCD diff 2345.6 of 2048.\x1b[0m\n"
+        'I (1001) stratum_api: tx: {"id": 7, "method": "mining.submit", "params": []}\n'
+        'I (1002) stratum_api: tx: {"id": 8, "method": "mining.submit", "params": []}\n'
+        'I (1040) stratum_task: rx: {"id":8,"error":[23,"Low difficulty share",null],"result":false}\n'
+        'I (1041) stratum_task: rx: {"id":7,"error":null,"result":true}\n'
+        'I (1042) stratum_task: rx: {"id":99,"error":null,"result":true}\n'
+    )
+    assert [(event.kind, event.value) for event in events] == [
+        ("share", 2345.6), ("rejected", None), ("accepted", None),
+    ]
+    assert parser.lines == 6
+
+def test_lines_split_across_messages(bot):
+    parser = bot.LogParser()
+    assert parser.feed("I (10) asic_result: Nonce 0000ABCD di") == []
+    events = parser.feed("ff 99.5 of 64.\nI (11) wifi: connected\nI (12) asic")
+    assert [(event.kind, event.value) for event in events] == [("share", 99.5)]
+    assert parser.buffer == "I (12) asic"
+
+def test_restart_detected_when_uptime_drops(bot):
+    parser = bot.LogParser()
+    events = parser.feed("I (5000) system: ok\nI (120) system: boot\n")
+    assert [event.kind for event in events] == ["reset"]
+
+def test_pool_lines_match_configured_urls(bot):
+    parser = bot.LogParser()
+    events = parser.feed(
+        "I (1) stratum_task: Connecting to: stratum+tcp://Solo.ckpool.org:3333 (1.2.3.4)\n"
+        "I (2) stratum_task: Connecting to: public-pool.io\n"
+    )
+    logged = [event.value for event in events if event.kind == "pool"]
+    assert logged == ["stratum+tcp://Solo.ckpool.org:3333", "public-pool.io"]
+    assert bot.log_pool_is(logged[0], "stratum+tcp://solo.ckpool.org", 3333)
+    assert not bot.log_pool_is(logged[0], "solo.ckpool.org", 4444)
+    assert bot.log_pool_is(logged[1], "public-pool.io", 21496)
+    assert not bot.log_pool_is(logged[1], None, None)
@@ -0,0 +1,16 @@
+import math
+
+def test_lttb_keeps_short_series(bot):
+    points = [(i, i * i) for i in range(5)]
+    assert bot.lttb(points, 10) == points
+    assert bot.lttb(points, 2) == points
+
+def test_lttb_reduces_and_keeps_ends_and_peak(bot):
+    points = [(i, math.sin(i / 50)) for i in range(1000)]
+    points[437] = (437, 25.0)  # einzelne Spitze
+    sampled = bot.lttb(points, 100)
+    assert len(sampled) == 100
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert (437, 25.0) in sampled
+    xs = [x for x, _ in sampled]
+    assert xs == sorted(xs) and len(set(xs)) == len(xs)
@@ -0,0 +1,61 @@
+import pytest
+
+def snapshot(bot, **fields):
+    return bot.Snapshot.from_api(fields)
+
+def engine(bot, **options):
+    options = {"field": "hashRate", "op": "<", "value": "350", "message": "low {value}",
+               "clear_message": "ok {value}", **options}
+    return bot.RuleEngine([bot.Rule("hashrate_low", options)])
+
+def run(bot, rules, values, start=0.0, step=10.0):
+    """Texte je Sample für eine Folge von Hashrate-Werten."""
+    return [
+        [text for _, text in rules.evaluate("m", snapshot(bot, hashRate=value), ts=start + i * step)]
+        for i, value in enumerate(values)
+    ]
+
+def test_threshold_hysteresis(bot):
+    rules = engine(bot, clear="400")
+    # Alarm unter 350, zwischen 350 und 400 bleibt er aktiv, Entwarnung erst ab 400
+    assert run(bot, rules, [500, 340, 360, 399, 400, 380, 340]) == [
+        [], ["low 340.0"], [], [], ["ok 400.0"], [], ["low 340.0"],
+    ]
+
+def test_threshold_without_clear_clears_when_back_over(bot):
+    rules = engine(bot)
+    assert run(bot, rules, [340, 349, 351]) == [["low 340.0"], [], ["ok 351.0"]]
+
+def test_debounce_needs_consecutive_samples(bot):
+    rules = engine(bot, debounce="3")
+    assert run(bot, rules, [340, 340, 500, 340, 340, 340]) == [[], [], [], [], [], ["low 340.0"]]
+
+def test_cooldown_suppresses_refire(bot):
+    rules = engine(bot, cooldown_sec="60")
+    fired = run(bot, rules, [340, 500, 340, 500, 500, 500, 500, 340], step=10.0)
+    assert [texts for texts in fired if texts and texts[0].startswith("low")] == [["low 340.0"], ["low 340.0"]]
+    assert fired[2] == []  # nach 20 s noch in der Abkühlzeit
+
+def test_count_rule_n_of_m(bot):
+    rules = engine(bot, type="count", n="2", m="3", message="{metric} von 3")
+    assert run(bot, rules, [340, 500, 340, 500, 500]) == [[], [], ["2 von 3"], ["ok 500.0"], []]
+
+def test_change_rule_ignores_first_sample(bot):
+    rules = bot.RuleEngine([bot.Rule("best", {"field": "bestDiff", "type": "change", "message": "neu {value}"})])
+    texts = [
+        [text for _, text in rules.evaluate("m", snapshot(bot, bestDiff=value), ts=i)]
+        for i, value in enumerate(["1M", "1M", "2M"])
+    ]
+    assert texts == [[], [], ["neu 2M"]]
+
+def test_needs_attention_near_threshold(bot):
+    rules = engine(bot)
+    rules.evaluate("m", snapshot(bot, hashRate=360), ts=0)
+    assert rules.needs_attention("m")
+    rules.evaluate("m", snapshot(bot, hashRate=500), ts=10)
+    assert not rules.needs_attention("m")
+
+@pytest.mark.parametrize("rule_type", ["threshold", "average", "rate", "count"])
+def test_rule_without_value_is_rejected(bot, rule_type):
+    with pytest.raises(ValueError):
+        bot.Rule("x", {"field": "temp", "type": rule_type})
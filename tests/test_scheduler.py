@@ -0,0 +1,35 @@
+import asyncio
+
+def test_cache_hit_is_not_evaluated_again(bot):
+    engine = bot.RuleEngine([bot.Rule("low", {
+        "field": "hashRate", "type": "count", "op": "<", "value": "100", "n": "2", "m": "3",
+    })])
+    evaluated = []
+
+    async def rules(polled):
+        for miner, data in polled:
+            evaluated.append(data)
+            engine.evaluate(miner.name, data)
+
+    async def fetch():
+        return bot.Snapshot.from_api({"hashRate": 50})
+
+    async def scenario():
+        scheduler = bot.PollScheduler(10, 5, 120, 0)
+        scheduler.subscribe("Regeln", rules)
+        miner = bot.Miner("m", None)
+        miner.cache = bot.SnapshotCache(fetch, 60)
+        # Ein Befehl ruft ab, danach liefert die Abfrage-Schleife denselben Snapshot aus dem Cache
+        await miner.cache.get()
+        for _ in range(2):
+            data, age = await miner.cache.get()
+            scheduler._deliver([(miner, data, age)])
+            await scheduler._notify(force=True)
+        # Erst ein neuer Abruf ist ein neues Sample
+        data, age = await miner.cache.get(max_age=0)
+        scheduler._deliver([(miner, data, age)])
+        await scheduler._notify(force=True)
+
+    asyncio.run(scenario())
+    assert len(evaluated) == 2
+    assert engine._states["m"][0].active  # 2 von 3: zwei echte Samples genügen
@@ -0,0 +1,74 @@
+import marshal
+
+import pytest
+
+from bitaxe_poller import Difficulty, Snapshot, format_difficulty, parse_difficulty
+
+@pytest.mark.parametrize("raw, expected", [
+    (1234, 1234.0),
+    (12.5, 12.5),
+    ("1234", 1234.0),
+    ("567M", 567e6),
+    ("4.29G", 4.29e9),
+    ("1,5k", 1500.0),
+    (" 2 T ", 2e12),
+    ("3P", 3e15),
+])
+def test_parse_difficulty(raw, expected):
+    value = parse_difficulty(raw)
+    assert isinstance(value, Difficulty)
+    assert value == pytest.approx(expected)
+
+@pytest.mark.parametrize("raw", [None, True, "", "abc", "M"])
+def test_parse_difficulty_unreadable(raw):
+    assert parse_difficulty(raw) is None
+
+def test_difficulty_prints_like_axeos():
+    assert format_difficulty(4.29e9) == "4.29G"
+    assert format_difficulty(999) == "999"
+    assert str(parse_difficulty("567M")) == "567M"
+    assert f"{parse_difficulty('1K'):.1f}" == "1000.0"
+    # Formatieren und wieder Einlesen ergibt denselben gerundeten Wert
+    value = parse_difficulty(format_difficulty(123456789))
+    assert parse_difficulty(format_difficulty(value)) == value
+
+API_PAYLOAD = {
+    "hashRate": 512.3,
+    "temp": 58.25,
+    "power": 14.1,
+    "sharesAccepted": 1200,
+    "sharesRejected": 3,
+    "bestDiff": "4.29G",
+    "bestSessionDiff": "12.5M",
+    "isUsingFallbackStratum": 0,
+    "ASICModel": "BM1366",
+    "stratumURL": "public-pool.io",
+    "stratumPort": 21496,
+}
+
+def test_snapshot_decodes_types():
+    data = Snapshot.from_api(API_PAYLOAD)
+    assert data.hashrate == 512.3
+    assert data.shares_accepted == 1200
+    assert isinstance(data.best_diff, Difficulty) and data.best_diff == 4.29e9
+    assert data.using_fallback is False
+    assert data.asic_model == "BM1366"
+    assert data.fan_rpm is None  # fehlt in der Antwort
+    assert Snapshot.from_api("kein dict") is None
+
+def test_snapshot_tuple_round_trip():
+    data = Snapshot.from_api(API_PAYLOAD)
+    values = data.to_tuple()
+    # Nur eingebaute Typen: so gehen Snapshots über die Worker-Verbindung
+    restored = Snapshot.from_tuple(marshal.loads(marshal.dumps(values)))
+    assert restored.to_tuple() == values
+    assert isinstance(restored.best_session_diff, Difficulty)
+    assert str(restored.best_diff) == "4.29G"
+
+def test_snapshot_is_immutable():
+    data = Snapshot.from_api(API_PAYLOAD)
+    with pytest.raises(AttributeError):
+        data.hashrate = 0
+    changed = data.replace(using_fallback=True)
+    assert changed.using_fallback is True and data.using_fallback is False
+    assert changed.hashrate == data.hashrate
@@ -0,0 +1,33 @@
+import array
+
+def test_delta_encode(bot):
+    assert list(bot.delta_encode([5, 7, 7, 3])) == [5, 2, 0, -4]
+    assert list(bot.delta_encode([])) == []
+
+def test_chunk_round_trip(bot):
+    timestamps = array.array("q", [1_700_000_000_000 + i * 5000 for i in range(6)])
+    columns = [
+        array.array("q", [100, 101, 99, 99, 250, -3]),
+        array.array("q", [7, 7, 7, 7, 7, 7]),   # Lücken: Wert 7 ist nur Platzhalter
+        array.array("q", [0] * 6),              # keine Werte
+    ]
+    masks = [None, bytearray([0, 1, 0, 0, 1, 0]), bytearray([1] * 6)]
+    blob = bot.encode_chunk(timestamps, columns, masks)
+    decoded_ts, decoded = bot.decode_columns(blob, {0, 1, 2, 5})
+    assert decoded_ts == list(timestamps)
+    assert decoded[0] == [100, 101, 99, 99, 250, -3]
+    assert decoded[1] == [7, None, 7, 7, None, 7]
+    assert decoded[2] == [None] * 6
+    assert decoded[5] == [None] * 6  # Spalte jünger als der Chunk
+
+def test_sample_chunk_tail(bot):
+    chunk = bot.SampleChunk(width=2)
+    for i, values in enumerate([(1, None), (2, 20), (3, None), (4, 40)]):
+        chunk.append(1000 * i, values)
+    piece = chunk.tail(2)
+    assert piece.start == 2000 and len(piece) == 2
+    timestamps, columns = bot.decode_columns(piece.encode(), {0, 1})
+    assert timestamps == [2000, 3000]
+    assert columns == {0: [3, 4], 1: [None, 40]}
+    # Ohne fehlende Werte im Teil entfällt die Maske
+    assert chunk.tail(3).masks[1] is None